@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+בנצ'מרק למפרש ולפרסר. כל התוכניות נוצרות באופן דטרמיניסטי (seed קבוע),
+והתוצאות נכתבות ל-JSON כדי להשוות בין גרסאות:
+
+    python battle_calc_bench.py -o before.json
+    python battle_calc_bench.py -o after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from battle_calc_runner import (
+    ENGINES, EXAMPLES, AsmError, Executor, decode_program, load_program, parse_program,
+)
+
+# כל מדידה חוזרת עד שעברו לפחות MIN_TIME שניות, והזמן הטוב מבין repeat חזרות נלקח
+MIN_TIME = 0.05
+BENCH_SEED = 12345
+
+# ============================================================
+# SYNTHETIC PROGRAMS
+# ============================================================
+
+def loop_program(n: int) -> str:
+    """לולאה עם חשבון, MOD וקפיצה מותנית (לא אפינית, אין קיצור דרך)"""
+    return f"""MOV R1, 0
+MOV R3, 0
+MOV L1, {n}
+A:
+ADD R1, L1
+MOD R1, 1000
+CMP R1, 500
+JNZ B
+INC R3
+B:
+LOOP A
+PRINT R3
+"""
+
+def affine_program(n: int) -> str:
+    """סכום 1..n: גוף אפיני של LOOP"""
+    return f"""MOV R1, 0
+MOV R2, 1
+MOV L1, {n}
+A:
+ADD R1, R2
+INC R2
+LOOP A
+PRINT R1
+"""
+
+def stack_program(n: int) -> str:
+    """n דחיפות ל-S1 ואז n שליפות וסכום"""
+    return f"""MOV L1, {n}
+A:
+MOV R1, L1
+PUSH R1, S1
+LOOP A
+MOV R2, 0
+MOV L1, {n}
+B:
+POP R1, S1
+ADD R2, R1
+LOOP B
+PRINT R2
+"""
+
+def list_program(n: int) -> str:
+    """כתיבה וקריאה של LIST באינדקס מחושב"""
+    return f"""MOV L1, {n}
+MOV R3, 0
+A:
+MOV R1, L1
+MOD R1, 33
+MOV [LIST+R1], L1
+MOV R2, [LIST+R1]
+ADD R3, R2
+LOOP A
+PRINT R3
+"""
+
+def rand_program(n: int) -> str:
+    """RAND בכל איטרציה"""
+    return f"""MOV L1, {n}
+MOV R2, 0
+A:
+RAND R1
+ADD R2, R1
+LOOP A
+PRINT R2
+"""
+
+def parse_source(lines: int) -> str:
+    """מקור גדול לפרסר: הוראות מגוונות, תוויות והערות"""
+    rng = random.Random(BENCH_SEED)
+    ops = ["MOV R1, 5", "ADD R2, R1", "SUB R3, 7", "MUL R1, R2", "INC R1", "DEC R2", "PUSH R1, S1",
+           "POP R2, S1", "MOV [LIST+R1], R2", "MOV R3, [LIST+4]", "CMP R1, R2", "PRINT R1", "NOP",
+           "IF R1 > 3 GOTO L0", "RAND R3", "JZ L0", "LOOP L0"]
+    out = ["L0:"]
+    for i in range(1, lines):
+        if i % 50 == 0:
+            out.append(f"L{i}:  ; תווית")
+        else:
+            line = rng.choice(ops)
+            out.append(line + ("  ; הערה" if rng.random() < 0.2 else ""))
+    out.append("HALT")
+    return "\n".join(out) + "\n"
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def best_time(fn: Callable[[], Any], repeat: int) -> Tuple[float, int]:
+    """(זמן לקריאה בודדת, מספר קריאות בכל חזרה): הטוב מבין repeat חזרות"""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME:
+            break
+        calls *= 2
+    best = elapsed / calls
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best, calls
+
+def peak_kb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def run_once(program_text: str, engine: str, max_steps: int, save_history: bool = False) -> int:
+    """ריצה אחת; מחזיר את מספר הצעדים (גם כשהתוכנית נכשלת)"""
+    ex = Executor(load_program(program_text), BENCH_SEED, max_steps, save_history)
+    try:
+        ex.run(engine=engine)
+    except AsmError:
+        pass
+    return ex.steps
+
+def bench_run(name: str, program_text: str, engine: str, max_steps: int, repeat: int,
+              save_history: bool = False) -> Dict[str, Any]:
+    steps = run_once(program_text, engine, max_steps, save_history)  # גם חימום: פענוח והידור
+    seconds, _ = best_time(lambda: run_once(program_text, engine, max_steps, save_history), repeat)
+    return {
+        "case": name,
+        "engine": engine,
+        "save_history": save_history,
+        "steps": steps,
+        "seconds": seconds,
+        "steps_per_sec": steps / seconds if seconds > 0 else None,
+        "peak_kb": peak_kb(lambda: run_once(program_text, engine, max_steps, save_history)),
+    }
+
+def bench_parse(lines: int, repeat: int) -> Dict[str, Any]:
+    text = parse_source(lines)
+    size_mb = len(text.encode("utf-8")) / 1e6
+    parse_s, _ = best_time(lambda: parse_program(text), repeat)
+    decode_s, _ = best_time(lambda: decode_program(*parse_program(text)), repeat)
+    return {
+        "lines": lines,
+        "mb": size_mb,
+        "parse_seconds": parse_s,
+        "parse_mb_per_sec": size_mb / parse_s,
+        "decode_seconds": decode_s,
+        "decode_mb_per_sec": size_mb / decode_s,
+        "peak_kb": peak_kb(lambda: decode_program(*parse_program(text))),
+    }
+
+def synthetic_cases(scale: int) -> List[Tuple[str, str]]:
+    return [
+        ("loop", loop_program(20000 * scale)),
+        ("affine_loop", affine_program(20000 * scale)),
+        ("stack", stack_program(10000 * scale)),
+        ("list", list_program(10000 * scale)),
+        ("rand", rand_program(20000 * scale)),
+    ]
+
+def run_suite(engines: List[str], repeat: int, scale: int, parse_lines: int) -> Dict[str, Any]:
+    max_steps = 10 ** 9
+    results: Dict[str, Any] = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "scale": scale,
+        },
+        "parse": bench_parse(parse_lines, repeat),
+        "run": [],
+        "examples": [],
+        "history": [],
+    }
+    for name, text in synthetic_cases(scale):
+        for engine in engines:
+            results["run"].append(bench_run(name, text, engine, max_steps, repeat))
+
+    # הדוגמאות קטנות: מסכמים צעדים וזמן על כולן
+    # דוגמאות שלא נטענות (שגיאת פענוח) לא נמדדות ולא נספרות
+    examples = []
+    for items in EXAMPLES.values():
+        for text in items.values():
+            try:
+                load_program(text)
+            except AsmError:
+                continue
+            examples.append(text)
+    for engine in engines:
+        steps = seconds = 0.0
+        for text in examples:
+            row = bench_run("examples", text, engine, 200000, repeat)
+            steps += row["steps"]
+            seconds += row["seconds"]
+        results["examples"].append({"engine": engine, "programs": len(examples), "steps": int(steps),
+                                    "seconds": seconds, "steps_per_sec": steps / seconds if seconds else None})
+
+    # עלות save_history: אותה תוכנית עם ובלי היסטוריה (closure)
+    text = loop_program(5000 * scale)
+    plain = bench_run("loop", text, "closure", max_steps, repeat)
+    hist = bench_run("loop", text, "closure", max_steps, repeat, save_history=True)
+    results["history"].append({"case": "loop", "plain": plain, "history": hist,
+                               "slowdown": hist["seconds"] / plain["seconds"]})
+    return results
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def _rows(results: Dict[str, Any]) -> Dict[str, float]:
+    """מדדים שטוחים להשוואה: שם -> ערך (גבוה = טוב)"""
+    rows = {"parse MB/s": results["parse"]["parse_mb_per_sec"], "decode MB/s": results["parse"]["decode_mb_per_sec"]}
+    for row in results["run"]:
+        rows[f"{row['case']} [{row['engine']}] steps/s"] = row["steps_per_sec"]
+    for row in results["examples"]:
+        rows[f"examples [{row['engine']}] steps/s"] = row["steps_per_sec"]
+    for row in results["history"]:
+        rows[f"{row['case']} history steps/s"] = row["history"]["steps_per_sec"]
+    return rows
+
+def report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None, out=sys.stderr):
+    rows = _rows(results)
+    old = _rows(baseline) if baseline is not None else {}
+    width = max(len(name) for name in rows)
+    for name, value in rows.items():
+        line = f"{name:<{width}}  {value:>14,.0f}" if value else f"{name:<{width}}  {'-':>14}"
+        if old.get(name) and value:
+            line += f"  x{value / old[name]:.2f}"
+        print(line, file=out)
+    for row in results["history"]:
+        print(f"save_history slowdown ({row['case']}): x{row['slowdown']:.2f}", file=out)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Assembly Studio benchmarks")
+    parser.add_argument("-o", "--output", default="-", help="results JSON file, or - for stdout")
+    parser.add_argument("--engine", action="append", choices=ENGINES, help="engine to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N timings")
+    parser.add_argument("--scale", type=int, default=1, help="multiply synthetic iteration counts")
+    parser.add_argument("--parse-lines", type=int, default=20000, help="size of the synthetic parser source")
+    parser.add_argument("--compare", metavar="JSON", help="print ratios against an earlier results file")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.engine or list(ENGINES), max(1, args.repeat), max(1, args.scale), args.parse_lines)
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    report(results, baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
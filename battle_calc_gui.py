@@ -0,0 +1,2022 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import math
+import re
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from typing import List
+
+from battle_calc_runner import (
+    AsmError, EXAMPLES, PROFILE_SAMPLE_EVERY, Executor, Limits, Machine, Profile, ResultCache, RunCancelledError,
+    RunResult, get_python_equivalent, parse_program,
+)
+
+# הרצה מלאה רצה ב-thread; כל כמה ms הממשק מציג התקדמות ופלט חלקי
+RUN_POLL_MS = 100
+# מקסימום ערכי פלט שנוספים ללשונית בכל בדיקה (השאר נכתב כשהריצה מסתיימת)
+RUN_STREAM_LIMIT = 2000
+
+# הרצה איטית עם מהירות (צעדים לשנייה): פריים כל SLOW_FRAME_MS, עם לכל היותר
+# SLOW_FRAME_BUDGET שניות חישוב לפריים - צעדים שלא נכנסו בתקציב מוותרים (הקצב מסתגל)
+SLOW_FRAME_MS = 33
+SLOW_FRAME_BUDGET = 0.02
+
+# כמה צעדים אפשר לחזור אחורה ב-stepping (רשומות undo קטנות, לא עותקי Machine)
+UNDO_LIMIT = 100000
+
+# הדגשת תחביר: טוקן אחד לכל התאמה, לפי סדר עדיפות (הערה בולעת את סוף השורה).
+# מילה שלמה = לא צמודה לאות/ספרה (קו תחתון מותר, כמו ב-LOOP_START)
+KEYWORDS = ("MOV", "ADD", "SUB", "MUL", "DIV", "MOD", "INC", "DEC", "CLEAR", "SWAP", "PUSH", "POP", "RAND",
+            "PRINT", "CMP", "JZ", "JNZ", "GOTO", "IF", "LOOP", "HALT", "NOP")
+REGISTERS = ("R1", "R2", "R3", "L1", "S1", "S2", "C1", "C2")
+HIGHLIGHT_TOKEN = re.compile(
+    r"(?P<comment>[;#].*)"
+    rf"|(?<![^\W_])(?P<keyword>{'|'.join(KEYWORDS)})(?![^\W_])"
+    rf"|(?<![^\W_])(?P<register>{'|'.join(REGISTERS)})(?![^\W_])"
+    r"|\b(?P<number>\d+)\b"
+)
+SYNTAX_TAGS = ("comment", "keyword", "register", "number")
+# הקשות שמגיעות בתוך המרווח הזה מאוחדות להדגשה אחת
+HIGHLIGHT_DELAY_MS = 30
+# מעבר העדכון של העורך (gutter + הדגשה + תצוגת Python) רץ פעם אחת לכל רצף הקשות
+EDITOR_DELAY_MS = 30
+# מטמון תרגום ל-Python לפי תוכן שורה; מתאפס כשהוא גדל מעבר לזה
+PY_LINE_CACHE_SIZE = 20000
+
+def _translate_line(raw: str):
+    """
+    שורת מקור -> ("label", שם) / ("code", Python) / ("error", הודעה) / ("empty", None),
+    באותם כללים כמו parse_program.
+    """
+    line = raw.split(";", 1)[0].split("#", 1)[0].strip()
+    if line.endswith(":"):
+        return "label", line[:-1].strip()
+    instructions, _ = parse_program(line)
+    if not instructions:
+        return "empty", None
+    op, args, _, _ = instructions[0]
+    try:
+        return "code", get_python_equivalent(op, args)
+    except Exception as e:
+        return "error", str(e)
+
+# שכבת החום של הפרופיל: heat0 (קר) .. heat4 (הכי חם), בסקאלה לוגריתמית
+HEAT_COLORS = ["#fff8e1", "#ffecb3", "#ffe082", "#ffca28", "#ffa000"]
+
+# ============================================================
+# GUI עם צבעוניות
+# ============================================================
+
+class App(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("Assembly Studio — תרגול Assembly")
+        self.geometry("1400x900")
+        self.option_add('*tearOff', False)
+
+        # Color scheme
+        self.colors = {
+            'bg': '#f5f5f5',
+            'card_bg': '#ffffff',
+            'primary': '#2196F3',
+            'success': '#4CAF50',
+            'warning': '#FF9800',
+            'error': '#F44336',
+            'text': '#212121',
+            'text_secondary': '#757575',
+            'accent': '#00BCD4',
+            'register': '#E3F2FD',
+            'stack': '#FFF3E0',
+            'memory': '#F3E5F5',
+            'flag_on': '#4CAF50',
+            'flag_off': '#9E9E9E',
+        }
+        
+        self.configure(bg=self.colors['bg'])
+
+        # F5 חוזר על אותה תוכנית - תוצאות נשמרות לפי קוד מנורמל/seed/max_steps
+        self.results = ResultCache()
+
+        # הרצה ברקע: ה-Executor וה-thread הנוכחיים (None כשאין הרצה), תוצאת ה-thread,
+        # פרמטרי המטמון, כמה ערכי פלט כבר הוצגו, ו-(זמן, צעדים) לחישוב קצב
+        self.run_executor = None
+        self.run_thread = None
+        self.run_outcome = []
+        self.run_cached = None
+        self.run_shown = 0
+        self.run_rate = (0.0, 0)
+
+        # Stepping state
+        self.stepper = None
+        self.step_machine = None
+        self.slow_running = False
+        self.after_id = None
+        self.slow_speed = 0  # צעדים לשנייה; 0 = צעד אחד לכל עיכוב
+        self.slow_credit = 0.0  # צעדים שהצטברו ועוד לא בוצעו (שברים בקצב נמוך)
+        self.slow_last = 0.0
+        self.step_history = deque(maxlen=UNDO_LIMIT + 1)  # היסטוריה של צעדים (ip, line_no, raw, op, args)
+        self.step_history_index = -1  # אינדקס נוכחי בהיסטוריה
+        self.step_executor = None  # ה-Executor של ה-stepping הנוכחי (נשאר גם אחרי סיום/חזרה אחורה)
+
+        # הדגשת תחביר מצטברת: שורה -> התוכן שהודגש, שורות שנערכו, ו-after מתוזמן
+        self._hl_cache = {}
+        self._hl_dirty = set()
+        self._hl_job = None
+        # מעבר העדכון של העורך: after מתוזמן, מספר השורות ב-gutter, ומטמוני תצוגת Python
+        self._editor_job = None
+        self._gutter_lines = -1
+        self._py_lines = {}
+        self._py_source = None
+        self._py_preview = None
+        # הערך האחרון שהוצג בכל רכיב של הכרטיסים הימניים (מפתח -> ערך); ריק = לצייר הכל
+        self._rendered = {}
+
+        # Current example navigation
+        self.current_level = None
+        self.current_example = None
+
+        self._build_header_bar()
+        self._build_main()
+
+        # Load first example from level 1
+        first_level = list(EXAMPLES.keys())[0]
+        first_example = list(EXAMPLES[first_level].keys())[0]
+        self.load_example(first_level, first_example)
+        self.update_line_numbers()
+        self.bind("<F5>", lambda e: self.on_run())
+
+    def _build_header_bar(self):
+        """Build custom header bar aligned to the right (RTL)"""
+        header_bar = tk.Frame(self, bg=self.colors['card_bg'], relief=tk.RAISED, bd=1, height=35)
+        header_bar.pack(fill="x", padx=0, pady=0)
+        header_bar.pack_propagate(False)
+        
+        inner = tk.Frame(header_bar, bg=self.colors['card_bg'])
+        inner.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        # עזרה (rightmost) - using Button with postcommand menu
+        help_btn = tk.Button(inner, text="עזרה",
+                            bg=self.colors['card_bg'], fg=self.colors['text'],
+                            font=("Arial", 10), relief=tk.FLAT, padx=10, pady=5,
+                            cursor="hand2", anchor="e")
+        help_btn.pack(side="right", padx=5)
+        
+        help_menu = tk.Menu(help_btn, tearoff=0)
+        help_menu.add_command(label="📘 מדריך למתחיל", command=self.show_beginner_guide)
+        help_menu.add_command(label="🧾 שיעור ראשון (עם קוד)", command=self.show_first_lesson)
+        help_menu.add_command(label="❓ שאלות נפוצות", command=self.show_faq)
+        help_menu.add_separator()
+        help_menu.add_command(label="מדריך קצר", command=self.show_quick_guide)
+        
+        def show_help_menu(e):
+            try:
+                x = help_btn.winfo_rootx()
+                y = help_btn.winfo_rooty() + help_btn.winfo_height()
+                help_menu.post(x, y)
+            except:
+                help_menu.post(e.x_root, e.y_root)
+        help_btn.bind("<Button-1>", show_help_menu)
+        
+        # דוגמאות
+        ex_btn = tk.Button(inner, text="דוגמאות",
+                          bg=self.colors['card_bg'], fg=self.colors['text'],
+                          font=("Arial", 10), relief=tk.FLAT, padx=10, pady=5,
+                          cursor="hand2", anchor="e")
+        ex_btn.pack(side="right", padx=5)
+        
+        ex_menu = tk.Menu(ex_btn, tearoff=0)
+        for level_name, examples_dict in EXAMPLES.items():
+            level_menu = tk.Menu(ex_menu, tearoff=0)
+            ex_menu.add_cascade(label=level_name, menu=level_menu)
+            for ex_name in examples_dict.keys():
+                level_menu.add_command(
+                    label=ex_name,
+                    command=lambda l=level_name, e=ex_name: self.load_example(l, e)
+                )
+        
+        def show_ex_menu(e):
+            try:
+                x = ex_btn.winfo_rootx()
+                y = ex_btn.winfo_rooty() + ex_btn.winfo_height()
+                ex_menu.post(x, y)
+            except:
+                ex_menu.post(e.x_root, e.y_root)
+        ex_btn.bind("<Button-1>", show_ex_menu)
+        
+        # קובץ (leftmost in RTL visual order)
+        file_btn = tk.Button(inner, text="קובץ",
+                            bg=self.colors['card_bg'], fg=self.colors['text'],
+                            font=("Arial", 10), relief=tk.FLAT, padx=10, pady=5,
+                            cursor="hand2", anchor="e")
+        file_btn.pack(side="right", padx=5)
+        
+        file_menu = tk.Menu(file_btn, tearoff=0)
+        file_menu.add_command(label="חדש", command=self.new_file)
+        file_menu.add_command(label="פתח...", command=self.open_file)
+        file_menu.add_command(label="שמור...", command=self.save_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="יציאה", command=self.quit)
+        
+        def show_file_menu(e):
+            try:
+                x = file_btn.winfo_rootx()
+                y = file_btn.winfo_rooty() + file_btn.winfo_height()
+                file_menu.post(x, y)
+            except:
+                file_menu.post(e.x_root, e.y_root)
+        file_btn.bind("<Button-1>", show_file_menu)
+        
+        # Hover effects for buttons
+        for btn in [help_btn, ex_btn, file_btn]:
+            def make_hover(b):
+                def on_enter(e):
+                    b.config(bg="#e0e0e0")
+                def on_leave(e):
+                    b.config(bg=self.colors['card_bg'])
+                b.bind("<Enter>", on_enter)
+                b.bind("<Leave>", on_leave)
+            make_hover(btn)
+        
+        # Keep keyboard shortcuts
+        self.bind("<Control-n>", lambda e: self.new_file())
+        self.bind("<Control-s>", lambda e: self.save_file())
+
+    def _build_controls_row(self, parent: tk.Frame) -> None:
+        """Build horizontal controls row at top of right panel"""
+        inner = tk.Frame(parent, bg=self.colors['card_bg'])
+        inner.pack(fill="x", padx=8, pady=8)
+        
+        # Group controls from right to left (RTL feel)
+        # Fields on the right
+        fields_frame = tk.Frame(inner, bg=self.colors['card_bg'])
+        fields_frame.pack(side="right", padx=5)
+        
+        # Seed entry (RTL: label on right, entry on left)
+        seed_frame = tk.Frame(fields_frame, bg=self.colors['card_bg'])
+        seed_frame.pack(side="right", padx=5)
+        tk.Label(seed_frame, text="Seed:", bg=self.colors['card_bg'], fg=self.colors['text'], 
+                font=("Arial", 9)).pack(side="right", padx=(5, 0))
+        self.seed_var = tk.StringVar(value="")
+        seed_entry = tk.Entry(seed_frame, textvariable=self.seed_var, width=10, font=("Arial", 9))
+        seed_entry.pack(side="left")
+        
+        # Max steps entry
+        steps_frame = tk.Frame(fields_frame, bg=self.colors['card_bg'])
+        steps_frame.pack(side="right", padx=5)
+        tk.Label(steps_frame, text="Max steps:", bg=self.colors['card_bg'], fg=self.colors['text'],
+                font=("Arial", 9)).pack(side="right", padx=(5, 0))
+        self.steps_var = tk.StringVar(value="200000")
+        steps_entry = tk.Entry(steps_frame, textvariable=self.steps_var, width=10, font=("Arial", 9))
+        steps_entry.pack(side="left")
+        
+        # Delay entry
+        delay_frame = tk.Frame(fields_frame, bg=self.colors['card_bg'])
+        delay_frame.pack(side="right", padx=5)
+        tk.Label(delay_frame, text="עיכוב (ms):", bg=self.colors['card_bg'], fg=self.colors['text'],
+                font=("Arial", 9), justify="right", anchor="e").pack(side="right", padx=(5, 0))
+        self.delay_var = tk.StringVar(value="150")
+        delay_entry = tk.Entry(delay_frame, textvariable=self.delay_var, width=8, font=("Arial", 9))
+        delay_entry.pack(side="left")
+
+        # Speed entry: ריק = צעד אחד לכל עיכוב; מספר = צעדים לשנייה בפריימים
+        speed_frame = tk.Frame(fields_frame, bg=self.colors['card_bg'])
+        speed_frame.pack(side="right", padx=5)
+        tk.Label(speed_frame, text="צעדים/שנ':", bg=self.colors['card_bg'], fg=self.colors['text'],
+                font=("Arial", 9), justify="right", anchor="e").pack(side="right", padx=(5, 0))
+        self.speed_var = tk.StringVar(value="")
+        speed_entry = tk.Entry(speed_frame, textvariable=self.speed_var, width=8, font=("Arial", 9))
+        speed_entry.pack(side="left")
+        
+        # History checkbox
+        self.history_var = tk.BooleanVar(value=False)
+        history_check = tk.Checkbutton(fields_frame, text="שמור היסטוריה", variable=self.history_var, 
+                      bg=self.colors['card_bg'], fg=self.colors['text'], 
+                      selectcolor=self.colors['card_bg'], font=("Arial", 9))
+        history_check.pack(side="right", padx=5)
+
+        # Profile checkbox
+        self.profile_var = tk.BooleanVar(value=False)
+        profile_check = tk.Checkbutton(fields_frame, text="פרופיל", variable=self.profile_var,
+                      bg=self.colors['card_bg'], fg=self.colors['text'],
+                      selectcolor=self.colors['card_bg'], font=("Arial", 9))
+        profile_check.pack(side="right", padx=5)
+        
+        # Separator
+        ttk.Separator(inner, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
+        
+        # Buttons grouped on the left (RTL: buttons on left, fields on right)
+        buttons_frame = tk.Frame(inner, bg=self.colors['card_bg'])
+        buttons_frame.pack(side="right", padx=5)
+        
+        # Output buttons
+        self._create_toolbar_button(buttons_frame, "📋 העתק פלט", self.copy_output, self.colors['text_secondary'])
+        self._create_toolbar_button(buttons_frame, "🗑 נקה פלט", self.clear_output, self.colors['text_secondary'])
+        
+        ttk.Separator(buttons_frame, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
+        
+        # Main action buttons
+        self._create_toolbar_button(buttons_frame, "⏹ איפוס", self.on_reset, self.colors['warning'])
+        self.slow_run_btn = self._create_toolbar_button(buttons_frame, "⏯ הרצה איטית", 
+                                                         self.on_slow_run, self.colors['accent'])
+        self._create_toolbar_button(buttons_frame, "⏭ צעד", self.on_step, self.colors['primary'])
+        self._create_toolbar_button(buttons_frame, "■ עצור", self.on_stop_run, self.colors['error'])
+        self.run_btn = self._create_toolbar_button(buttons_frame, "▶ הרץ (F5)", self.on_run, self.colors['success'])
+
+        # התקדמות ההרצה ברקע (צעדים וצעדים לשנייה)
+        self.run_status = tk.Label(buttons_frame, text="", bg=self.colors['card_bg'],
+                                   fg=self.colors['text_secondary'], font=("Arial", 9))
+        self.run_status.pack(side="left", padx=5)
+        
+        # Navigation buttons for examples (kept for existing features)
+        ttk.Separator(inner, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
+        
+        nav_frame = tk.Frame(inner, bg=self.colors['card_bg'])
+        nav_frame.pack(side="right", padx=5)
+        
+        tk.Label(nav_frame, text="תרגילים:", bg=self.colors['card_bg'], 
+                fg=self.colors['text'], font=("Arial", 9), justify="right", anchor="e").pack(side="right", padx=5)
+        self.next_example_btn = self._create_toolbar_button(nav_frame, "הבא ▶", 
+                                                             self.next_example, self.colors['text_secondary'])
+        self.prev_example_btn = self._create_toolbar_button(nav_frame, "◀ קודם", 
+                                                             self.prev_example, self.colors['text_secondary'])
+        
+        # Step back button (kept for existing features)
+        ttk.Separator(inner, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
+        self._create_toolbar_button(inner, "◀ צעד קודם", self.on_step_back, self.colors['text_secondary'])
+
+    def _create_toolbar_button(self, parent, text, command, color):
+        btn = tk.Button(parent, text=text, command=command, 
+                       bg=color, fg='white', font=("Arial", 9, "bold"),
+                       relief=tk.RAISED, bd=1, padx=10, pady=5,
+                       cursor="hand2", activebackground=color)
+        btn.pack(side="left", padx=3)
+        
+        # Hover effect
+        def on_enter(e):
+            btn['bg'] = self._darken_color(color)
+        def on_leave(e):
+            btn['bg'] = color
+        
+        btn.bind("<Enter>", on_enter)
+        btn.bind("<Leave>", on_leave)
+        
+        return btn
+    
+    def _create_toolbar_button_vertical(self, parent, text, command, color):
+        """Create a button for vertical toolbar"""
+        btn = tk.Button(parent, text=text, command=command, 
+                       bg=color, fg='white', font=("Arial", 9, "bold"),
+                       relief=tk.RAISED, bd=1, padx=10, pady=5,
+                       cursor="hand2", activebackground=color)
+        btn.pack(fill="x", pady=3)
+        
+        # Hover effect
+        def on_enter(e):
+            btn['bg'] = self._darken_color(color)
+        def on_leave(e):
+            btn['bg'] = color
+        
+        btn.bind("<Enter>", on_enter)
+        btn.bind("<Leave>", on_leave)
+        
+        return btn
+
+    def _darken_color(self, color):
+        """Make color slightly darker for hover effect"""
+        # Simple darkening by reducing each RGB component
+        if color.startswith('#'):
+            r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+            r, g, b = max(0, r-30), max(0, g-30), max(0, b-30)
+            return f'#{r:02x}{g:02x}{b:02x}'
+        return color
+
+    def _build_main(self):
+        # Main container with two columns using Frame (not PanedWindow)
+        main = tk.Frame(self, bg=self.colors['bg'])
+        main.pack(fill="both", expand=True, padx=10, pady=8)
+        
+        # LEFT PANEL - Code Editor (must be visible!)
+        left_frame = tk.Frame(main, bg=self.colors['bg'])
+        left_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
+        
+        # Header for code editor (RTL: text on right)
+        header = tk.Frame(left_frame, bg=self.colors['bg'])
+        header.pack(fill="x", pady=(0, 5))
+        tk.Label(header, text="קוד 📝", font=("Arial", 12, "bold"), 
+                bg=self.colors['bg'], fg=self.colors['text'],
+                anchor="e", justify="right").pack(side="right")
+        
+        # Code editor frame
+        code_frame = tk.Frame(left_frame, bg=self.colors['card_bg'], 
+                             relief=tk.SOLID, bd=1)
+        code_frame.pack(fill="both", expand=True)
+        
+        # Line numbers (RIGHT side for RTL)
+        self.line_numbers = tk.Text(code_frame, width=4, padx=3, takefocus=0, 
+                                    border=0, background="#e9e9e9", 
+                                    fg=self.colors['text_secondary'],
+                                    state="disabled", wrap="none", 
+                                    font=("Courier New", 10))
+        self.line_numbers.pack(side="right", fill="y")
+        
+        # Scrollbar (LEFT side for RTL)
+        scroll = ttk.Scrollbar(code_frame, command=self._on_scrollbar)
+        scroll.pack(side="left", fill="y")
+        
+        # Code text widget (CENTER)
+        self.code = tk.Text(code_frame, wrap="none", undo=True, 
+                           font=("Courier New", 10),
+                           bg=self.colors['card_bg'], fg=self.colors['text'],
+                           insertbackground=self.colors['primary'],
+                           yscrollcommand=self._on_code_yview)
+        self._code_scroll = scroll
+        self.code.pack(side="left", fill="both", expand=True)
+
+        # Syntax highlighting colors
+        self.code.tag_configure("errorline", background="#ffebee")
+        self.code.tag_configure("currentline", background="#e3f2fd")
+        self.code.tag_configure("comment", foreground="#757575", font=("Courier New", 10, "italic"))
+        self.code.tag_configure("keyword", foreground="#1976D2", font=("Courier New", 10, "bold"))
+        self.code.tag_configure("register", foreground="#D32F2F", font=("Courier New", 10, "bold"))
+        self.code.tag_configure("number", foreground="#388E3C")
+        for level, color in enumerate(HEAT_COLORS):
+            self.code.tag_configure(f"heat{level}", background=color)
+            self.code.tag_lower(f"heat{level}", "errorline")
+        # breakpoint: לחיצה על מספר השורה; התג זז עם השורה כשעורכים את הקוד
+        self.code.tag_configure("breakpoint", background="#FFCDD2")
+        self.code.tag_lower("breakpoint", "errorline")
+        self.line_numbers.bind("<Button-1>", self._toggle_breakpoint)
+
+        self.code.bind("<KeyRelease>", self.update_line_numbers)
+        self.code.bind("<Button-4>", self.update_line_numbers)
+        self.code.bind("<Button-5>", self.update_line_numbers)
+        # עריכות שמזיזות או מחליפות טקסט מעבר לשורת הסמן
+        for event in ("<<Paste>>", "<<Cut>>", "<<Undo>>", "<<Redo>>"):
+            self.code.bind(event, self._invalidate_highlight, add="+")
+
+        # RIGHT PANEL - Cards and outputs
+        right_frame = tk.Frame(main, bg=self.colors['bg'], width=400)
+        right_frame.pack(side="right", fill="both", expand=False, padx=(5, 0))
+        right_frame.pack_propagate(False)
+        
+        # Controls at top
+        controls_frame = tk.Frame(right_frame, bg=self.colors['card_bg'], 
+                                 relief=tk.RAISED, bd=1)
+        controls_frame.pack(fill="x", pady=(0, 5))
+        self._build_controls_row(controls_frame)
+
+        # Cards container with scrolling
+        cards_frame = tk.Frame(right_frame, bg=self.colors['bg'])
+        cards_frame.pack(fill="both", expand=True)
+
+        cards_scroll = ttk.Scrollbar(cards_frame, orient=tk.VERTICAL)
+        cards_canvas = tk.Canvas(cards_frame, yscrollcommand=cards_scroll.set, 
+                                bg=self.colors['bg'], highlightthickness=0)
+        cards_scroll.config(command=cards_canvas.yview)
+        cards_scroll.pack(side="right", fill="y")
+        cards_canvas.pack(side="left", fill="both", expand=True)
+
+        cards_container = tk.Frame(cards_canvas, bg=self.colors['bg'])
+        cards_canvas.create_window((0, 0), window=cards_container, anchor="nw")
+
+        def update_cards_scroll(event):
+            cards_canvas.configure(scrollregion=cards_canvas.bbox("all"))
+        cards_container.bind("<Configure>", update_cards_scroll)
+
+        # Task card
+        task_card = self._create_card(cards_container, "📋 משימה")
+        self.task_label = tk.Label(task_card, text="(אין משימה בקוד הנוכחי)", 
+                                   wraplength=300, justify="right",
+                                   bg=self.colors['card_bg'], fg=self.colors['text'],
+                                   font=("Arial", 10))
+        self.task_label.pack(anchor="e", padx=5, pady=5)
+
+        # Python equivalent card
+        python_card = self._create_card(cards_container, "🐍 קוד Python מקביל", "#E8F5E9")
+        self.python_text = scrolledtext.ScrolledText(python_card, height=4,
+                                                     font=("Courier New", 9),
+                                                     state="disabled", bg="white",
+                                                     fg="#2E7D32", wrap="word")
+        self.python_text.pack(fill="both", expand=True, padx=5, pady=5)
+        self.python_text.config(state="normal")
+        self.python_text.insert("1.0", "# הקוד Python יופיע כאן כשתריץ צעד")
+        self.python_text.config(state="disabled")
+
+        # Registers card (RTL: value on left, label on right)
+        regs_card = self._create_card(cards_container, "🔢 רגיסטרים", self.colors['register'])
+        regs_grid = tk.Frame(regs_card, bg=self.colors['register'])
+        regs_grid.pack(fill="x", padx=5, pady=5)
+
+        self.reg_labels = {}
+        for i, reg in enumerate(["R1", "R2", "R3", "L1"]):
+            row, col = i // 2, i % 2
+            # Value on LEFT (RTL)
+            lbl = tk.Label(regs_grid, text="0", 
+                          font=("Courier New", 13, "bold"),
+                          width=8, anchor="e",  # Right-aligned text
+                          bg=self.colors['register'],
+                          fg=self.colors['primary'])
+            lbl.grid(row=row, column=col*2, sticky="e", padx=5, pady=4)
+            # Label on RIGHT (RTL)
+            tk.Label(regs_grid, text=f":{reg}",  # Colon on right
+                    font=("Arial", 10, "bold"),
+                    bg=self.colors['register'], 
+                    fg=self.colors['text']).grid(
+                        row=row, column=col*2+1, sticky="w", padx=5, pady=4)
+            self.reg_labels[reg] = lbl
+
+        # Flags card
+        flags_card = self._create_card(cards_container, "🚩 דגלים", "#FFF9C4")
+        flags_grid = tk.Frame(flags_card, bg="#FFF9C4")
+        flags_grid.pack(fill="x", padx=5, pady=5)
+
+        self.flag_labels = {}
+        for i, flag in enumerate(["ZERO", "NEGATIVE"]):
+            tk.Label(flags_grid, text=f"{flag}:", font=("Arial", 10, "bold"),
+                    bg="#FFF9C4", fg=self.colors['text']).grid(
+                        row=0, column=i*2, sticky="e", padx=5, pady=4)
+            lbl = tk.Label(flags_grid, text="לא", font=("Arial", 11, "bold"),
+                          width=5, bg="#FFF9C4", fg=self.colors['flag_off'])
+            lbl.grid(row=0, column=i*2+1, sticky="w", padx=5, pady=4)
+            self.flag_labels[flag] = lbl
+
+        # Stacks card (RTL: S1 on right, S2 on left)
+        stacks_card = self._create_card(cards_container, "📚 מחסניות", self.colors['stack'])
+        
+        stacks_frame = tk.Frame(stacks_card, bg=self.colors['stack'])
+        stacks_frame.pack(fill="x", padx=5, pady=5)
+
+        # S1 on RIGHT (RTL)
+        s1_frame = tk.Frame(stacks_frame, bg=self.colors['stack'])
+        s1_frame.pack(side="right", padx=5, expand=True, fill="both")
+        tk.Label(s1_frame, text="S1", font=("Arial", 10, "bold"),
+                bg=self.colors['stack'], fg=self.colors['text']).pack()
+        self.stack1_listbox = tk.Listbox(s1_frame, height=4, width=12,
+                                         font=("Courier New", 9),
+                                         bg="white", fg=self.colors['text'])
+        self.stack1_listbox.pack(fill="both", expand=True)
+
+        # S2 on LEFT (RTL)
+        s2_frame = tk.Frame(stacks_frame, bg=self.colors['stack'])
+        s2_frame.pack(side="left", padx=5, expand=True, fill="both")
+        tk.Label(s2_frame, text="S2", font=("Arial", 10, "bold"),
+                bg=self.colors['stack'], fg=self.colors['text']).pack()
+        self.stack2_listbox = tk.Listbox(s2_frame, height=4, width=12,
+                                         font=("Courier New", 9),
+                                         bg="white", fg=self.colors['text'])
+        self.stack2_listbox.pack(fill="both", expand=True)
+
+        counters_frame = tk.Frame(stacks_card, bg=self.colors['stack'])
+        counters_frame.pack(fill="x", padx=5, pady=5)
+        
+        tk.Label(counters_frame, text="C1:", font=("Arial", 9, "bold"),
+                bg=self.colors['stack'], fg=self.colors['text']).pack(side="left", padx=5)
+        self.c1_label = tk.Label(counters_frame, text="0", font=("Courier New", 11, "bold"),
+                                bg=self.colors['stack'], fg=self.colors['primary'])
+        self.c1_label.pack(side="left", padx=5)
+        
+        tk.Label(counters_frame, text="C2:", font=("Arial", 9, "bold"),
+                bg=self.colors['stack'], fg=self.colors['text']).pack(side="left", padx=15)
+        self.c2_label = tk.Label(counters_frame, text="0", font=("Courier New", 11, "bold"),
+                                bg=self.colors['stack'], fg=self.colors['primary'])
+        self.c2_label.pack(side="left", padx=5)
+
+        # Memory (LIST) card
+        mem_card = self._create_card(cards_container, "💾 זיכרון (LIST)", self.colors['memory'])
+        mem_frame = tk.Frame(mem_card, bg=self.colors['memory'])
+        mem_frame.pack(fill="both", expand=True, padx=5, pady=5)
+
+        mem_scroll = ttk.Scrollbar(mem_frame)
+        mem_scroll.pack(side="right", fill="y")
+
+        self.mem_tree = ttk.Treeview(mem_frame, columns=("value",), show="tree headings",
+                                     height=8, yscrollcommand=mem_scroll.set)
+        mem_scroll.config(command=self.mem_tree.yview)
+        self.mem_tree.heading("#0", text="Index")
+        self.mem_tree.heading("value", text="Value")
+        self.mem_tree.column("#0", width=80)
+        self.mem_tree.column("value", width=100)
+        self.mem_tree.pack(side="left", fill="both", expand=True)
+
+        # Style for treeview
+        style = ttk.Style()
+        style.configure("Treeview", background=self.colors['memory'], 
+                       fieldbackground=self.colors['memory'])
+
+        self.mem_items = [self.mem_tree.insert("", "end", text=str(i), values=(str(i),)) for i in range(33)]
+
+        # Output preview card
+        out_preview_card = self._create_card(cards_container, "📤 פלט (תצוגה מהירה)", "#E8F5E9")
+        self.out_preview = scrolledtext.ScrolledText(out_preview_card, height=6,
+                                                     font=("Courier New", 10),
+                                                     state="disabled", bg="white",
+                                                     fg=self.colors['success'])
+        self.out_preview.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # Bottom: Notebook (existing tabs)
+        self.notebook = ttk.Notebook(right_frame)
+        self.notebook.pack(fill="both", expand=True, pady=(5, 0))
+
+        # Output tab
+        out_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
+        self.notebook.add(out_frame, text="📤 פלט")
+        self.out = scrolledtext.ScrolledText(out_frame, font=("Courier New", 10),
+                                             bg=self.colors['card_bg'], 
+                                             fg=self.colors['success'])
+        self.out.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # Error tab
+        err_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
+        self.notebook.add(err_frame, text="⚠ שגיאות")
+        self.err = scrolledtext.ScrolledText(err_frame, font=("Courier New", 10),
+                                             foreground=self.colors['error'],
+                                             bg=self.colors['card_bg'])
+        self.err.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # State tab
+        state_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
+        self.notebook.add(state_frame, text="🔍 מצב")
+        self.state = scrolledtext.ScrolledText(state_frame, font=("Courier New", 10),
+                                               bg=self.colors['card_bg'], 
+                                               fg=self.colors['text'])
+        self.state.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # History tab
+        hist_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
+        self.notebook.add(hist_frame, text="📜 היסטוריה")
+        self.history = scrolledtext.ScrolledText(hist_frame, font=("Courier New", 9),
+                                                 bg=self.colors['card_bg'], 
+                                                 fg=self.colors['text_secondary'])
+        self.history.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def _create_card(self, parent, title, bg_color=None):
+        """Create a styled card frame"""
+        if bg_color is None:
+            bg_color = self.colors['card_bg']
+        
+        card = tk.LabelFrame(parent, text=title, font=("Arial", 10, "bold"),
+                            bg=bg_color, fg=self.colors['text'],
+                            relief=tk.RAISED, bd=2)
+        card.pack(fill="both", expand=True, padx=5, pady=5)
+        return card
+
+    def _on_scrollbar(self, *args):
+        self.code.yview(*args)
+        self.line_numbers.yview(*args)
+
+    def update_line_numbers(self, event=None):
+        """
+        נקרא בכל הקשה/גלילה: מסמן את שורת הסמן ומתזמן מעבר עדכון אחד לעורך.
+        הקשות שמגיעות לפני שהמעבר רץ מתאחדות אליו.
+        """
+        self._hl_dirty.add(int(self.code.index("insert").split(".")[0]))
+        if self._editor_job is None:
+            self._editor_job = self.after(EDITOR_DELAY_MS, self._editor_pass)
+
+    def _invalidate_highlight(self, event=None):
+        """
+        המטמון ממופה לפי אינדקס שורה, ולכן לא תקף אחרי עריכה שמזיזה שורות או מחליפה
+        את הטקסט (התוכן באינדקס יכול להיות זהה בלי התגים). ההדגשה הבאה מציירת הכל.
+        """
+        self._hl_cache.clear()
+        self._hl_dirty.clear()
+        if event is not None:
+            self.update_line_numbers()
+
+    def _set_code(self, text: str):
+        """החלפת כל תוכן העורך"""
+        self.code.delete("1.0", "end")
+        self.code.insert("1.0", text)
+        self._invalidate_highlight()
+
+    def _editor_pass(self):
+        """gutter (רק כשמספר השורות השתנה), הדגשת השורות הנראות ותצוגת Python"""
+        self._editor_job = None
+        count = int(self.code.index("end-1c").split(".")[0])
+        if count != self._gutter_lines:
+            self._gutter_lines = count
+            self._invalidate_highlight()
+            self.line_numbers.config(state="normal")
+            self.line_numbers.delete("1.0", "end")
+            self.line_numbers.insert("1.0", "\n".join(str(i) for i in range(1, count + 1)))
+            self.line_numbers.config(state="disabled")
+
+        # sync top
+        try:
+            self.line_numbers.yview_moveto(self.code.yview()[0])
+        except Exception:
+            pass
+
+        self._highlight_visible()
+        self.update_python_equivalent()
+
+    def _schedule_highlight(self):
+        if self._hl_job is None:
+            self._hl_job = self.after(HIGHLIGHT_DELAY_MS, self._highlight_visible)
+
+    def _on_code_yview(self, first, last):
+        """yscrollcommand של העורך: מעדכן את ה-scrollbar ומדגיש שורות שנכנסו לתצוגה"""
+        self._code_scroll.set(first, last)
+        self._schedule_highlight()
+
+    def _highlight_visible(self):
+        """
+        מדגיש רק שורות נראות שהשתנו מאז ההדגשה האחרונה (לפי תוכן השורה באותו
+        אינדקס) או שהסמן עבר בהן. שורות מחוץ לתצוגה מודגשות כשהן נגללות פנימה.
+        """
+        self._hl_job = None
+        code = self.code
+        first = int(code.index("@0,0").split(".")[0])
+        last = int(code.index(f"@0,{code.winfo_height()}").split(".")[0])
+        cache, dirty = self._hl_cache, self._hl_dirty
+        for i, line in enumerate(code.get(f"{first}.0", f"{last}.end").split("\n"), first):
+            if i in dirty or cache.get(i) != line:
+                for tag in SYNTAX_TAGS:
+                    code.tag_remove(tag, f"{i}.0", f"{i}.end")
+                for match in HIGHLIGHT_TOKEN.finditer(line):
+                    code.tag_add(match.lastgroup, f"{i}.{match.start()}", f"{i}.{match.end()}")
+                cache[i] = line
+        dirty.difference_update(range(first, last + 1))
+
+    def clear_output(self):
+        self.out.delete("1.0", "end")
+        self.err.delete("1.0", "end")
+        self.state.delete("1.0", "end")
+        self.history.delete("1.0", "end")
+        self.code.tag_remove("errorline", "1.0", "end")
+        for level in range(len(HEAT_COLORS)):
+            self.code.tag_remove(f"heat{level}", "1.0", "end")
+
+    def show_profile(self, profile: Profile):
+        """שכבת חום על העורך לפי מספר הביצועים של כל שורה, וטבלת השורות החמות בלשונית המצב"""
+        counts = profile.by_line()
+        if not counts:
+            return
+        top, total = max(counts.values()), sum(counts.values())
+        levels = len(HEAT_COLORS)
+        for line_no, count in counts.items():
+            level = min(levels - 1, int(math.log(count) / math.log(top) * levels)) if top > 1 else levels - 1
+            self.code.tag_add(f"heat{level}", f"{line_no}.0", f"{line_no}.end")
+        self.state.insert("end", "\n=== פרופיל: שורות חמות ===\n\n", "header")
+        for line_no, raw, count, seconds in profile.hot_lines(10):
+            self.state.insert("end", f"שורה {line_no:>4}: {count:>9} ({count / total:5.1%}) "
+                                     f"~{seconds * 1000:.1f}ms  {raw}\n")
+
+    def copy_output(self):
+        txt = self.out.get("1.0", "end-1c")
+        self.clipboard_clear()
+        self.clipboard_append(txt)
+        messagebox.showinfo("הצלחה", "הפלט הועתק ללוח.")
+
+    def new_file(self):
+        if messagebox.askyesno("חדש", "לנקות את העורך?"):
+            self._set_code("")
+            self.clear_output()
+            self.update_line_numbers()
+            self.current_level = None
+            self.current_example = None
+            self._update_navigation_buttons()
+
+    def open_file(self):
+        filename = filedialog.askopenfilename(
+            title="פתח קובץ",
+            filetypes=[("Assembly files", "*.asm"), ("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                content = f.read()
+            self._set_code(content)
+            self.clear_output()
+            self.update_line_numbers()
+            self.current_level = None
+            self.current_example = None
+            self._update_navigation_buttons()
+        except Exception as e:
+            messagebox.showerror("שגיאה", f"לא ניתן לפתוח:\n{e}")
+
+    def save_file(self):
+        filename = filedialog.asksaveasfilename(
+            title="שמור קובץ",
+            defaultextension=".asm",
+            filetypes=[("Assembly files", "*.asm"), ("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(self.code.get("1.0", "end-1c"))
+            messagebox.showinfo("הצלחה", "נשמר.")
+        except Exception as e:
+            messagebox.showerror("שגיאה", f"לא ניתן לשמור:\n{e}")
+
+    def load_example(self, level: str, example: str = None):
+        if example is None:
+            # Backward compatibility
+            code = EXAMPLES.get(level) if isinstance(EXAMPLES.get(level), str) else None
+            if not code:
+                return
+        else:
+            code = EXAMPLES.get(level, {}).get(example)
+            if not code:
+                return
+
+        # Save current position
+        self.current_level = level
+        self.current_example = example
+        
+        self._set_code(code)
+        self.clear_output()
+        self.update_line_numbers()
+        self.update_task_card()
+        self.on_reset()
+        self._update_navigation_buttons()
+        self.update_python_equivalent()
+
+    def on_run(self):
+        if self.run_thread is not None:
+            return
+        self.clear_output()
+        program = self.code.get("1.0", "end")
+        seed_txt = self.seed_var.get().strip()
+        seed = None
+        if seed_txt:
+            try:
+                seed = int(seed_txt)
+            except ValueError:
+                messagebox.showerror("שגיאה", "Seed חייב להיות מספר שלם.")
+                return
+
+        try:
+            max_steps = int(self.steps_var.get().strip() or "200000")
+        except ValueError:
+            messagebox.showerror("שגיאה", "Max steps חייב להיות מספר שלם.")
+            return
+
+        profile = Profile(PROFILE_SAMPLE_EVERY) if self.profile_var.get() else None
+        history = self.history_var.get()
+        cached = not history and profile is None
+        self.run_shown = 0
+        try:
+            if cached:
+                result = self.results.lookup(program, seed=seed, max_steps=max_steps)
+                if result is not None:
+                    self.run_status.config(text=f"{result.steps:,} צעדים (מהמטמון)")
+                    self._show_run_result(result.machine, result.error, profile)
+                    return
+            # מוצגים רק 50 הצעדים האחרונים
+            ex = Executor(program, seed, max_steps, save_history=history, history_capacity=50 if history else None,
+                          limits=Limits(cancel=threading.Event()), profile=profile)
+        except AsmError as e:
+            self.run_status.config(text="")
+            self._show_run_result(None, e, profile)
+            return
+
+        # הריצה עצמה ב-thread; _poll_run מציג התקדמות ופלט חלקי ומסיים כשה-thread נגמר
+        outcome = []
+
+        def work():
+            try:
+                ex.run(engine="python")
+                outcome.append(None)
+            except Exception as e:
+                outcome.append(e)
+
+        self.run_executor = ex
+        self.run_thread = threading.Thread(target=work, daemon=True)
+        self.run_outcome = outcome
+        self.run_cached = (program, seed, max_steps) if cached else None
+        self.run_rate = (time.perf_counter(), 0)
+        self.run_btn.config(state="disabled")
+        self.run_thread.start()
+        self.after(RUN_POLL_MS, self._poll_run)
+
+    def on_stop_run(self):
+        """עצירה שיתופית: ה-Executor בודק את הדגל בבדיקת המגבלות הבאה"""
+        if self.run_executor is not None:
+            self.run_executor.limits.cancel.set()
+
+    def _stream_output(self, output: list, limit: int = None):
+        """מוסיף ללשונית הפלט את הערכים שעוד לא הוצגו (עד limit ערכים)"""
+        n = len(output)
+        if limit is not None:
+            n = min(n, self.run_shown + limit)
+        if n > self.run_shown:
+            if self.run_shown == 0:
+                self.out.insert("end", "=== פלט ===\n", "header")
+            self.out.insert("end", "\n".join(str(x) for x in output[self.run_shown:n]) + "\n")
+            self.out.see("end")
+            self.run_shown = n
+
+    def _poll_run(self):
+        ex, thread = self.run_executor, self.run_thread
+        if thread.is_alive():
+            self._stream_output(ex.machine.output, RUN_STREAM_LIMIT)
+            now, steps = time.perf_counter(), ex.steps
+            then, before = self.run_rate
+            if now > then:
+                self.run_status.config(text=f"{steps:,} צעדים · {(steps - before) / (now - then):,.0f} צעדים/שנ'")
+                self.run_rate = (now, steps)
+            self.after(RUN_POLL_MS, self._poll_run)
+            return
+
+        error = self.run_outcome[0]
+        self.run_executor = self.run_thread = None
+        self.run_btn.config(state="normal")
+        self.run_status.config(text=f"{ex.steps:,} צעדים")
+        if self.run_cached is not None and (error is None or isinstance(error, AsmError)):
+            program, seed, max_steps = self.run_cached
+            self.results.store(program, RunResult(ex.machine, ex.steps, error), seed=seed, max_steps=max_steps)
+        self._show_run_result(ex.machine, error, ex.profile)
+
+    def _show_run_result(self, m, error, profile):
+        """תצוגת סוף ריצה: פלט (מה שעוד לא הוזרם), מצב, היסטוריה ופרופיל - או השגיאה"""
+        if error is None:
+            # output
+            self._stream_output(m.output)
+            if not self.run_shown:
+                self.out.insert("end", "(אין פלט)\n", "info")
+
+            # state
+            self.state.insert("end", "=== מצב סופי ===\n\n", "header")
+            self.state.insert("end", f"R1 = {m.regs['R1']}\n")
+            self.state.insert("end", f"R2 = {m.regs['R2']}\n")
+            self.state.insert("end", f"R3 = {m.regs['R3']}\n")
+            self.state.insert("end", f"L1 = {m.L1}\n\n")
+            self.state.insert("end", f"C1 = {len(m.stacks['S1'])} S1 = {m.stacks['S1']}\n")
+            self.state.insert("end", f"C2 = {len(m.stacks['S2'])} S2 = {m.stacks['S2']}\n\n")
+            self.state.insert("end", f"ZERO = {m.flags['ZERO']} NEGATIVE = {m.flags['NEGATIVE']}\n\n")
+            self.state.insert("end", f"LIST (0..9): {m.LIST[:10]} ...\n")
+
+            # history
+            if self.history_var.get() and m.execution_history:
+                self.history.insert("end", "=== היסטוריה (50 אחרונים) ===\n\n")
+                for i, st in enumerate(m.execution_history[-50:], 1):
+                    self.history.insert("end", f"[{i}] {st['step']}\n")
+                    self.history.insert("end",
+                        f"  R1={st['R1']} R2={st['R2']} R3={st['R3']} L1={st['L1']} "
+                        f"C1={st['C1']} C2={st['C2']} ZERO={st['ZERO']} NEG={st['NEGATIVE']}\n")
+
+            if profile is not None:
+                self.show_profile(profile)
+
+            self.notebook.select(0)
+            self.update_right_cards(m)
+
+        elif isinstance(error, AsmError):
+            e = error
+            if m is not None and not isinstance(e, RunCancelledError):
+                self._stream_output(m.output)
+            if e.line_no:
+                self.code.tag_add("errorline", f"{e.line_no}.0", f"{e.line_no}.end")
+                self.code.see(f"{e.line_no}.0")
+            if profile is not None:
+                self.show_profile(profile)
+
+            msg = "=== שגיאה ===\n\n"
+            if e.line_no:
+                msg += f"שורה {e.line_no}: {e}\n"
+                if e.raw_line is not None:
+                    msg += f"קוד מקור: {e.raw_line}\n"
+            else:
+                msg += f"{e}\n"
+            self.err.insert("end", msg)
+            self.notebook.select(1)
+        else:
+            self.err.insert("end", f"שגיאה בלתי צפויה: {error}\n")
+            self.notebook.select(1)
+
+    def on_step(self):
+        """ביצוע צעד אחד"""
+        self._advance(1)
+
+    def _start_stepper(self) -> bool:
+        """יצירת ה-stepper (או המשך מה-Executor אחרי חזרה אחורה); False אם הקלט לא תקין"""
+        if self.step_executor is not None and self.step_history_index < len(self.step_history) - 1:
+            # חזרנו אחורה: ה-Executor כבר במצב הנוכחי, ממשיכים ממנו
+            while len(self.step_history) > self.step_history_index + 1:
+                self.step_history.pop()
+            self.stepper = self.step_executor
+            return True
+
+        program = self.code.get("1.0", "end")
+        seed_txt = self.seed_var.get().strip()
+        seed = None
+        if seed_txt:
+            try:
+                seed = int(seed_txt)
+            except ValueError:
+                messagebox.showerror("שגיאה", "Seed חייב להיות מספר שלם.")
+                return False
+
+        try:
+            max_steps = int(self.steps_var.get().strip() or "200000")
+        except ValueError:
+            messagebox.showerror("שגיאה", "Max steps חייב להיות מספר שלם.")
+            return False
+
+        self.stepper = Executor(program, seed=seed, max_steps=max_steps,
+                                save_history=self.history_var.get(), undo_limit=UNDO_LIMIT)
+        self.step_executor = self.stepper
+        self.code.tag_remove("currentline", "1.0", "end")
+        self.code.tag_remove("errorline", "1.0", "end")
+        # נקה היסטוריה כשמתחילים stepper חדש
+        self.step_history.clear()
+        # מצב התחלתי
+        self.step_history.append((-1, 0, "", "START", []))
+        self.step_history_index = 0
+        return True
+
+    def _advance(self, count: int, breakpoints=(), deadline: float = None) -> bool:
+        """
+        עד count צעדים ב-stepper ורינדור אחד של המצב בסוף (פריים). עוצר לפני הוראה
+        שהשורה שלה ב-breakpoints, או כש-deadline (perf_counter) עבר.
+        מחזיר True אם אפשר להמשיך (לא סיום, שגיאה או breakpoint).
+        """
+        last = rec = None
+        try:
+            started = self.stepper is None
+            if started and not self._start_stepper():
+                return False
+            ex = self.stepper
+            code, history = ex.program.code, self.step_history
+            # breakpoint על ההוראה הראשונה: עוצרים לפני שהיא מבוצעת. בהמשך אחרי עצירה
+            # ה-stepper כבר קיים, כך שאותו breakpoint לא עוצר שוב
+            if (breakpoints and started and ex.steps == 0 and 0 <= ex.ip < len(code)
+                    and code[ex.ip].line_no in breakpoints):
+                self.run_status.config(text=f"breakpoint בשורה {code[ex.ip].line_no}")
+                self.highlight_current_line(code[ex.ip].line_no)
+                return False
+            for i in range(count):
+                rec = ex.step()
+                if rec is None:
+                    break
+                last = rec
+                # השינויים עצמם נרשמים ב-undo של ה-Executor
+                history.append(rec[1:])
+                if rec[4] == "HALT":
+                    break
+                if breakpoints and 0 <= ex.ip < len(code) and code[ex.ip].line_no in breakpoints:
+                    self.run_status.config(text=f"breakpoint בשורה {code[ex.ip].line_no}")
+                    self._render_step(last)
+                    return False
+                if deadline is not None and i & 255 == 255 and time.perf_counter() > deadline:
+                    break
+        except AsmError as e:
+            if last is not None:
+                self._render_step(last)
+            self.stepper = None
+            self.step_machine = None
+            if self.slow_running:
+                self.on_slow_run()  # Stop slow run
+
+            if e.line_no:
+                self.code.tag_add("errorline", f"{e.line_no}.0", f"{e.line_no}.end")
+                self.code.see(f"{e.line_no}.0")
+
+            msg = "=== שגיאה ===\n\n"
+            if e.line_no:
+                msg += f"שורה {e.line_no}: {e}\n"
+                if e.raw_line is not None:
+                    msg += f"קוד מקור: {e.raw_line}\n"
+            else:
+                msg += f"{e}\n"
+            self.err.insert("end", msg)
+            self.notebook.select(1)
+            return False
+
+        if last is not None:
+            self._render_step(last)
+        if rec is None:
+            self.stepper = None
+            messagebox.showinfo("סיום", "התוכנית הסתיימה.")
+            return False
+        # Check for HALT
+        if rec[4] == "HALT":
+            self.stepper = None
+            messagebox.showinfo("סיום", "התוכנית הסתיימה (HALT).")
+            return False
+        return True
+
+    def _render_step(self, rec):
+        """הצגת המצב אחרי הצעד האחרון שבוצע"""
+        machine, ip, line_no, raw, op, args = rec
+        self.step_history_index = len(self.step_history) - 1
+        self.step_machine = machine
+        self.highlight_current_line(line_no)
+        self.update_right_cards(machine)
+        self.update_python_equivalent()
+
+    def _breakpoint_lines(self) -> set:
+        """מספרי השורות שמסומנות כ-breakpoint (לפי התג, כך שהן זזות עם העריכה)"""
+        ranges = self.code.tag_ranges("breakpoint")
+        lines = set()
+        for start, end in zip(ranges[::2], ranges[1::2]):
+            first = int(str(start).split(".")[0])
+            last = int(self.code.index(f"{end} -1 chars").split(".")[0])
+            lines.update(range(first, last + 1))
+        return lines
+
+    def _toggle_breakpoint(self, event):
+        line = int(self.line_numbers.index(f"@{event.x},{event.y}").split(".")[0])
+        if "breakpoint" in self.code.tag_names(f"{line}.0"):
+            self.code.tag_remove("breakpoint", f"{line}.0", f"{line}.0 +1 lines")
+        else:
+            self.code.tag_add("breakpoint", f"{line}.0", f"{line}.0 +1 lines")
+        return "break"
+
+    def on_step_back(self):
+        """חזרה לצעד קודם"""
+        if self.step_history_index <= 0 or self.step_executor is None:
+            # אין מצב קודם
+            return
+        if not self.step_executor.step_back():
+            return
+
+        # חזור למצב הקודם
+        self.step_history_index -= 1
+        ip, line_no, raw, op, args = self.step_history[self.step_history_index]
+        machine = self.step_executor.machine
+
+        # עדכן את המצב הנוכחי
+        self.step_machine = machine
+        if line_no > 0:
+            self.highlight_current_line(line_no)
+        else:
+            self.code.tag_remove("currentline", "1.0", "end")
+        self.update_right_cards(machine)
+
+        # on_step הבא ימשיך מה-Executor שכבר נמצא במצב הזה
+        self.stepper = None
+
+    def on_reset(self):
+        """איפוס מצב"""
+        if self.slow_running:
+            self.on_slow_run()  # Stop slow run
+        self.on_stop_run()
+        self.stepper = None
+        self.step_machine = None
+        self.step_history.clear()
+        self.step_history_index = -1
+        self.step_executor = None
+        self.code.tag_remove("currentline", "1.0", "end")
+        
+        # Reset cards to initial state
+        m = Machine()
+        self.update_right_cards(m)
+        
+        # Update Python equivalent card with current program
+        self.update_python_equivalent()
+
+    def on_slow_run(self):
+        """הרצה איטית - toggle"""
+        if self.slow_running:
+            # Stop
+            if self.after_id:
+                self.after_cancel(self.after_id)
+                self.after_id = None
+            self.slow_running = False
+            self.slow_run_btn.config(text="⏯ הרצה איטית")
+        else:
+            # Start
+            self.slow_running = True
+            self.slow_run_btn.config(text="⏸ עצור")
+            try:
+                delay = int(self.delay_var.get().strip() or "150")
+                if delay < SLOW_FRAME_MS:
+                    delay = SLOW_FRAME_MS
+                elif delay > 1000:
+                    delay = 1000
+            except ValueError:
+                delay = 150
+            try:
+                self.slow_speed = max(0, int(self.speed_var.get().strip() or "0"))
+            except ValueError:
+                self.slow_speed = 0
+            self.slow_credit = 0.0
+            self.slow_last = time.perf_counter()
+            self.run_status.config(text="")
+            self._slow_run_step(delay)
+
+    def _slow_run_step(self, delay):
+        """
+        פריים אחד בהרצה איטית: צעד אחד כל delay ms, או - כשיש מהירות - כל הצעדים
+        שהקצב מצדיק מאז הפריים הקודם, עם רינדור אחד בסוף.
+        """
+        if not self.slow_running:
+            return
+
+        count, interval, deadline = 1, delay, None
+        if self.slow_speed:
+            now = time.perf_counter()
+            # פריים שהתעכב (חלון נגרר וכו') לא צובר יותר מרבע שנייה של צעדים
+            self.slow_credit += min(now - self.slow_last, 0.25) * self.slow_speed
+            self.slow_last = now
+            count = int(self.slow_credit)
+            self.slow_credit -= count
+            interval, deadline = SLOW_FRAME_MS, now + SLOW_FRAME_BUDGET
+        try:
+            if count and not self._advance(count, self._breakpoint_lines(), deadline):
+                # Program ended, error or breakpoint
+                self.slow_running = False
+                self.slow_run_btn.config(text="⏯ הרצה איטית")
+            elif self.slow_running:
+                self.after_id = self.after(interval, lambda: self._slow_run_step(delay))
+        except Exception:
+            self.slow_running = False
+            self.slow_run_btn.config(text="⏯ הרצה איטית")
+
+    def highlight_current_line(self, line_no):
+        """הדגשת שורה נוכחית"""
+        self.code.tag_remove("currentline", "1.0", "end")
+        if line_no:
+            self.code.tag_add("currentline", f"{line_no}.0", f"{line_no}.end")
+            self.code.see(f"{line_no}.0")
+
+    def update_task_card(self):
+        """עדכון כרטיס המשימה"""
+        content = self.code.get("1.0", "end")
+        lines = content.splitlines()
+        task_text = "(אין משימה בקוד הנוכחי)"
+        for line in lines:
+            if line.strip().startswith("; משימה:"):
+                task_text = line.strip()[9:].strip()  # Remove "; משימה:"
+                break
+        self.task_label.config(text=task_text)
+
+    def update_python_equivalent(self, op: str = None, args: List[str] = None):
+        """
+        עדכון כרטיס הקוד Python המקביל - מציג את כל התוכנית מתורגמת ל-Python.
+        כל שורה מתורגמת פעם אחת (מטמון לפי תוכן השורה), והכרטיס נכתב רק כשהתוצאה השתנתה.
+        """
+        # קרא את כל הקוד מהעורך
+        program_text = self.code.get("1.0", "end-1c")
+        if program_text == self._py_source:
+            return
+        self._py_source = program_text
+
+        if not program_text.strip():
+            text = "# הקוד Python יופיע כאן כשתריץ צעד"
+        else:
+            text = self._translate_program(program_text)
+        if text == self._py_preview:
+            return
+        self._py_preview = text
+        self.python_text.config(state="normal")
+        self.python_text.delete("1.0", "end")
+        self.python_text.insert("1.0", text)
+        self.python_text.config(state="disabled")
+
+    def _translate_program(self, program_text: str) -> str:
+        """כמו parse_program + get_python_equivalent לכל פקודה, עם מטמון per-line"""
+        cache = self._py_lines
+        if len(cache) > PY_LINE_CACHE_SIZE:
+            cache.clear()
+        labels = set()
+        python_lines = []
+        failure = None
+        for raw in program_text.splitlines():
+            entry = cache.get(raw)
+            if entry is None:
+                entry = cache[raw] = _translate_line(raw)
+            kind, value = entry
+            if kind == "label":
+                # שגיאות תוויות של parse_program קודמות לכל שגיאת תרגום
+                if not value:
+                    return "# שגיאה בתרגום: תווית ריקה"
+                if value.upper() in labels:
+                    return f"# שגיאה בתרגום: תווית כפולה '{value}'"
+                labels.add(value.upper())
+            elif kind == "code":
+                python_lines.append(value)
+            elif kind == "error" and failure is None:
+                failure = value
+        if failure is not None:
+            return f"# שגיאה בתרגום: {failure}"
+        if not python_lines:
+            return "# אין פקודות בקוד"
+        # הצג את כל הקוד Python בלבד
+        return "\n".join(python_lines)
+
+    def update_right_cards(self, machine: Machine):
+        """
+        עדכון כל הכרטיסים הימניים. רק רכיבים שהערך שלהם השתנה מאז הציור
+        הקודם נכתבים מחדש, כך שכל צעד עולה לפי מספר השינויים.
+        """
+        rendered = self._rendered
+
+        # Registers
+        for reg in ["R1", "R2", "R3", "L1"]:
+            if reg == "L1":
+                value = machine.L1
+            else:
+                value = machine.regs[reg]
+            if rendered.get(reg) != value:
+                rendered[reg] = value
+                self.reg_labels[reg].config(text=str(value))
+
+        # Flags
+        for flag_name, lbl in self.flag_labels.items():
+            is_set = machine.flags[flag_name]
+            if rendered.get(flag_name) != is_set:
+                rendered[flag_name] = is_set
+                lbl.config(text="כן" if is_set else "לא",
+                          fg=self.colors['flag_on'] if is_set else self.colors['flag_off'])
+
+        # Stacks: רק הסיומת שאחרי הקידומת המשותפת נמחקת ונכתבת מחדש
+        for name, listbox, counter in (("S1", self.stack1_listbox, self.c1_label),
+                                       ("S2", self.stack2_listbox, self.c2_label)):
+            stack = machine.stacks[name]
+            old = rendered.get(name, ())
+            if len(old) == len(stack) and old == stack:
+                continue
+            keep = 0
+            for keep, (a, b) in enumerate(zip(old, stack), 1):
+                if a != b:
+                    keep -= 1
+                    break
+            listbox.delete(keep, "end")
+            for val in stack[keep:]:
+                listbox.insert("end", str(val))
+            if len(old) != len(stack):
+                counter.config(text=str(len(stack)))
+            rendered[name] = list(stack)
+
+        # Memory (LIST)
+        cells = rendered.get("LIST")
+        if cells is None:
+            cells = rendered["LIST"] = [None] * len(self.mem_items)
+        for i, item in enumerate(self.mem_items):
+            value = machine.LIST[i]
+            if cells[i] != value:
+                cells[i] = value
+                self.mem_tree.item(item, values=(str(value),))
+
+        # Output preview
+        preview = machine.output[-20:]  # Last 20 values
+        if rendered.get("output") != preview:
+            rendered["output"] = preview
+            self.out_preview.config(state="normal")
+            self.out_preview.delete("1.0", "end")
+            if preview:
+                self.out_preview.insert("1.0", "\n".join(str(x) for x in preview))
+            else:
+                self.out_preview.insert("1.0", "(אין פלט)")
+            self.out_preview.config(state="disabled")
+
+    def next_example(self):
+        """עבור לתרגיל הבא"""
+        if self.current_level is None or self.current_example is None:
+            return
+        
+        level_examples = list(EXAMPLES.get(self.current_level, {}).keys())
+        if not level_examples:
+            return
+        
+        try:
+            current_index = level_examples.index(self.current_example)
+            if current_index < len(level_examples) - 1:
+                # יש תרגיל הבא באותה רמה
+                next_example = level_examples[current_index + 1]
+                self.load_example(self.current_level, next_example)
+            else:
+                # עבור לרמה הבאה
+                all_levels = list(EXAMPLES.keys())
+                current_level_index = all_levels.index(self.current_level)
+                if current_level_index < len(all_levels) - 1:
+                    next_level = all_levels[current_level_index + 1]
+                    next_level_examples = list(EXAMPLES[next_level].keys())
+                    if next_level_examples:
+                        self.load_example(next_level, next_level_examples[0])
+        except (ValueError, IndexError):
+            pass
+
+    def prev_example(self):
+        """עבור לתרגיל הקודם"""
+        if self.current_level is None or self.current_example is None:
+            return
+        
+        level_examples = list(EXAMPLES.get(self.current_level, {}).keys())
+        if not level_examples:
+            return
+        
+        try:
+            current_index = level_examples.index(self.current_example)
+            if current_index > 0:
+                # יש תרגיל קודם באותה רמה
+                prev_example = level_examples[current_index - 1]
+                self.load_example(self.current_level, prev_example)
+            else:
+                # עבור לרמה הקודמת
+                all_levels = list(EXAMPLES.keys())
+                current_level_index = all_levels.index(self.current_level)
+                if current_level_index > 0:
+                    prev_level = all_levels[current_level_index - 1]
+                    prev_level_examples = list(EXAMPLES[prev_level].keys())
+                    if prev_level_examples:
+                        # טען את התרגיל האחרון ברמה הקודמת
+                        self.load_example(prev_level, prev_level_examples[-1])
+        except (ValueError, IndexError):
+            pass
+
+    def _update_navigation_buttons(self):
+        """עדכון מצב כפתורי הניווט"""
+        if self.current_level is None or self.current_example is None:
+            self.prev_example_btn.config(state="disabled")
+            self.next_example_btn.config(state="disabled")
+            return
+        
+        # בדוק אם יש תרגיל קודם
+        level_examples = list(EXAMPLES.get(self.current_level, {}).keys())
+        all_levels = list(EXAMPLES.keys())
+        
+        has_prev = False
+        has_next = False
+        
+        try:
+            current_index = level_examples.index(self.current_example)
+            current_level_index = all_levels.index(self.current_level)
+            
+            # בדוק אם יש תרגיל קודם
+            if current_index > 0:
+                has_prev = True
+            elif current_level_index > 0:
+                has_prev = True  # יש רמה קודמת
+            
+            # בדוק אם יש תרגיל הבא
+            if current_index < len(level_examples) - 1:
+                has_next = True
+            elif current_level_index < len(all_levels) - 1:
+                has_next = True  # יש רמה הבאה
+        except (ValueError, IndexError):
+            pass
+        
+        self.prev_example_btn.config(state="normal" if has_prev else "disabled")
+        self.next_example_btn.config(state="normal" if has_next else "disabled")
+
+    def _create_guide_section(self, parent, section):
+        """יצירת סקציה מעוצבת במדריך"""
+        # Section card
+        card = tk.Frame(parent, bg=section.get("color", "#ffffff"), 
+                       relief=tk.RAISED, bd=2)
+        card.pack(fill="x", pady=10)
+        
+        # Header
+        header = tk.Frame(card, bg=section.get("color", "#ffffff"))
+        header.pack(fill="x", padx=15, pady=(15, 10))
+        
+        icon_title = tk.Label(header, text=section["title"], 
+                             font=("Arial", 16, "bold"),
+                             bg=section.get("color", "#ffffff"),
+                             fg="#212121")
+        icon_title.pack(anchor="w")
+        
+        # Separator
+        sep = tk.Frame(card, height=2, bg="#BDBDBD")
+        sep.pack(fill="x", padx=15, pady=5)
+        
+        # Content
+        content_frame = tk.Frame(card, bg=section.get("color", "#ffffff"))
+        content_frame.pack(fill="x", padx=15, pady=(5, 15))
+        
+        # Simple content
+        if "content" in section:
+            content_label = tk.Label(content_frame, text=section["content"],
+                                    font=("Arial", 11),
+                                    bg=section.get("color", "#ffffff"),
+                                    fg="#424242", justify="right", wraplength=850)
+            content_label.pack(anchor="e", pady=5)
+        
+        # Items list
+        if "items" in section:
+            for title, desc in section["items"]:
+                item_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
+                item_frame.pack(fill="x", pady=8, anchor="e")
+                
+                title_lbl = tk.Label(item_frame, text=title,
+                                   font=("Arial", 11, "bold"),
+                                   bg=section.get("color", "#ffffff"),
+                                   fg="#1976D2")
+                title_lbl.pack(anchor="e")
+                
+                desc_lbl = tk.Label(item_frame, text=desc,
+                                  font=("Arial", 10),
+                                  bg=section.get("color", "#ffffff"),
+                                  fg="#616161", justify="right")
+                desc_lbl.pack(anchor="e", padx=20)
+        
+        # Code examples
+        if "code_examples" in section:
+            for title, code in section["code_examples"]:
+                example_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
+                example_frame.pack(fill="x", pady=8, anchor="e")
+                
+                title_lbl = tk.Label(example_frame, text=title,
+                                   font=("Arial", 11, "bold"),
+                                   bg=section.get("color", "#ffffff"),
+                                   fg="#1976D2")
+                title_lbl.pack(anchor="e")
+                
+                code_frame = tk.Frame(example_frame, bg="#2E3440", relief=tk.SOLID, bd=1)
+                code_frame.pack(fill="x", pady=5)
+                
+                code_lbl = tk.Label(code_frame, text=code,
+                                  font=("Courier New", 10),
+                                  bg="#2E3440", fg="#A3BE8C",
+                                  justify="left", padx=10, pady=8)
+                code_lbl.pack(anchor="w")
+        
+        # Full example
+        if section.get("full_example"):
+            code_frame = tk.Frame(content_frame, bg="#2E3440", relief=tk.SOLID, bd=1)
+            code_frame.pack(fill="x", pady=10)
+            
+            code_lbl = tk.Label(code_frame, text=section["content"],
+                              font=("Courier New", 11),
+                              bg="#2E3440", fg="#A3BE8C",
+                              justify="left", padx=15, pady=12)
+            code_lbl.pack(anchor="w")
+        
+        # Tips list
+        if "tips" in section:
+            for icon, tip in section["tips"]:
+                tip_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
+                tip_frame.pack(fill="x", pady=5, anchor="e")
+                
+                tip_lbl = tk.Label(tip_frame, text=f"{icon} {tip}",
+                                 font=("Arial", 11),
+                                 bg=section.get("color", "#ffffff"),
+                                 fg="#424242")
+                tip_lbl.pack(anchor="e")
+        
+        # Steps
+        if "steps" in section:
+            for icon, title, desc in section["steps"]:
+                step_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
+                step_frame.pack(fill="x", pady=8, anchor="e")
+                
+                step_header = tk.Label(step_frame, text=f"{icon} {title}",
+                                     font=("Arial", 12, "bold"),
+                                     bg=section.get("color", "#ffffff"),
+                                     fg="#1976D2")
+                step_header.pack(anchor="e")
+                
+                step_desc = tk.Label(step_frame, text=desc,
+                                   font=("Arial", 10),
+                                   bg=section.get("color", "#ffffff"),
+                                   fg="#616161")
+                step_desc.pack(anchor="e", padx=30)
+
+    def show_beginner_guide(self):
+        """מדריך מקיף למתחיל עם UI מעוצב"""
+        win = tk.Toplevel(self)
+        win.title("📘 מדריך למתחיל - Assembly Studio")
+        win.geometry("1000x700")
+        win.configure(bg='#f5f5f5')
+        
+        # Header
+        header = tk.Frame(win, bg='#1976D2', height=80)
+        header.pack(fill="x")
+        header.pack_propagate(False)
+        
+        title_label = tk.Label(header, text="📘 מדריך למתחיל", 
+                              font=("Arial", 24, "bold"), 
+                              bg='#1976D2', fg='white')
+        title_label.pack(pady=20)
+        
+        subtitle = tk.Label(header, text="למד Assembly בצורה אינטראקטיבית וידידותית",
+                           font=("Arial", 11),
+                           bg='#1976D2', fg='#E3F2FD')
+        subtitle.pack()
+        
+        # Main content frame with canvas for scrolling
+        main_frame = tk.Frame(win, bg='#f5f5f5')
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        canvas = tk.Canvas(main_frame, bg='#f5f5f5', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg='#f5f5f5')
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Mouse wheel scrolling
+        def _on_mousewheel(event):
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        
+        # Content sections
+        sections = [
+            {
+                "title": "🎯 מהו Assembly?",
+                "color": "#E3F2FD",
+                "content": """Assembly הוא שפת תכנות ברמה נמוכה שעובדת ישירות עם המעבד.
+בסימולטור הזה, אנחנו לומדים את היסודות של תכנות ברמה נמוכה בצורה אינטראקטיבית וידידותית."""
+            },
+            {
+                "title": "🔧 רכיבי המערכת",
+                "color": "#FFF3E0",
+                "items": [
+                    ("🔢 רגיסטרים (Registers)", "R1, R2, R3 - רגיסטרים כלליים לאחסון מספרים\nL1 - רגיסטר מונה לולאות"),
+                    ("📚 מחסניות (Stacks)", "S1, S2 - מחסניות לאחסון זמני (LIFO)\nC1, C2 - מונים אוטומטיים של גודל המחסניות"),
+                    ("💾 זיכרון (Memory)", "LIST - מערך של 33 תאים (0-32)\nמאותחל עם הערכים 0,1,2...32"),
+                    ("🚩 דגלים (Flags)", "ZERO - דולק כאשר תוצאה שווה ל-0\nNEGATIVE - דולק כאשר תוצאה שלילית"),
+                ]
+            },
+            {
+                "title": "📝 תחביר בסיסי",
+                "color": "#E8F5E9",
+                "code_examples": [
+                    ("פקודה בסיסית", "MOV R1, 5    ; R1 = 5\nADD R1, R2   ; R1 = R1 + R2"),
+                    ("תוויות", "START:           ; תווית למיקום בקוד\nGOTO START       ; קפיצה לתווית"),
+                    ("הערות", "; זו הערה\n# גם זו הערה"),
+                ]
+            },
+            {
+                "title": "⚡ פקודות בסיסיות",
+                "color": "#F3E5F5",
+                "code_examples": [
+                    ("העתקה", "MOV R1, 5        ; R1 = 5\nMOV R1, R2       ; R1 = R2"),
+                    ("אריתמטיקה", "ADD R1, 5        ; R1 = R1 + 5\nSUB R1, 3        ; R1 = R1 - 3\nMUL R1, 2        ; R1 = R1 * 2"),
+                    ("קיצורים", "INC R1           ; R1 = R1 + 1\nDEC R1           ; R1 = R1 - 1\nCLEAR R1         ; R1 = 0"),
+                ]
+            },
+            {
+                "title": "🐍 למידה עם Python",
+                "color": "#E8F5E9",
+                "content": """הכרטיס הירוק "קוד Python מקביל" מציג איך כל פקודת Assembly נראית בפייתון!
+
+השתמש בכפתור "צעד" כדי לראות את התרגום לפייתון של כל שורה.
+זה עוזר להבין בדיוק מה כל פקודה עושה.""",
+                "code_examples": [
+                    ("Assembly → Python", "MOV R1, 42   →   R1 = 42\nADD R1, 8    →   R1 = R1 + 8\nPRINT R1     →   print(R1)"),
+                ]
+            },
+            {
+                "title": "💡 דוגמה ראשונה",
+                "color": "#FFF9C4",
+                "full_example": True,
+                "content": """; משימה: חשב 15 + 27 והדפס את התוצאה
+MOV R1, 15       ; שים 15 ב-R1
+ADD R1, 27       ; הוסף 27 ל-R1 (עכשיו R1 = 42)
+PRINT R1         ; הדפס את התוצאה
+HALT             ; עצור"""
+            },
+            {
+                "title": "✅ טיפים למתחילים",
+                "color": "#C8E6C9",
+                "tips": [
+                    ("✅", "התחל תמיד עם משימות פשוטות"),
+                    ("✅", "השתמש בהערות כדי להסביר מה כל שורה עושה"),
+                    ("✅", "בדוק את הרגיסטרים אחרי כל צעד בעזרת כפתור 'צעד'"),
+                    ("✅", "השתמש ב-PRINT כדי לבדוק ערכים ביניים"),
+                    ("✅", "שים לב לקוד Python המקביל בכרטיס הירוק!"),
+                ]
+            },
+            {
+                "title": "❌ טעויות נפוצות",
+                "color": "#FFCDD2",
+                "tips": [
+                    ("❌", "אל תשכח HALT בסוף התוכנית"),
+                    ("❌", "אל תחלק ב-0"),
+                    ("❌", "שים לב למקום של היעד והמקור (תמיד יעד ראשון!)"),
+                    ("❌", "אל תשכח לאתחל את L1 לפני לולאה"),
+                ]
+            },
+            {
+                "title": "🎓 התקדמות מומלצת",
+                "color": "#E1BEE7",
+                "steps": [
+                    ("1️⃣", "רמה 1: פקודות בסיסיות", "MOV, ADD, SUB, PRINT"),
+                    ("2️⃣", "רמה 2: לולאות ותנאים", "LOOP, IF, GOTO"),
+                    ("3️⃣", "רמה 3: מחסניות וזיכרון", "PUSH, POP, LIST"),
+                ]
+            },
+        ]
+        
+        # Create sections
+        for section in sections:
+            self._create_guide_section(scrollable_frame, section)
+        
+        # Footer with action buttons
+        footer = tk.Frame(win, bg='#f5f5f5', height=70)
+        footer.pack(fill="x", padx=20, pady=(0, 20))
+        footer.pack_propagate(False)
+        
+        btn_frame = tk.Frame(footer, bg='#f5f5f5')
+        btn_frame.pack(expand=True)
+        
+        # Start button
+        start_btn = tk.Button(btn_frame, text="🚀 התחל ללמוד!",
+                             command=lambda: self.load_example("תרגולים - רמה 1", "דוגמה 1: הדפס מספר"),
+                             bg='#4CAF50', fg='white',
+                             font=("Arial", 12, "bold"),
+                             padx=30, pady=12,
+                             cursor="hand2",
+                             relief=tk.RAISED, bd=2)
+        start_btn.pack(side="left", padx=10)
+        
+        # Close button
+        close_btn = tk.Button(btn_frame, text="✓ סגור",
+                             command=win.destroy,
+                             bg='#757575', fg='white',
+                             font=("Arial", 12, "bold"),
+                             padx=30, pady=12,
+                             cursor="hand2",
+                             relief=tk.RAISED, bd=2)
+        close_btn.pack(side="left", padx=10)
+        
+        # Hover effects
+        def on_enter_start(e):
+            start_btn['bg'] = '#45a049'
+        def on_leave_start(e):
+            start_btn['bg'] = '#4CAF50'
+        def on_enter_close(e):
+            close_btn['bg'] = '#616161'
+        def on_leave_close(e):
+            close_btn['bg'] = '#757575'
+        
+        start_btn.bind("<Enter>", on_enter_start)
+        start_btn.bind("<Leave>", on_leave_start)
+        close_btn.bind("<Enter>", on_enter_close)
+        close_btn.bind("<Leave>", on_leave_close)
+        
+        # Cleanup on close
+        def on_closing():
+            canvas.unbind_all("<MouseWheel>")
+            win.destroy()
+        
+        win.protocol("WM_DELETE_WINDOW", on_closing)
+
+    def show_first_lesson(self):
+        """שיעור ראשון עם דוגמאות קוד"""
+        text = """🧾 שיעור ראשון - צעדים ראשונים ב-Assembly
+
+=== שיעור 1: התוכנית הראשונה שלך ===
+
+בואו נכתוב תוכנית שמדפיסה את המספר 42:
+
+; משימה: הדפס 42
+MOV R1, 42       ; שים את המספר 42 ברגיסטר R1
+PRINT R1         ; הדפס את תוכן R1
+HALT             ; עצור את התוכנית
+
+מה קורה כאן?
+1. MOV R1, 42 - שמים את המספר 42 ברגיסטר R1
+2. PRINT R1 - מדפיסים את תוכן R1 (42)
+3. HALT - עוצרים (חובה!)
+
+=== שיעור 2: חיבור שני מספרים ===
+
+; משימה: חשב 10 + 20
+MOV R1, 10       ; R1 = 10
+ADD R1, 20       ; R1 = R1 + 20 = 30
+PRINT R1         ; הדפס 30
+HALT
+
+חשוב! ADD משנה את הרגיסטר הראשון:
+   ADD R1, 20 אומר "הוסף 20 ל-R1"
+
+=== שיעור 3: שימוש ביותר מרגיסטר אחד ===
+
+; משימה: חשב (5 + 3) * 2
+MOV R1, 5        ; R1 = 5
+ADD R1, 3        ; R1 = 8
+MOV R2, 2        ; R2 = 2
+MUL R1, R2       ; R1 = R1 * R2 = 16
+PRINT R1         ; הדפס 16
+HALT
+
+למה השתמשנו ב-R2?
+   כי רצינו לכפול ב-2, ואת ה-2 צריך לשים איפשהו!
+
+=== שיעור 4: העתקה בין רגיסטרים ===
+
+; משימה: העתק ערך מ-R1 ל-R2
+MOV R1, 100      ; R1 = 100
+MOV R2, R1       ; R2 = R1 = 100
+PRINT R2         ; הדפס 100
+HALT
+
+שים לב: MOV R2, R1 אומר "העתק מ-R1 ל-R2"
+   (תמיד: יעד, מקור)
+
+=== שיעור 5: מספר אקראי ===
+
+; משימה: הדפס מספר אקראי
+RAND R1          ; R1 = מספר אקראי בין 0 ל-32
+PRINT R1         ; הדפס אותו
+HALT
+
+כל הרצה תיתן מספר אחר!
+(אלא אם תשתמש ב-Seed זהה)
+
+=== תרגילים לתרגול ===
+
+תרגיל 1: הדפס את התוצאה של 7 * 6
+תרגיל 2: חשב 100 - 35 והדפס
+תרגיל 3: שים 50 ב-R1, 30 ב-R2, והדפס את סכומם
+תרגיל 4: חשב (8 + 2) * 5
+תרגיל 5: צור מספר אקראי, הוסף לו 10, והדפס
+
+=== טיפים חשובים ===
+
+✅ תמיד התחל עם תכנון - מה אני רוצה להשיג?
+✅ השתמש בהערות לתכנן את הצעדים
+✅ השתמש ב"צעד" כדי לראות מה קורה בכל שורה
+✅ השתמש בכרטיס "🐍 קוד Python מקביל" כדי להבין את התרגום של כל פקודה
+✅ אל תשכח HALT!
+
+💡 טיפ: הכרטיס Python עוזר להבין את הלוגיקה של כל פקודה - נסה להשוות בין Assembly ל-Python!
+
+המשך לרמה 2 כשאתה מרגיש בטוח עם הפקודות הבסיסיות!
+"""
+        self._show_help_window("🧾 שיעור ראשון", text, "900x700")
+
+    def show_faq(self):
+        """שאלות נפוצות"""
+        text = """❓ שאלות נפוצות (FAQ)
+
+=== שאלות כלליות ===
+
+ש: מה ההבדל בין Assembly אמיתי לסימולטור הזה?
+ת: זהו סימולטור חינוכי פשוט. Assembly אמיתי הרבה יותר מורכב ותלוי במעבד,
+   אבל העקרונות זהים!
+
+ש: למה התחביר הוא "יעד, מקור" ולא "מקור, יעד"?
+ת: זה התחביר של Intel x86. יש גם ARM שעושה הפוך. בחרנו ב-Intel כי הוא נפוץ יותר.
+
+ש: מה ההבדל בין R1, R2, R3?
+ת: אין! כולם רגיסטרים כלליים. בחר מה שנוח לך.
+
+=== שאלות על פקודות ===
+
+ש: מה קורה אם אני משתמש ב-ADD עם שני רגיסטרים?
+ת: ADD R1, R2 אומר "R1 = R1 + R2"
+   R2 לא משתנה, רק R1!
+
+ש: איך מחסנית עובדת?
+ת: PUSH שם ערך על המחסנית (למעלה)
+   POP מוציא את הערך העליון
+   דוגמה:
+     PUSH R1, S1    ; שים R1 על S1
+     POP R2, S1     ; קח מ-S1 ל-R2
+
+ש: מה זה C1 ו-C2?
+ת: מונים אוטומטיים - כמה ערכים יש במחסנית.
+   C1 = גודל S1
+   C2 = גודל S2
+
+ש: איך משתמשים ב-LIST?
+ת: LIST זה מערך עם 33 תאים (0-32).
+   דוגמאות:
+     MOV R1, 5              ; R1 = 5
+     MOV [LIST+R1], 100     ; LIST[5] = 100
+     MOV R2, [LIST+R1]      ; R2 = LIST[5]
+
+=== שאלות על לולאות ===
+
+ש: איך עושים לולאה?
+ת: 1. שים מספר חזרות ב-L1
+   2. שים תווית בתחילת הלולאה
+   3. בסוף הלולאה: LOOP <תווית>
+   
+   דוגמה:
+     MOV L1, 5
+     START:
+       PRINT R1
+       INC R1
+     LOOP START
+
+ש: למה הלולאה שלי אינסופית?
+ת: בדוק:
+   - האם שמת ערך ב-L1?
+   - האם LOOP מצביע על התווית הנכונה?
+   - האם יש תווית עם : בסוף?
+
+=== שאלות על תנאים ===
+
+ש: איך משתמשים ב-IF?
+ת: IF <משתנה1> <אופרטור> <משתנה2> GOTO <תווית>
+   אופרטורים: ==, !=, >, <, >=, <=
+   
+   דוגמה:
+     IF R1 > R2 GOTO BIGGER
+     PRINT R2
+     GOTO END
+     BIGGER:
+       PRINT R1
+     END:
+       HALT
+
+ש: מה ההבדל בין IF ל-CMP?
+ת: CMP משווה ומעדכן דגלים (ZERO, NEGATIVE)
+   IF קופץ ישירות - יותר נוח לרוב המקרים!
+
+=== שאלות על דיבאגינג ===
+
+ש: איך אני מוצא שגיאות?
+ת: 1. השתמש ב"צעד" כדי לעבור שורה אחרי שורה
+   2. בדוק את הרגיסטרים אחרי כל צעד
+   3. השתמש ב-PRINT להדפיס ערכים ביניים
+   4. קרא את הודעת השגיאה בכרטיסייה "שגיאות"
+
+ש: מה זה "אינדקס LIST מחוץ לטווח"?
+ת: ניסית לגשת ל-LIST[33] או יותר, או למספר שלילי.
+   LIST יש רק אינדקסים 0-32!
+
+ש: מה זה "חילוק באפס"?
+ת: ניסית לחלק ב-0 - זה אסור!
+   בדוק את המחלק לפני DIV או MOD.
+
+=== שאלות על תכונות המערכת ===
+
+ש: מה זה Seed?
+ת: מספר שקובע את הרצף האקראי.
+   אותו Seed = אותם מספרים אקראיים (שימושי לבדיקות!)
+
+ש: מה זה "Max steps"?
+ת: הגנה מפני לולאות אינסופיות.
+   אם התוכנית עוברת 200,000 צעדים - היא נעצרת.
+
+ש: למה לשמור היסטוריה?
+ת: כדי לראות מה קרה בכל צעד.
+   שימושי לדיבאגינג, אבל מאט את ההרצה.
+
+ש: מה זה "הרצה איטית"?
+ת: רואים כל צעד בזמן אמת עם עיכוב.
+   מצוין ללמידה ולהבנה של מה שקורה!
+
+ש: מה זה כרטיס "🐍 קוד Python מקביל"?
+ת: כרטיס שמציג את הקוד Python המקביל לכל פקודת Assembly.
+   עוזר להבין את הלוגיקה של הפקודות ולהשוות בין Assembly ל-Python.
+   מופיע אוטומטית כשאתה משתמש ב"צעד" או "הרצה איטית".
+
+=== עוד שאלות? ===
+
+אם משהו לא ברור, נסה:
+1. לקרוא את המדריך למתחיל
+2. להסתכל על הדוגמאות
+3. להשתמש ב"צעד" כדי לראות מה קורה
+4. לנסות דברים בעצמך - זו הדרך הטובה ביותר ללמוד!
+"""
+        self._show_help_window("❓ שאלות נפוצות", text, "900x700")
+
+    def show_quick_guide(self):
+        text = """מדריך קצר:
+
+- תחביר: יעד ואז ערך/מקור
+  MOV R1, 5     (R1 = 5)
+  ADD R1, 3     (R1 = R1 + 3)
+  ADD R1, R2    (R1 = R1 + R2)
+
+- תוויות: START: ... GOTO START
+- תנאי: IF R1 > R2 GOTO BIG
+- לולאה: MOV L1, 5
+         LOOP START
+- פלט: PRINT R1
+- הערות: ; או #
+"""
+        self._show_help_window("מדריך קצר", text, "700x500")
+
+    def _show_help_window(self, title, text, geometry="800x600"):
+        """פונקציית עזר להצגת חלון עזרה"""
+        win = tk.Toplevel(self)
+        win.title(title)
+        win.geometry(geometry)
+        win.configure(bg=self.colors['bg'])
+
+        frame = tk.Frame(win, bg=self.colors['bg'])
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        box = scrolledtext.ScrolledText(frame, font=("Courier New", 10), wrap="word",
+                                        bg=self.colors['card_bg'], fg=self.colors['text'])
+        box.pack(fill="both", expand=True)
+        box.insert("1.0", text)
+        box.config(state="disabled")
+
+        # Add close button
+        btn_frame = tk.Frame(win, bg=self.colors['bg'])
+        btn_frame.pack(fill="x", padx=10, pady=(0, 10))
+        
+        close_btn = tk.Button(btn_frame, text="✓ סגור", command=win.destroy,
+                             bg=self.colors['primary'], fg='white',
+                             font=("Arial", 10, "bold"), padx=20, pady=5,
+                             cursor="hand2")
+        close_btn.pack(side="right")
+
+
+if __name__ == "__main__":
+    App().mainloop()
@@ -1,10 +1,26 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import argparse
+import hashlib
+import json
+import operator
+import os
 import random
 import re
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
-from typing import Optional, List, Tuple, Dict, Any
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import MutableMapping
+from typing import Optional, List, Tuple, Dict, Any, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # אופציונלי: בלי NumPy run_program_seeds רץ seed אחרי seed
+    np = None
 
 # ============================================================
 # VM + PARSER
@@ -14,6 +30,18 @@ from typing import Optional, List, Tuple, Dict, Any
 # ============================================================
 
 TOKEN_SPLIT = re.compile(r"[,\s]+")
+INT_TOKEN = re.compile(r"-?\d+")
+LIST_EXPR = re.compile(r"\[LIST\s*\+\s*([A-Za-z0-9\-]+)\s*\]")
+
+REG_NAMES = ("R1", "R2", "R3")
+REG_SLOTS = {name: i for i, name in enumerate(REG_NAMES)}
+STACK_NAMES = ("S1", "S2")
+STACK_SLOTS = {name: i for i, name in enumerate(STACK_NAMES)}
+COUNTER_SLOTS = {"C1": 0, "C2": 1}
+LIST_SIZE = 33
+
+# סוגי אופרנדים מפוענחים: (kind, payload, טקסט מקור)
+V_IMM, V_REG, V_L1, V_CNT, V_LIST = range(5)
 
 class AsmError(Exception):
     """שגיאה בזמן פרסור/הרצה עם שורת מקור"""
@@ -22,6 +50,257 @@ class AsmError(Exception):
         self.line_no = line_no
         self.raw_line = raw_line
 
+class _SlotView(MutableMapping):
+    """
+    תצוגת dict מעל סלוטים קבועים של Machine, לתאימות עם machine.regs[...] /
+    machine.flags[...] / machine.stacks[...]. אין הוספה/מחיקה של מפתחות.
+    """
+    __slots__ = ("_m",)
+    _keys: Tuple[str, ...] = ()
+
+    def __init__(self, machine: "Machine"):
+        self._m = machine
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __delitem__(self, key):
+        raise TypeError(f"cannot delete {key!r}")
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class _RegsView(_SlotView):
+    __slots__ = ()
+    _keys = REG_NAMES
+
+    def __getitem__(self, key):
+        return self._m.r[REG_SLOTS[key]]
+
+    def __setitem__(self, key, value):
+        self._m.r[REG_SLOTS[key]] = value
+
+class _StacksView(_SlotView):
+    __slots__ = ()
+    _keys = STACK_NAMES
+
+    def __getitem__(self, key):
+        return self._m.s[STACK_SLOTS[key]]
+
+    def __setitem__(self, key, value):
+        self._m.s[STACK_SLOTS[key]] = value
+
+class _FlagsView(_SlotView):
+    __slots__ = ()
+    _keys = ("ZERO", "NEGATIVE")
+
+    def __getitem__(self, key):
+        if key == "ZERO":
+            return self._m.zero
+        if key == "NEGATIVE":
+            return self._m.negative
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "ZERO":
+            self._m.zero = value
+        elif key == "NEGATIVE":
+            self._m.negative = value
+        else:
+            raise KeyError(key)
+
+class ExecutionHistory:
+    """
+    היסטוריית ריצה בעמודות במקום dict לכל צעד:
+    - R1, R2, R3, L1 ב-array('q'); ערך שחורג מ-64 ביט מעביר את העמודות ל-list
+    - ZERO/NEGATIVE ב-array('b'), step כאינדקס לטבלת מחרוזות
+    - S1/S2 כרשימות מקושרות משותפות (depth, value, parent): push/pop בין שורות
+      עולים O(1) במקום עותק של המחסנית כולה
+    capacity - ring buffer שמחזיק רק את capacity השורות האחרונות (None = ללא הגבלה);
+    spill_path - שורות שנדחקות מה-ring נכתבות לקובץ JSONL לפני שהן נדרסות.
+    h[i], h[a:b] ואיטרציה מחזירים dict בפורמט של save_state; column(name) לייצוא.
+    """
+    COLUMNS = ("step", "R1", "R2", "R3", "L1", "C1", "C2", "S1", "S2", "ZERO", "NEGATIVE")
+
+    def __init__(self, capacity: Optional[int] = None, spill_path: Optional[str] = None):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0      # שורות שנוספו אי פעם, כולל כאלה שנדחקו מה-ring
+        self._len = 0       # שורות שמוחזקות בזיכרון
+        size = capacity or 0
+        self._ints: List[Any] = [array("q", bytes(8 * size)) for _ in range(4)]
+        self._zero = array("b", bytes(size))
+        self._negative = array("b", bytes(size))
+        self._step = array("i", bytes(4 * size))
+        self._s1: List[Any] = [None] * size
+        self._s2: List[Any] = [None] * size
+        self._step_ids: Dict[str, int] = {}
+        self._step_names: List[str] = []
+        self._nodes: List[Any] = [None, None]   # הצומת האחרון של כל מחסנית
+        self._src: List[Any] = [None, None]     # רשימת המחסנית שהצומת מתאר
+        self._spill = open(spill_path, "a", encoding="utf-8") if spill_path else None
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _widen(self):
+        # object fallback: מכאן והלאה העמודות המספריות הן list של int של Python
+        self._ints = [list(col) for col in self._ints]
+
+    def append(self, step_info: str, m: "Machine"):
+        sid = self._step_ids.get(step_info)
+        if sid is None:
+            sid = self._step_ids[step_info] = len(self._step_names)
+            self._step_names.append(step_info)
+        last1 = self._stack_node(0, m.s[0])
+        last2 = self._stack_node(1, m.s[1])
+        r = m.r
+        values = (r[0], r[1], r[2], m.L1)
+        cap = self.capacity
+        if cap is None:
+            pos = self.total
+            try:
+                for col, v in zip(self._ints, values):
+                    col.append(v)
+            except OverflowError:
+                for col in self._ints:
+                    del col[pos:]
+                self._widen()
+                for col, v in zip(self._ints, values):
+                    col.append(v)
+            self._zero.append(m.zero)
+            self._negative.append(m.negative)
+            self._step.append(sid)
+            self._s1.append(last1)
+            self._s2.append(last2)
+            self._len += 1
+        else:
+            pos = self.total % cap
+            if self._len == cap:
+                if self._spill is not None:
+                    self._spill.write(json.dumps(self._row(pos), ensure_ascii=False) + "\n")
+            else:
+                self._len += 1
+            try:
+                for col, v in zip(self._ints, values):
+                    col[pos] = v
+            except OverflowError:
+                self._widen()
+                for col, v in zip(self._ints, values):
+                    col[pos] = v
+            self._zero[pos] = m.zero
+            self._negative[pos] = m.negative
+            self._step[pos] = sid
+            self._s1[pos] = last1
+            self._s2[pos] = last2
+        self.total += 1
+
+    def _stack_node(self, k: int, stack: List[int]):
+        # בין שתי שורות רצופות הוראה אחת לכל היותר דוחפת או שולפת איבר אחד
+        node = self._nodes[k]
+        depth = node[0] if node is not None else 0
+        n = len(stack)
+        if stack is self._src[k] and abs(n - depth) <= 1:
+            if n == depth + 1:
+                node = (n, stack[-1], node)
+            elif n == depth - 1:
+                node = node[2]
+        else:
+            node = None
+            for i, v in enumerate(stack, start=1):
+                node = (i, v, node)
+            self._src[k] = stack
+        self._nodes[k] = node
+        return node
+
+    def truncate(self, total: int):
+        """מחיקת השורות מהשורה המוחלטת total והלאה (לחזרה אחורה ב-Executor)"""
+        self._src = [None, None]  # המחסניות חזרו אחורה - השורה הבאה בונה צמתים מחדש
+        if total >= self.total:
+            return
+        self._len = max(0, self._len - (self.total - total))
+        self.total = total
+        if self.capacity is None:
+            for col in (*self._ints, self._zero, self._negative, self._step, self._s1, self._s2):
+                del col[total:]
+
+    def _pos(self, i: int) -> int:
+        start = self.total - self._len
+        return start + i if self.capacity is None else (start + i) % self.capacity
+
+    @staticmethod
+    def _stack_list(node) -> List[int]:
+        values = []
+        while node is not None:
+            values.append(node[1])
+            node = node[2]
+        values.reverse()
+        return values
+
+    @staticmethod
+    def _depth(node) -> int:
+        return node[0] if node is not None else 0
+
+    def _row(self, pos: int) -> Dict[str, Any]:
+        s1, s2 = self._s1[pos], self._s2[pos]
+        ints = self._ints
+        return {
+            "step": self._step_names[self._step[pos]],
+            "R1": ints[0][pos],
+            "R2": ints[1][pos],
+            "R3": ints[2][pos],
+            "L1": ints[3][pos],
+            "C1": self._depth(s1),
+            "C2": self._depth(s2),
+            "S1": self._stack_list(s1),
+            "S2": self._stack_list(s2),
+            "ZERO": bool(self._zero[pos]),
+            "NEGATIVE": bool(self._negative[pos]),
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(self._pos(i)) for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("history index out of range")
+        return self._row(self._pos(index))
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield self._row(self._pos(i))
+
+    def column(self, name: str) -> List[Any]:
+        """עמודה אחת לכל השורות שבזיכרון, בסדר כרונולוגי"""
+        if name not in self.COLUMNS:
+            raise KeyError(name)
+        positions = [self._pos(i) for i in range(self._len)]
+        if name in ("R1", "R2", "R3", "L1"):
+            col = self._ints[("R1", "R2", "R3", "L1").index(name)]
+            return [col[p] for p in positions]
+        if name == "step":
+            return [self._step_names[self._step[p]] for p in positions]
+        if name in ("ZERO", "NEGATIVE"):
+            col = self._zero if name == "ZERO" else self._negative
+            return [bool(col[p]) for p in positions]
+        stacks = self._s1 if name in ("S1", "C1") else self._s2
+        if name in ("C1", "C2"):
+            return [self._depth(stacks[p]) for p in positions]
+        return [self._stack_list(stacks[p]) for p in positions]
+
 class Machine:
     """
     מכונה וירטואלית:
@@ -32,26 +311,84 @@ class Machine:
     - זיכרון: LIST (33 תאים, אינדקס 0..32) מאותחל 0..32
     - דגלים: ZERO, NEGATIVE
     - פלט: output (רשימת ערכים שהודפסו)
+    - מחולל אקראי: rng (random.Random פרטי, כדי שריצות במקביל לא ישבשו זו את זו)
+
+    המצב נשמר בסלוטים קבועים: r = [R1, R2, R3], s = [S1, S2], zero/negative.
+    regs/flags/stacks הם תצוגות dict לתאימות (GUI וקוד קיים).
+    execution_history נוצרת רק בגישה הראשונה (save_state), כך שמכונה בלי היסטוריה לא מקצה אותה.
     """
-    def __init__(self):
-        self.regs = {"R1": 0, "R2": 0, "R3": 0}
-        self.stacks = {"S1": [], "S2": []}
+    __slots__ = ("r", "s", "L1", "LIST", "output", "zero", "negative", "rng", "_history")
+
+    def __init__(self, seed: Optional[int] = None):
+        self.r = [0, 0, 0]
+        self.s: List[List[int]] = [[], []]
         self.L1 = 0
-        self.LIST = list(range(33))
+        self.LIST = list(range(LIST_SIZE))
         self.output: List[int] = []
-        self.flags = {"ZERO": False, "NEGATIVE": False}
-        self.execution_history: List[Dict[str, Any]] = []
+        self.zero = False
+        self.negative = False
+        self.rng = random.Random(seed)
+        self._history: Optional[ExecutionHistory] = None
+
+    @property
+    def execution_history(self) -> ExecutionHistory:
+        if self._history is None:
+            self._history = ExecutionHistory()
+        return self._history
+
+    @execution_history.setter
+    def execution_history(self, history: ExecutionHistory):
+        self._history = history
+
+    @property
+    def regs(self) -> _RegsView:
+        return _RegsView(self)
+
+    @regs.setter
+    def regs(self, values: Dict[str, int]):
+        for name, value in values.items():
+            self.r[REG_SLOTS[name]] = value
+
+    @property
+    def stacks(self) -> _StacksView:
+        return _StacksView(self)
+
+    @stacks.setter
+    def stacks(self, values: Dict[str, List[int]]):
+        for name, stack in values.items():
+            self.s[STACK_SLOTS[name]] = stack
+
+    @property
+    def flags(self) -> _FlagsView:
+        return _FlagsView(self)
+
+    @flags.setter
+    def flags(self, values: Dict[str, bool]):
+        fv = _FlagsView(self)
+        for name, value in values.items():
+            fv[name] = value
+
+    def copy(self) -> "Machine":
+        """עותק עמוק של המצב כולל מצב ה-rng (ללא execution_history)"""
+        new_m = Machine()
+        new_m.r = self.r.copy()
+        new_m.s = [self.s[0].copy(), self.s[1].copy()]
+        new_m.L1 = self.L1
+        new_m.LIST = self.LIST.copy()
+        new_m.output = self.output.copy()
+        new_m.zero = self.zero
+        new_m.negative = self.negative
+        new_m.rng.setstate(self.rng.getstate())
+        return new_m
 
     def get_counter(self, name: str) -> int:
-        if name == "C1":
-            return len(self.stacks["S1"])
-        if name == "C2":
-            return len(self.stacks["S2"])
+        if name in COUNTER_SLOTS:
+            return len(self.s[COUNTER_SLOTS[name]])
         raise AsmError(f"מונה לא ידוע: {name}")
 
     def update_flags(self, value: int):
-        self.flags["ZERO"] = (value == 0)
-        self.flags["NEGATIVE"] = (value < 0)
+        self.zero = (value == 0)
+        self.negative = (value < 0)
 
     def get_value(self, token: str) -> int:
         token = token.strip()
@@ -61,7 +398,7 @@ class Machine:
             return int(self.get_counter(token))
         if token == "L1":
             return int(self.L1)
-        if re.fullmatch(r"-?\d+", token):
+        if INT_TOKEN.fullmatch(token):
             return int(token)
         raise AsmError(f"ערך לא חוקי: {token}")
 
@@ -70,7 +407,7 @@ class Machine:
         תומך ב: [LIST+R1], [LIST+R2], [LIST+R3], [LIST+L1], [LIST+5]
         """
         expr = expr.strip()
-        m = re.fullmatch(r"\[LIST\s*\+\s*([A-Za-z0-9\-]+)\s*\]", expr)
+        m = LIST_EXPR.fullmatch(expr)
         if not m:
             raise AsmError(f"ביטוי LIST שגוי: {expr}")
         inside = m.group(1)
@@ -80,7 +417,7 @@ class Machine:
         if inside == "L1":
             idx = int(self.L1)
             return inside, idx
-        if re.fullmatch(r"-?\d+", inside):
+        if INT_TOKEN.fullmatch(inside):
             idx = int(inside)
             return inside, idx
         raise AsmError(f"אינדקס LIST לא חוקי: {inside}")
@@ -112,26 +449,15 @@ class Machine:
         raise AsmError(f"יעד לא ידוע: {target}")
 
     def save_state(self, step_info: str):
-        self.execution_history.append({
-            "step": step_info,
-            "R1": self.regs["R1"],
-            "R2": self.regs["R2"],
-            "R3": self.regs["R3"],
-            "L1": self.L1,
-            "C1": len(self.stacks["S1"]),
-            "C2": len(self.stacks["S2"]),
-            "S1": self.stacks["S1"].copy(),
-            "S2": self.stacks["S2"].copy(),
-            "ZERO": self.flags["ZERO"],
-            "NEGATIVE": self.flags["NEGATIVE"],
-        })
-
-def parse_program(text: str) -> Tuple[List[Tuple[str, List[str], str, int]], Dict[str, int]]:
+        self.execution_history.append(step_info, self)
+
+def parse_program(text: str, errors: Optional[List[AsmError]] = None) -> Tuple[List[Tuple[str, List[str], str, int]], Dict[str, int]]:
     """
     תומך:
     - הערות: ; או #
     - תוויות: LABEL:
     - מפריד פסיקים/רווחים
+    errors - אם ניתנה רשימה, שגיאות תוויות נאספות אליה והפרסור ממשיך
     """
     instructions: List[Tuple[str, List[str], str, int]] = []
     labels: Dict[str, int] = {}
@@ -143,11 +469,17 @@ def parse_program(text: str) -> Tuple[List[Tuple[str, List[str], str, int]], Dic
         # label
         if line.endswith(":"):
             label = line[:-1].strip()
-            if not label:
-                raise AsmError("תווית ריקה", line_no=line_no, raw_line=raw)
             key = label.upper()
-            if key in labels:
-                raise AsmError(f"תווית כפולה '{label}'", line_no=line_no, raw_line=raw)
+            error = None
+            if not label:
+                error = AsmError("תווית ריקה", line_no=line_no, raw_line=raw)
+            elif key in labels:
+                error = AsmError(f"תווית כפולה '{label}'", line_no=line_no, raw_line=raw)
+            if error is not None:
+                if errors is None:
+                    raise error
+                errors.append(error)
+                continue
             labels[key] = len(instructions)
             continue
         parts = [p for p in TOKEN_SPLIT.split(line) if p]
@@ -175,269 +507,1930 @@ def eval_condition(m: Machine, left: str, op: str, right: str) -> bool:
         return lv <= rv
     raise AsmError(f"אופרטור לא נתמך: {op}")
 
-def run_program(program_text: str, seed: Optional[int] = None, max_steps: int = 200000, save_history: bool = False) -> Machine:
+# ============================================================
+# DECODE: פענוח חד-פעמי של התוכנית למערך הוראות קומפקטי
+# ============================================================
+
+(OP_HALT, OP_NOP, OP_MOV, OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_MOD, OP_INC, OP_DEC,
+ OP_CLEAR, OP_SWAP, OP_PUSH, OP_POP, OP_RAND, OP_PRINT, OP_CMP, OP_JZ, OP_JNZ,
+ OP_GOTO, OP_IF, OP_LOOP, OP_ERROR, OP_IF_ERROR) = range(24)
+
+COND_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+# op -> (opcode, הודעת מספר ארגומנטים, הודעת יעד לא רגיסטר)
+_ARITH_OPS = {
+    "ADD": (OP_ADD, "ADD דורש 2 ארגומנטים: ADD יעד, מקור", "ADD: היעד חייב להיות רגיסטר (R1/R2/R3)"),
+    "SUB": (OP_SUB, "SUB דורש 2 ארגומנטים: SUB יעד, מקור", "SUB: היעד חייב להיות רגיסטר (R1/R2/R3)"),
+    "MUL": (OP_MUL, "MUL דורש 2 ארגומנטים: MUL יעד, מקור", "MUL: היעד חייב להיות רגיסטר"),
+    "DIV": (OP_DIV, "DIV דורש 2 ארגומנטים: DIV יעד, מקור", "DIV: היעד חייב להיות רגיסטר"),
+    "MOD": (OP_MOD, "MOD דורש 2 ארגומנטים: MOD יעד, מקור", "MOD: היעד חייב להיות רגיסטר"),
+}
+_UNARY_OPS = {
+    "INC": (OP_INC, "INC דורש ארגומנט אחד: INC R", "INC: חייב להיות רגיסטר"),
+    "DEC": (OP_DEC, "DEC דורש ארגומנט אחד: DEC R", "DEC: חייב להיות רגיסטר"),
+    "CLEAR": (OP_CLEAR, "CLEAR דורש ארגומנט אחד: CLEAR R", "CLEAR: חייב להיות רגיסטר"),
+    "RAND": (OP_RAND, "RAND דורש ארגומנט אחד: RAND R", "RAND: חייב להיות רגיסטר"),
+}
+_STACK_OPS = {"PUSH": OP_PUSH, "POP": OP_POP}
+_JUMP_OPS = {"JZ": OP_JZ, "JNZ": OP_JNZ, "GOTO": OP_GOTO, "LOOP": OP_LOOP}
+
+class Instr(NamedTuple):
     """
-    הרצת תוכנית עד הסוף.
-    משתמש ב-run_program_steps() לשמירת התנהגות זהה.
+    הוראה מפוענחת. code הוא opcode שלם, a/b הם האופרנדים המפוענחים
+    (סלוט רגיסטר, אופרנד ערך, יעד קפיצה...). op/args/raw/line_no נשמרים
+    לצורך הודעות שגיאה, stepping והיסטוריה.
     """
-    m = None
-    for m, ip, line_no, raw, op, args in run_program_steps(program_text, seed, max_steps, save_history):
-        pass
-    return m
+    code: int
+    a: Any
+    b: Any
+    line_no: int
+    raw: str
+    op: str
+    args: List[str]
+    info: str
+
+def _decode_value(token: str) -> Tuple[int, Any, str]:
+    token = token.strip()
+    if token in REG_SLOTS:
+        return (V_REG, REG_SLOTS[token], token)
+    if token in COUNTER_SLOTS:
+        return (V_CNT, COUNTER_SLOTS[token], token)
+    if token == "L1":
+        return (V_L1, None, token)
+    if INT_TOKEN.fullmatch(token):
+        return (V_IMM, int(token), token)
+    raise AsmError(f"ערך לא חוקי: {token}")
+
+def _decode_list(expr: str) -> Tuple[int, Any, str]:
+    expr = expr.strip()
+    m = LIST_EXPR.fullmatch(expr)
+    if not m:
+        raise AsmError(f"ביטוי LIST שגוי: {expr}")
+    inside = m.group(1)
+    if inside in REG_SLOTS:
+        return (V_LIST, (V_REG, REG_SLOTS[inside], inside), inside)
+    if inside == "L1":
+        return (V_LIST, (V_L1, None, inside), inside)
+    if INT_TOKEN.fullmatch(inside):
+        return (V_LIST, (V_IMM, int(inside), inside), inside)
+    raise AsmError(f"אינדקס LIST לא חוקי: {inside}")
+
+def _decode_target(target: str) -> Tuple[int, Any, str]:
+    target = target.strip()
+    if target in REG_SLOTS:
+        return (V_REG, REG_SLOTS[target], target)
+    if target == "L1":
+        return (V_L1, None, target)
+    if target.startswith("[LIST"):
+        return _decode_list(target)
+    raise AsmError(f"יעד לא ידוע: {target}")
+
+def _decode_label(name: str, labels: Dict[str, int]) -> int:
+    lbl = name.upper()
+    if lbl not in labels:
+        raise AsmError(f"תווית לא ידועה '{name}'")
+    return labels[lbl]
+
+def _decode_instruction(op: str, args: List[str], labels: Dict[str, int]) -> Tuple[int, Any, Any]:
+    """מחזיר (code, a, b); שגיאה סטטית נזרקת כ-AsmError"""
+    if op == "HALT":
+        return OP_HALT, None, None
+    if op == "NOP":
+        return OP_NOP, None, None
+    if op == "MOV":
+        if len(args) != 2:
+            raise AsmError("MOV דורש 2 ארגומנטים: MOV יעד, מקור")
+        dst, src = args[0], args[1]
+        if src.strip().startswith("[LIST"):
+            val = _decode_list(src)
+        else:
+            val = _decode_value(src)
+        try:
+            return OP_MOV, _decode_target(dst), val
+        except AsmError as e:
+            # קריאת LIST מהמקור קודמת לשגיאת היעד (עלולה להיכשל על טווח בזמן ריצה)
+            return OP_ERROR, str(e), val if val[0] == V_LIST else None
+    if op in _ARITH_OPS:
+        code, count_msg, dst_msg = _ARITH_OPS[op]
+        if len(args) != 2:
+            raise AsmError(count_msg)
+        if args[0] not in REG_SLOTS:
+            raise AsmError(dst_msg)
+        return code, REG_SLOTS[args[0]], _decode_value(args[1])
+    if op in _UNARY_OPS:
+        code, count_msg, reg_msg = _UNARY_OPS[op]
+        if len(args) != 1:
+            raise AsmError(count_msg)
+        if args[0] not in REG_SLOTS:
+            raise AsmError(reg_msg)
+        return code, REG_SLOTS[args[0]], None
+    if op == "SWAP":
+        if len(args) != 2:
+            raise AsmError("SWAP דורש 2 ארגומנטים: SWAP R1, R2")
+        a, b = args[0], args[1]
+        if a not in REG_SLOTS or b not in REG_SLOTS:
+            raise AsmError("SWAP: שני הארגומנטים חייבים להיות רגיסטרים")
+        return OP_SWAP, REG_SLOTS[a], REG_SLOTS[b]
+    if op in _STACK_OPS:
+        if len(args) != 2:
+            raise AsmError(f"{op} דורש 2 ארגומנטים: {op} R, S1|S2")
+        r, s = args[0], args[1].upper()
+        if r not in REG_SLOTS:
+            raise AsmError(f"{op}: ארגומנט ראשון חייב להיות רגיסטר")
+        if s not in STACK_SLOTS:
+            raise AsmError(f"{op}: מחסנית חייבת להיות S1 או S2")
+        return _STACK_OPS[op], REG_SLOTS[r], STACK_SLOTS[s]
+    if op == "PRINT":
+        if len(args) != 1:
+            raise AsmError("PRINT דורש ארגומנט אחד: PRINT X")
+        return OP_PRINT, _decode_value(args[0]), None
+    if op == "CMP":
+        if len(args) != 2:
+            raise AsmError("CMP דורש 2 ארגומנטים: CMP A, B")
+        return OP_CMP, _decode_value(args[0]), _decode_value(args[1])
+    if op in _JUMP_OPS:
+        if len(args) != 1:
+            raise AsmError(f"{op} דורש ארגומנט אחד: {op} LABEL")
+        return _JUMP_OPS[op], _decode_label(args[0], labels), None
+    if op == "IF":
+        if len(args) != 5 or args[3].upper() != "GOTO":
+            raise AsmError("תחביר IF שגוי: IF A == B GOTO LABEL")
+        left, cond_op, right, _, label = args
+        target = _decode_label(label, labels)
+        try:
+            lv = _decode_value(left)
+            rv = _decode_value(right)
+            if cond_op not in COND_OPS:
+                raise AsmError(f"אופרטור לא נתמך: {cond_op}")
+        except AsmError as e:
+            # בדומה ל-eval_condition: התנאי נבדק רק אחרי שהצעד דווח
+            return OP_IF_ERROR, str(e), target
+        return OP_IF, (lv, COND_OPS[cond_op], rv), target
+    raise AsmError(f"הוראה לא ידועה '{op}'")
 
-def run_program_steps(program_text: str, seed: Optional[int] = None, max_steps: int = 200000, save_history: bool = False):
+def decode_program(instructions: List[Tuple[str, List[str], str, int]], labels: Dict[str, int]) -> List[Instr]:
     """
-    Generator שמחזיר (machine, ip, line_no, raw_line, op, args) אחרי כל הוראה.
+    ממיר את הפלט של parse_program למערך Instr: opcodes שלמים, מספרים מפורסרים,
+    סלוטים של רגיסטרים ויעדי קפיצה פתורים. כל הבדיקות הסטטיות נעשות כאן פעם אחת;
+    הוראה שגויה מפוענחת ל-OP_ERROR ונזרקת רק כשמגיעים אליה, כמו קודם.
+    """
+    code: List[Instr] = []
+    for op, args, raw, line_no in instructions:
+        try:
+            kind, a, b = _decode_instruction(op, args, labels)
+        except AsmError as e:
+            kind, a, b = OP_ERROR, str(e), None
+        code.append(Instr(kind, a, b, line_no, raw, op, args, f"{line_no}: {op} {' '.join(args)}"))
+    return code
+
+class AsmVerifyError(AsmError):
+    """כל השגיאות הסטטיות של תוכנית יחד; errors ממוינות לפי שורה"""
+    def __init__(self, errors: List[AsmError]):
+        first = errors[0]
+        super().__init__(f"נמצאו {len(errors)} שגיאות בתוכנית", line_no=first.line_no, raw_line=first.raw_line)
+        self.errors = errors
+
+def _list_operands(ins: Instr) -> List[Tuple[int, Any, str]]:
+    # LIST מופיע רק ב-MOV (יעד/מקור) ובקריאה שקודמת לשגיאת יעד של MOV
+    operands = (ins.a, ins.b) if ins.code == OP_MOV else (ins.b,) if ins.code == OP_ERROR else ()
+    return [x for x in operands if isinstance(x, tuple) and x[0] == V_LIST]
+
+def verify_program(program_text: str) -> List[AsmError]:
+    """
+    בדיקה סטטית של כל התוכנית בלי להריץ: תוויות, מספר ארגומנטים, יעדים,
+    מחסניות, תוויות לא קיימות, ביטויי LIST ו-IF, ואינדקס LIST קבוע מחוץ לטווח.
+    מחזיר את כל השגיאות (רשימה ריקה = תוכנית תקינה).
+    """
+    errors: List[AsmError] = []
+    instructions, labels = parse_program(program_text, errors)
+    for ins in decode_program(instructions, labels):
+        if ins.code in (OP_ERROR, OP_IF_ERROR):
+            errors.append(AsmError(ins.a, line_no=ins.line_no, raw_line=ins.raw))
+            continue
+        for operand in _list_operands(ins):
+            index = operand[1]
+            if index[0] == V_IMM and not 0 <= index[1] < LIST_SIZE:
+                errors.append(_list_range_error(index[1], operand[2], ins.line_no, ins.raw))
+    errors.sort(key=lambda e: e.line_no or 0)
+    return errors
+
+def check_program(program_text: str) -> "Program":
+    """Program מוכן להרצה, או AsmVerifyError עם כל השגיאות הסטטיות"""
+    errors = verify_program(program_text)
+    if errors:
+        raise AsmVerifyError(errors)
+    return load_program(program_text)
+
+# ============================================================
+# FAST ENGINE: הידור כל הוראה ל-closure ייעודי
+# ============================================================
+
+MAX_STEPS_MSG = "חריגה ממקסימום צעדים (כנראה לולאה אינסופית)."
+
+def _compile_value(operand: Tuple[int, Any, str], line_no: int, raw: str):
+    """מחזיר פונקציה m -> int עבור אופרנד מפוענח"""
+    kind, x, text = operand
+    if kind == V_IMM:
+        return lambda m: x
+    if kind == V_REG:
+        return lambda m: m.r[x]
+    if kind == V_L1:
+        return lambda m: m.L1
+    if kind == V_CNT:
+        return lambda m: len(m.s[x])
+    if _static_list_index(operand) is not None:
+        i = x[1]
+        return lambda m: m.LIST[i]
+    index = _compile_list_index(operand, line_no, raw)
+    return lambda m: m.LIST[index(m)]
+
+def _static_list_index(operand: Tuple[int, Any, str]) -> Optional[int]:
+    """אינדקס LIST קבוע שנבדק כבר בטעינה (אין צורך בבדיקת טווח בריצה), או None"""
+    kind, x, _ = operand
+    if kind == V_LIST and x[0] == V_IMM and 0 <= x[1] < LIST_SIZE:
+        return x[1]
+    return None
+
+def _compile_list_index(operand: Tuple[int, Any, str], line_no: int, raw: str):
+    i = _static_list_index(operand)
+    if i is not None:
+        return lambda m: i
+    get = _compile_value(operand[1], line_no, raw)
+    src = operand[2]
+
+    def index(m):
+        idx = get(m)
+        if 0 <= idx < len(m.LIST):
+            return idx
+        raise AsmError(f"אינדקס LIST מחוץ לטווח: {idx} (מ-{src})", line_no=line_no, raw_line=raw)
+    return index
+
+def _compile_instr(ins: Instr, ip: int):
+    """closure יחיד להוראה: מקבל Machine ומחזיר את ה-ip הבא (-1 = עצירה)"""
+    kind, a, b, line_no, raw = ins.code, ins.a, ins.b, ins.line_no, ins.raw
+    nxt = ip + 1
+
+    if kind == OP_NOP:
+        return lambda m: nxt
+    if kind == OP_HALT:
+        return lambda m: -1
+
+    if kind == OP_MOV:
+        get = _compile_value(b, line_no, raw)
+        if a[0] == V_REG:
+            r = a[1]
+            if b[0] == V_IMM:
+                v = b[1]
+                zero, neg = v == 0, v < 0
+
+                def mov_imm(m):
+                    m.r[r] = v
+                    m.zero = zero
+                    m.negative = neg
+                    return nxt
+                return mov_imm
+
+            def mov_reg(m):
+                v = get(m)
+                m.r[r] = v
+                m.zero = v == 0
+                m.negative = v < 0
+                return nxt
+            return mov_reg
+        if a[0] == V_L1:
+            def mov_l1(m):
+                m.L1 = get(m)
+                return nxt
+            return mov_l1
+        index = _compile_list_index(a, line_no, raw)
+
+        def mov_list(m):
+            v = get(m)
+            m.LIST[index(m)] = v
+            return nxt
+        return mov_list
+
+    if kind in (OP_ADD, OP_SUB) and b[0] in (V_IMM, V_REG):
+        r = a
+        if b[0] == V_IMM:
+            k = b[1] if kind == OP_ADD else -b[1]
+
+            def add_imm(m):
+                regs = m.r
+                v = regs[r] + k
+                regs[r] = v
+                m.zero = v == 0
+                m.negative = v < 0
+                return nxt
+            return add_imm
+        src = b[1]
+        if kind == OP_ADD:
+            def add_reg(m):
+                regs = m.r
+                v = regs[r] + regs[src]
+                regs[r] = v
+                m.zero = v == 0
+                m.negative = v < 0
+                return nxt
+            return add_reg
+
+        def sub_reg(m):
+            regs = m.r
+            v = regs[r] - regs[src]
+            regs[r] = v
+            m.zero = v == 0
+            m.negative = v < 0
+            return nxt
+        return sub_reg
+
+    if kind in (OP_ADD, OP_SUB, OP_MUL):
+        r = a
+        get = _compile_value(b, line_no, raw)
+        fn = {OP_ADD: operator.add, OP_SUB: operator.sub, OP_MUL: operator.mul}[kind]
+
+        def arith(m):
+            regs = m.r
+            v = fn(regs[r], get(m))
+            regs[r] = v
+            m.zero = v == 0
+            m.negative = v < 0
+            return nxt
+        return arith
+
+    if kind in (OP_DIV, OP_MOD):
+        r = a
+        get = _compile_value(b, line_no, raw)
+        fn = operator.floordiv if kind == OP_DIV else operator.mod
+        msg = "חילוק באפס!" if kind == OP_DIV else "מודולו באפס!"
+
+        def div_mod(m):
+            d = get(m)
+            if d == 0:
+                raise AsmError(msg, line_no=line_no, raw_line=raw)
+            regs = m.r
+            v = fn(regs[r], d)
+            regs[r] = v
+            m.zero = v == 0
+            m.negative = v < 0
+            return nxt
+        return div_mod
+
+    if kind in (OP_INC, OP_DEC):
+        r = a
+        k = 1 if kind == OP_INC else -1
+
+        def inc(m):
+            regs = m.r
+            v = regs[r] + k
+            regs[r] = v
+            m.zero = v == 0
+            m.negative = v < 0
+            return nxt
+        return inc
+
+    if kind == OP_CLEAR:
+        r = a
+
+        def clear(m):
+            m.r[r] = 0
+            m.zero = True
+            m.negative = False
+            return nxt
+        return clear
+
+    if kind == OP_SWAP:
+        ra, rb = a, b
+
+        def swap(m):
+            regs = m.r
+            regs[ra], regs[rb] = regs[rb], regs[ra]
+            return nxt
+        return swap
+
+    if kind == OP_PUSH:
+        r, s = a, b
+
+        def push(m):
+            m.s[s].append(m.r[r])
+            return nxt
+        return push
+
+    if kind == OP_POP:
+        r, s = a, b
+        msg = f"POP ממחסנית ריקה {STACK_NAMES[b]}"
+
+        def pop(m):
+            stack = m.s[s]
+            if not stack:
+                raise AsmError(msg, line_no=line_no, raw_line=raw)
+            m.r[r] = stack.pop()
+            return nxt
+        return pop
+
+    if kind == OP_RAND:
+        r = a
+
+        def rand(m):
+            v = m.rng.randint(0, 32)
+            m.r[r] = v
+            m.zero = v == 0
+            m.negative = False
+            return nxt
+        return rand
+
+    if kind == OP_PRINT:
+        get = _compile_value(a, line_no, raw)
+
+        def print_(m):
+            m.output.append(get(m))
+            return nxt
+        return print_
+
+    if kind == OP_CMP:
+        left = _compile_value(a, line_no, raw)
+        right = _compile_value(b, line_no, raw)
+
+        def cmp(m):
+            d = left(m) - right(m)
+            m.zero = d == 0
+            m.negative = d < 0
+            return nxt
+        return cmp
+
+    if kind == OP_JZ:
+        return lambda m: a if m.zero else nxt
+    if kind == OP_JNZ:
+        return lambda m: nxt if m.zero else a
+    if kind == OP_GOTO:
+        return lambda m: a
+
+    if kind == OP_IF:
+        left = _compile_value(a[0], line_no, raw)
+        cond = a[1]
+        right = _compile_value(a[2], line_no, raw)
+        return lambda m: b if cond(left(m), right(m)) else nxt
+
+    if kind == OP_LOOP:
+        def loop(m):
+            m.L1 -= 1
+            return a if m.L1 != 0 else nxt
+        return loop
+
+    # OP_ERROR / OP_IF_ERROR
+    pre = _compile_value(b, line_no, raw) if kind == OP_ERROR and b is not None else None
+
+    def fail(m):
+        if pre is not None:
+            pre(m)
+        raise AsmError(a, line_no=line_no, raw_line=raw)
+    return fail
+
+def compile_program(code: List[Instr]) -> list:
+    """הידור מערך Instr לרשימת closures באותו אינדקס"""
+    return [_compile_instr(ins, ip) for ip, ins in enumerate(code)]
+
+# ============================================================
+# PYTHON BACKEND: תרגום התוכנית לפונקציית Python אמיתית (exec)
+# ============================================================
+
+ENGINES = ("closure", "python", "optimized")
+TRANSPILE_CACHE_SIZE = 256
+_transpile_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+# הוראות שמעדכנות את ZERO/NEGATIVE (MOV רק כשהיעד רגיסטר)
+_FLAG_OPS = {OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_MOD, OP_INC, OP_DEC, OP_CLEAR, OP_RAND, OP_CMP}
+# הוראות שמסיימות בלוק בסיסי
+_BLOCK_END_OPS = {OP_HALT, OP_JZ, OP_JNZ, OP_GOTO, OP_IF, OP_LOOP, OP_ERROR, OP_IF_ERROR}
+
+def _sets_flags(ins: Instr) -> bool:
+    return ins.code in _FLAG_OPS or (ins.code == OP_MOV and ins.a[0] == V_REG)
+
+def _list_range_error(idx: int, src: str, line_no: int, raw: str) -> AsmError:
+    return AsmError(f"אינדקס LIST מחוץ לטווח: {idx} (מ-{src})", line_no=line_no, raw_line=raw)
+
+def _py_value(operand: Tuple[int, Any, str], pre: List[str], ins: Instr, tmp: str, fail: str = "") -> str:
+    """ביטוי Python לאופרנד; בדיקות טווח של LIST נוספות ל-pre (fail - ראו _py_raise)"""
+    kind, x, text = operand
+    if kind == V_IMM:
+        return repr(x)
+    if kind == V_REG:
+        return REG_NAMES[x]
+    if kind == V_L1:
+        return "L1"
+    if kind == V_CNT:
+        return f"len({STACK_NAMES[x]})"
+    if _static_list_index(operand) is not None:
+        return f"LIST[{x[1]}]"
+    idx = _py_value(x, pre, ins, tmp, fail)
+    pre.append(f"{tmp} = {idx}")
+    pre.append(f"if not 0 <= {tmp} < NLIST: {fail}raise _list_range_error({tmp}, {text!r}, {ins.line_no!r}, {ins.raw!r})")
+    return f"LIST[{tmp}]"
+
+def _py_raise(msg: str, ins: Instr, fail: str = "") -> str:
+    """
+    שורת raise; fail הן הפקודות שלפניה (pc/steps של ההוראה שנכשלה), כך שהמצב
+    שהפונקציה מחזירה זהה למצב של ה-closures ברגע השגיאה
+    """
+    return f"{fail}raise AsmError({msg!r}, line_no={ins.line_no!r}, raw_line={ins.raw!r})"
+
+def _py_instr(ins: Instr, ip: int, live_flags: bool, fail: str = "") -> Tuple[List[str], Optional[str]]:
+    """מחזיר (שורות, ביטוי ה-pc הבא או None להמשך רציף)"""
+    kind, a, b = ins.code, ins.a, ins.b
+    out: List[str] = []
+    nxt = ip + 1
+    jump = None
+    if kind == OP_MOV:
+        val = _py_value(b, out, ins, "i0", fail)
+        if a[0] == V_REG:
+            out.append(f"{REG_NAMES[a[1]]} = {val}")
+        elif a[0] == V_L1:
+            out.append(f"L1 = {val}")
+        else:
+            out.append(f"v = {val}")
+            target = _py_value(a, out, ins, "i1", fail)
+            out.append(f"{target} = v")
+    elif kind in (OP_ADD, OP_SUB, OP_MUL):
+        sym = {OP_ADD: "+", OP_SUB: "-", OP_MUL: "*"}[kind]
+        out.append(f"{REG_NAMES[a]} {sym}= {_py_value(b, out, ins, 'i0', fail)}")
+    elif kind in (OP_DIV, OP_MOD):
+        sym = "//" if kind == OP_DIV else "%"
+        if b[0] == V_IMM and b[1] != 0:
+            out.append(f"{REG_NAMES[a]} {sym}= {b[1]!r}")
+        else:
+            out.append(f"d = {_py_value(b, out, ins, 'i0', fail)}")
+            out.append(f"if d == 0: {_py_raise('חילוק באפס!' if kind == OP_DIV else 'מודולו באפס!', ins, fail)}")
+            out.append(f"{REG_NAMES[a]} {sym}= d")
+    elif kind == OP_INC:
+        out.append(f"{REG_NAMES[a]} += 1")
+    elif kind == OP_DEC:
+        out.append(f"{REG_NAMES[a]} -= 1")
+    elif kind == OP_CLEAR:
+        out.append(f"{REG_NAMES[a]} = 0")
+    elif kind == OP_SWAP:
+        ra, rb = REG_NAMES[a], REG_NAMES[b]
+        out.append(f"{ra}, {rb} = {rb}, {ra}")
+    elif kind == OP_PUSH:
+        out.append(f"{STACK_NAMES[b]}.append({REG_NAMES[a]})")
+    elif kind == OP_POP:
+        s = STACK_NAMES[b]
+        out.append(f"if not {s}: {_py_raise(f'POP ממחסנית ריקה {s}', ins, fail)}")
+        out.append(f"{REG_NAMES[a]} = {s}.pop()")
+    elif kind == OP_RAND:
+        out.append(f"{REG_NAMES[a]} = randint(0, 32)")
+    elif kind == OP_PRINT:
+        out.append(f"emit({_py_value(a, out, ins, 'i0', fail)})")
+    elif kind == OP_CMP:
+        if live_flags:
+            out.append(f"F = {_py_value(a, out, ins, 'i0', fail)} - {_py_value(b, out, ins, 'i1', fail)}")
+        live_flags = False
+    elif kind == OP_JZ:
+        jump = f"{a} if F == 0 else {nxt}"
+    elif kind == OP_JNZ:
+        jump = f"{nxt} if F == 0 else {a}"
+    elif kind == OP_GOTO:
+        jump = repr(a)
+    elif kind == OP_IF:
+        left = _py_value(a[0], out, ins, "i0", fail)
+        right = _py_value(a[2], out, ins, "i1", fail)
+        jump = f"{b} if {left} {ins.args[1]} {right} else {nxt}"
+    elif kind == OP_LOOP:
+        out.append("L1 -= 1")
+        jump = f"{a} if L1 != 0 else {nxt}"
+    elif kind == OP_HALT:
+        jump = "-1"
+    elif kind == OP_ERROR:
+        if b is not None:
+            _py_value(b, out, ins, "i0", fail)
+        out.append(_py_raise(a, ins, fail))
+    elif kind == OP_IF_ERROR:
+        out.append(_py_raise(a, ins, fail))
+    if live_flags and _sets_flags(ins):
+        out.append(f"F = {REG_NAMES[a[1] if kind == OP_MOV else a]}")
+    return out, jump
+
+def _basic_blocks(code: List[Instr]) -> List[Tuple[int, int]]:
+    """חלוקה לבלוקים בסיסיים: רשימת (start, end) חצי-פתוחים"""
+    n = len(code)
+    leaders = {0}
+    for ip, ins in enumerate(code):
+        if ins.code in (OP_JZ, OP_JNZ, OP_GOTO, OP_LOOP):
+            leaders.add(ins.a)
+        elif ins.code == OP_IF:
+            leaders.add(ins.b)
+        if ins.code in _BLOCK_END_OPS:
+            leaders.add(ip + 1)
+    starts = sorted(x for x in leaders if 0 <= x < n)
+    return [(s, e) for s, e in zip(starts, starts[1:] + [n])]
+
+def _flags_live(code: List[Instr], ip: int, end: int) -> bool:
+    """
+    האם F צריך להיכתב אחרי ההוראה: היא קובעת דגלים, והדגלים שלה נראים -
+    בסוף הבלוק או בהוראה שעלולה לזרוק לפני שהוראה אחרת קובעת דגלים
+    """
+    if not _sets_flags(code[ip]):
+        return False
+    for ins in code[ip + 1:end]:
+        if _can_raise(ins):
+            return True
+        if _sets_flags(ins):
+            return False
+    return True
+
+def transpile_program(code: List[Instr]) -> str:
     """
-    if seed is not None:
-        random.seed(seed)
+    מייצר קוד Python להרצת התוכנית: goto מתורגם למכונת מצבים על בלוקים בסיסיים,
+    עם dispatch בינארי לפי pc. הפונקציה מחזירה (pc, steps, error); אם בלוק שלם לא
+    נכנס בתקציב הצעדים היא עוצרת בתחילתו כדי שהמנוע הרגיל ימשיך הוראה-הוראה.
+    בשגיאת ריצה pc ו-steps הם של ההוראה שנכשלה, והדגלים - מלפניה.
+    """
+    blocks = _basic_blocks(code)
+    bodies: Dict[int, List[str]] = {}
+    for start, end in blocks:
+        lines = [f"if steps + {end - start} > max_steps: break",
+                 f"steps += {end - start}"]
+        jump = None
+        for ip in range(start, end):
+            # בשגיאה: pc של ההוראה, ו-steps כולל אותה (כמו ב-closures)
+            fail = f"pc = {ip}; " + (f"steps -= {end - ip - 1}; " if end - ip - 1 else "")
+            body, jump = _py_instr(code[ip], ip, _flags_live(code, ip, end), fail)
+            lines.extend(body)
+        lines.append(f"pc = {jump if jump is not None else end}")
+        bodies[start] = lines
+
+    src = [
+        "def _asm_program(m, pc, steps, max_steps):",
+        "    regs = m.r",
+        "    R1, R2, R3 = regs",
+        "    L1 = m.L1",
+        "    F = 0 if m.zero else (-1 if m.negative else 1)",
+        "    S1, S2 = m.s",
+        "    LIST = m.LIST",
+        "    NLIST = len(LIST)",
+        "    emit = m.output.append",
+        "    randint = m.rng.randint",
+        "    error = None",
+        "    try:",
+        f"        while 0 <= pc < {len(code)}:",
+    ]
+
+    def dispatch(starts: List[int], indent: str):
+        if len(starts) == 1:
+            src.extend(indent + line for line in bodies[starts[0]])
+            return
+        mid = len(starts) // 2
+        src.append(f"{indent}if pc < {starts[mid]}:")
+        dispatch(starts[:mid], indent + "    ")
+        src.append(f"{indent}else:")
+        dispatch(starts[mid:], indent + "    ")
+
+    if blocks:
+        dispatch([start for start, _ in blocks], " " * 12)
+    else:
+        src.append(" " * 12 + "break")
+    src += [
+        "    except AsmError as e:",
+        "        error = e",
+        "    finally:",
+        "        regs[0], regs[1], regs[2] = R1, R2, R3",
+        "        m.L1 = L1",
+        "        m.zero, m.negative = F == 0, F < 0",
+        "    return pc, steps, error",
+    ]
+    return "\n".join(src) + "\n"
+
+def _transpiled(program_text: str, code: List[Instr]):
+    """הפונקציה המתורגמת מהמטמון (לפי hash של קוד המקור) או הידור חדש"""
+    key = hashlib.sha256(program_text.encode("utf-8")).hexdigest()
+    fn = _transpile_cache.get(key)
+    if fn is not None:
+        _transpile_cache.move_to_end(key)
+        return fn
+    namespace = {"AsmError": AsmError, "_list_range_error": _list_range_error}
+    exec(compile(transpile_program(code), f"<asm {key[:12]}>", "exec"), namespace)
+    fn = namespace["_asm_program"]
+    _transpile_cache[key] = fn
+    if len(_transpile_cache) > TRANSPILE_CACHE_SIZE:
+        _transpile_cache.popitem(last=False)
+    return fn
 
-    m = Machine()
-    ins, labels = parse_program(program_text)
-    ip = 0
-    steps = 0
+# ============================================================
+# OPTIMIZER: superinstructions, קיפול קבועים וקוד מת (engine="optimized")
+# ============================================================
 
-    def err(msg: str, line_no: int, raw: str):
-        raise AsmError(msg, line_no=line_no, raw_line=raw)
+class OptimizeStats(NamedTuple):
+    superinstructions: int      # שרשראות שהפכו ל-closure יחיד
+    fused: int                  # הוראות שנבלעו בתוך superinstruction (מעבר לראשונה)
+    folded: int                 # הוראות שנעלמו בקיפול קבועים / NOP / CMP+JZ
+    dead: int                   # הוראות שאינן ישיגות (אחרי GOTO/HALT וכו')
+    loops: int                  # LOOP-ים עם גוף אפיני שמואצים בחזקת מטריצה
+
+class OptimizedCode(NamedTuple):
+    fns: list                   # closure לכל ip; בתחילת שרשרת - ה-superinstruction
+    costs: List[int]            # כמה צעדים מקוריים ה-closure ב-ip הזה מבצע (_LOOP_COST: LOOP מואץ)
+    loops: Dict[int, Any]       # ip של LOOP -> closure מואץ (m, budget) -> (ip, צעדים)
+    stats: OptimizeStats
+
+def _can_raise(ins: Instr) -> bool:
+    """האם ההוראה עלולה לזרוק AsmError בזמן ריצה"""
+    kind = ins.code
+    if kind in (OP_POP, OP_ERROR, OP_IF_ERROR):
+        return True
+    if kind in (OP_DIV, OP_MOD) and not (ins.b[0] == V_IMM and ins.b[1] != 0):
+        return True
+    if kind == OP_IF:
+        operands = [ins.a[0], ins.a[2]]
+    else:
+        operands = [x for x in (ins.a, ins.b) if isinstance(x, tuple)]
+    return any(op[0] == V_LIST and _static_list_index(op) is None for op in operands)
+
+def _successors(ins: Instr, ip: int) -> List[int]:
+    kind = ins.code
+    if kind in (OP_HALT, OP_ERROR, OP_IF_ERROR):
+        return []
+    if kind == OP_GOTO:
+        return [ins.a]
+    if kind in (OP_JZ, OP_JNZ, OP_LOOP):
+        return [ins.a, ip + 1]
+    if kind == OP_IF:
+        return [ins.b, ip + 1]
+    return [ip + 1]
+
+def _reachable(code: List[Instr]) -> List[bool]:
+    seen = [False] * len(code)
+    todo = [0] if code else []
+    while todo:
+        ip = todo.pop()
+        if not 0 <= ip < len(code) or seen[ip]:
+            continue
+        seen[ip] = True
+        todo.extend(_successors(code[ip], ip))
+    return seen
 
-    while 0 <= ip < len(ins):
-        if steps >= max_steps:
-            raise AsmError("חריגה ממקסימום צעדים (כנראה לולאה אינסופית).")
-        steps += 1
+def _const_run(code: List[Instr], k: int, end: int) -> Tuple[int, Optional[int], int, int]:
+    """
+    רצף על רגיסטר אחד: MOV/CLEAR עם קבוע ואחריו ADD/SUB קבוע, INC, DEC.
+    מחזיר (רגיסטר, ערך התחלתי או None = יחסי לערך הקיים, תוספת, אורך).
+    """
+    ins = code[k]
+    base = None
+    if ins.code == OP_MOV and ins.a[0] == V_REG and ins.b[0] == V_IMM:
+        r, base, delta = ins.a[1], ins.b[1], 0
+    elif ins.code == OP_CLEAR:
+        r, base, delta = ins.a, 0, 0
+    else:
+        r, delta = ins.a, _const_delta(ins)
+        if delta is None:
+            return -1, None, 0, 0
+    n = 1
+    while k + n <= end and code[k + n].a == r:
+        d = _const_delta(code[k + n])
+        if d is None:
+            break
+        delta += d
+        n += 1
+    return r, base, delta, n
+
+def _const_delta(ins: Instr) -> Optional[int]:
+    if ins.code in (OP_INC, OP_DEC):
+        return 1 if ins.code == OP_INC else -1
+    if ins.code in (OP_ADD, OP_SUB) and ins.b[0] == V_IMM:
+        return ins.b[1] if ins.code == OP_ADD else -ins.b[1]
+    return None
+
+def _compile_const_run(r: int, base: Optional[int], delta: int, nxt: int):
+    if base is not None:
+        v = base + delta
+        zero, neg = v == 0, v < 0
+
+        def set_const(m):
+            m.r[r] = v
+            m.zero = zero
+            m.negative = neg
+            return nxt
+        return set_const
+
+    def add_const(m):
+        regs = m.r
+        v = regs[r] + delta
+        regs[r] = v
+        m.zero = v == 0
+        m.negative = v < 0
+        return nxt
+    return add_const
+
+def _compile_cmp_branch(cmp: Instr, jump: Instr, jump_ip: int):
+    left = _compile_value(cmp.a, cmp.line_no, cmp.raw)
+    right = _compile_value(cmp.b, cmp.line_no, cmp.raw)
+    target, nxt = jump.a, jump_ip + 1
+    if jump.code == OP_JZ:
+        def cmp_jz(m):
+            d = left(m) - right(m)
+            m.zero = zero = d == 0
+            m.negative = d < 0
+            return target if zero else nxt
+        return cmp_jz
+
+    def cmp_jnz(m):
+        d = left(m) - right(m)
+        m.zero = zero = d == 0
+        m.negative = d < 0
+        return nxt if zero else target
+    return cmp_jnz
+
+def _compile_chain(code: List[Instr], start: int, end: int, fns: list) -> Tuple[Any, int]:
+    """superinstruction להוראות start..end (כולל); מחזיר (closure, מספר הוראות שקופלו)"""
+    parts = []
+    folded = 0
+    k = start
+    while k <= end:
+        ins = code[k]
+        r, base, delta, n = _const_run(code, k, end)
+        if n > 1:
+            parts.append(_compile_const_run(r, base, delta, k + n))
+            folded += n - 1
+            k += n
+        elif ins.code == OP_CMP and k < end and code[k + 1].code in (OP_JZ, OP_JNZ):
+            parts.append(_compile_cmp_branch(ins, code[k + 1], k + 1))
+            folded += 1
+            k += 2
+        elif ins.code == OP_NOP and k < end:
+            folded += 1
+            k += 1
+        else:
+            parts.append(fns[k])
+            k += 1
+    if len(parts) == 1:
+        return parts[0], folded
+    if len(parts) == 2:
+        first, last = parts
+
+        def pair(m):
+            first(m)
+            return last(m)
+        return pair, folded
+    head, last = parts[:-1], parts[-1]
+
+    def chain(m):
+        for f in head:
+            f(m)
+        return last(m)
+    return chain, folded
+
+# האצת LOOP: גוף של עדכונים אפיניים לרגיסטרים מבוצע כחזקת מטריצה על (R1, R2, R3, L1, 1)
+LOOP_ACCEL_MIN = 16             # מינימום איטרציות שמצדיק חישוב בבת אחת
+_LOOP_COST = sys.maxsize        # עלות סמלית ב-costs: שוברת את הלולאה המהירה אל המאיץ
+_AFFINE_SRC = (V_IMM, V_REG, V_L1)
+
+def _affine_row(rows: List[List[int]], operand: Tuple[int, Any, str]) -> List[int]:
+    kind, x, _ = operand
+    if kind == V_IMM:
+        return [x * c for c in rows[4]]
+    return rows[3] if kind == V_L1 else rows[x]
+
+def _affine_body(code: List[Instr], start: int, end: int) -> Optional[List[List[int]]]:
+    """
+    מטריצת 5x5 של איטרציה אחת (start..end-1 ואז LOOP), או None אם יש בגוף
+    משהו מעבר לעדכון אפיני של R1-R3: כתיבה ל-L1/LIST, מחסניות, PRINT, RAND, קפיצות.
+    """
+    rows = [[int(i == j) for j in range(5)] for i in range(5)]
+    for ins in code[start:end]:
+        kind, a, b = ins.code, ins.a, ins.b
+        if kind == OP_NOP or (kind == OP_CMP and a[0] in _AFFINE_SRC and b[0] in _AFFINE_SRC):
+            continue
+        if kind == OP_MOV and a[0] == V_REG and b[0] in _AFFINE_SRC:
+            rows[a[1]] = list(_affine_row(rows, b))
+        elif kind in (OP_ADD, OP_SUB) and b[0] in _AFFINE_SRC:
+            src = _affine_row(rows, b)
+            sign = 1 if kind == OP_ADD else -1
+            rows[a] = [x + sign * y for x, y in zip(rows[a], src)]
+        elif kind == OP_MUL and b[0] == V_IMM:
+            rows[a] = [x * b[1] for x in rows[a]]
+        elif kind in (OP_INC, OP_DEC):
+            k = 1 if kind == OP_INC else -1
+            rows[a] = [x + k * c for x, c in zip(rows[a], rows[4])]
+        elif kind == OP_CLEAR:
+            rows[a] = [0] * 5
+        elif kind == OP_SWAP:
+            rows[a], rows[b] = rows[b], rows[a]
+        else:
+            return None
+    rows[3] = [x - c for x, c in zip(rows[3], rows[4])]
+    return rows
+
+def _mat_mul(x: List[List[int]], y: List[List[int]]) -> List[List[int]]:
+    cols = list(zip(*y))
+    return [[sum(p * q for p, q in zip(row, col)) for col in cols] for row in x]
+
+def _mat_apply(mat: List[List[int]], vec: List[int], times: int) -> List[int]:
+    """mat^times · vec בהעלאה בריבוע"""
+    while times:
+        if times & 1:
+            vec = [sum(p * q for p, q in zip(row, vec)) for row in mat]
+        times >>= 1
+        if times:
+            mat = _mat_mul(mat, mat)
+    return vec
+
+def _compile_loop_accel(ins: Instr, ip: int, mat: List[List[int]], body: list):
+    """
+    LOOP מואץ: (m, budget) -> (ip הבא, צעדים נוספים). מבצע את ה-LOOP עצמו, ואם נשארו
+    מספיק איטרציות - את כולן מלבד האחרונה שלפני היציאה, בתוך budget. האיטרציה
+    המואצת האחרונה רצה על ה-closures הרגילים, כך שהדגלים זהים להרצה רגילה.
+    """
+    target, nxt = ins.a, ip + 1
+    per_iter = ip - target + 1
+
+    def loop_accel(m, budget):
+        m.L1 -= 1
+        left = m.L1
+        if left == 0:
+            return nxt, 0
+        k = min(left - 1, budget // per_iter)
+        if k < LOOP_ACCEL_MIN:
+            return target, 0
+        r = m.r
+        r[0], r[1], r[2], m.L1, _ = _mat_apply(mat, [r[0], r[1], r[2], left, 1], k - 1)
+        for f in body:
+            f(m)
+        m.L1 -= 1
+        return target, k * per_iter
+    return loop_accel
+
+def _affine_loops(code: List[Instr], fns: list) -> Dict[int, Any]:
+    loops = {}
+    for ip, ins in enumerate(code):
+        if ins.code != OP_LOOP or not 0 <= ins.a <= ip:
+            continue
+        mat = _affine_body(code, ins.a, ip)
+        if mat is not None:
+            loops[ip] = _compile_loop_accel(ins, ip, mat, fns[ins.a:ip])
+    return loops
 
-        op, args, raw, line_no = ins[ip]
+def optimize_program(code: List[Instr], fns: Optional[list] = None) -> OptimizedCode:
+    """
+    מעבר אופטימיזציה על הקוד המפוענח. בכל בלוק בסיסי, רצף הוראות שאינן יכולות
+    להיכשל (ואחריו הוראה אחת כלשהי) הופך ל-closure יחיד, עם קיפול של MOV/ADD/INC
+    קבועים, CMP+JZ/JNZ ו-NOP. ה-closure מדווח את עלותו בצעדים מקוריים, כך
+    שהפלט, השגיאות ומספר הצעדים זהים להרצה רגילה; בלוקים לא ישיגים לא מהודרים.
+    LOOP שגופו אפיני נשאר מחוץ לשרשרת ומקבל מאיץ ב-loops.
+    """
+    fns = list(fns if fns is not None else compile_program(code))
+    costs = [1] * len(code)
+    live = _reachable(code)
+    loops = {ip: acc for ip, acc in _affine_loops(code, fns).items() if live[ip]}
+    for ip in loops:
+        costs[ip] = _LOOP_COST
+    chains = fused = folded = 0
+    for start, end in _basic_blocks(code):
+        if not live[start]:
+            continue
+        k = start
+        while k < end:
+            j = k
+            while (j + 1 < end and code[j].code not in _BLOCK_END_OPS and not _can_raise(code[j])
+                   and j + 1 not in loops):
+                j += 1
+            if j > k:
+                fns[k], n = _compile_chain(code, k, j, fns)
+                costs[k] = j - k + 1
+                chains += 1
+                fused += j - k
+                folded += n
+            k = j + 1
+    stats = OptimizeStats(chains, fused, folded, live.count(False), len(loops))
+    return OptimizedCode(fns, costs, loops, stats)
 
-        if save_history:
-            m.save_state(f"{line_no}: {op} {' '.join(args)}")
+# ============================================================
+# EXECUTOR: ליבת הרצה משותפת להרצה מלאה ול-stepping
+# ============================================================
 
+class Program:
+    """
+    תוכנית טעונה: קוד המקור והוראות מפוענחות. ה-closures והפונקציה
+    המתורגמת ל-Python נבנים בעצלות, פעם אחת לכל Program.
+    """
+    def __init__(self, text: str):
+        self.text = text
+        self.code = decode_program(*parse_program(text))
+        self._fns = None
+        self._optimized = None
+        self._back_edges = None
+
+    @property
+    def fns(self) -> list:
+        if self._fns is None:
+            self._fns = compile_program(self.code)
+        return self._fns
+
+    @property
+    def optimized(self) -> OptimizedCode:
+        if self._optimized is None:
+            self._optimized = optimize_program(self.code, self.fns)
+        return self._optimized
+
+    @property
+    def back_edges(self) -> List[bool]:
+        """לכל ip: האם זו קפיצה אחורה (יעד <= ip) - נקודת הדגימה של גלאי הלולאות"""
+        if self._back_edges is None:
+            self._back_edges = [
+                (ins.code in (OP_JZ, OP_JNZ, OP_GOTO, OP_LOOP) and ins.a <= ip) or (ins.code == OP_IF and ins.b <= ip)
+                for ip, ins in enumerate(self.code)]
+        return self._back_edges
+
+    def python(self):
+        return _transpiled(self.text, self.code)
+
+PROGRAM_CACHE_SIZE = 256
+_program_cache: "OrderedDict[str, Program]" = OrderedDict()
+
+def load_program(program_text: str) -> Program:
+    """Program מהמטמון (לפי hash של קוד המקור) - פענוח והידור פעם אחת לכל תוכנית בכל תהליך"""
+    key = hashlib.sha256(program_text.encode("utf-8")).hexdigest()
+    program = _program_cache.get(key)
+    if program is not None:
+        _program_cache.move_to_end(key)
+        return program
+    program = Program(program_text)
+    _program_cache[key] = program
+    if len(_program_cache) > PROGRAM_CACHE_SIZE:
+        _program_cache.popitem(last=False)
+    return program
+
+class InfiniteLoopError(AsmError):
+    """מצב מכונה חזר על עצמו בקפיצה אחורה: התוכנית לא תסתיים לעולם"""
+    def __init__(self, message: str, line_no: Optional[int] = None, raw_line: Optional[str] = None,
+                 steps: Optional[int] = None):
+        super().__init__(message, line_no, raw_line)
+        self.steps = steps
+
+def _infinite_loop_error(line_no: int, raw: str, steps: int) -> InfiniteLoopError:
+    return InfiniteLoopError(f"זוהתה לולאה אינסופית בשורה {line_no} אחרי {steps} צעדים",
+                             line_no=line_no, raw_line=raw, steps=steps)
+
+class StackLimitError(AsmError):
+    """סך הערכים ב-S1 וב-S2 עבר את Limits.max_stack"""
+
+class OutputLimitError(AsmError):
+    """אורך הפלט עבר את Limits.max_output"""
+
+class TimeLimitError(AsmError):
+    """זמן הריצה (שעון קיר) עבר את Limits.timeout"""
+
+class RunCancelledError(AsmError):
+    """Limits.cancel נדלק (למשל כפתור עצירה) בזמן שהריצה רצה ב-thread אחר"""
+
+class Limits(NamedTuple):
+    """מגבלות משאבים בנוסף ל-max_steps; None = ללא מגבלה"""
+    max_stack: Optional[int] = None     # סך הערכים בשתי המחסניות
+    max_output: Optional[int] = None    # מספר ערכים בפלט
+    timeout: Optional[float] = None     # שניות מיצירת ה-Executor
+    cancel: Optional[threading.Event] = None  # ביטול שיתופי מ-thread אחר
+
+# המגבלות נבדקות פעם בכמה צעדים (ולא בכל הוראה), כך שחריגה מתגלה באיחור של עד מרווח אחד
+LIMIT_CHECK_EVERY = 4096
+
+# Profile עם sample_every=0 סופר ביצועים בלבד; אחרת נמדד זמן של הוראה אחת מכל sample_every
+PROFILE_SAMPLE_EVERY = 64
+
+class Profile:
+    """
+    פרופיל ריצה: מספר ביצועים לכל הוראה, ואופציונלית זמן קיר שנמדד בדגימה.
+    הזמנים המדווחים הם הערכה: סכום הדגימות כפול sample_every.
+    """
+    def __init__(self, sample_every: int = 0):
+        self.sample_every = sample_every
+        self.code: List[Instr] = []
+        self.counts: List[int] = []
+        self.times: List[float] = []
+
+    def bind(self, code: List[Instr]):
+        """התאמה לתוכנית; פרופיל של תוכנית אחרת מתאפס"""
+        if self.code is not code:
+            self.code = code
+            self.counts = [0] * len(code)
+            self.times = [0.0] * len(code)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def by_line(self) -> Dict[int, int]:
+        """line_no -> מספר ביצועים (רק שורות שרצו)"""
+        return {ins.line_no: c for ins, c in zip(self.code, self.counts) if c}
+
+    def time_by_line(self) -> Dict[int, float]:
+        """line_no -> שניות (הערכה מהדגימות)"""
+        k = self.sample_every
+        return {ins.line_no: t * k for ins, t in zip(self.code, self.times) if t}
+
+    def by_op(self) -> Dict[str, Tuple[int, float]]:
+        """op -> (ביצועים, שניות): איפה המפרש עצמו מבלה את הזמן"""
+        out: Dict[str, Tuple[int, float]] = {}
+        for ins, c, t in zip(self.code, self.counts, self.times):
+            if c:
+                count, seconds = out.get(ins.op, (0, 0.0))
+                out[ins.op] = (count + c, seconds + t * self.sample_every)
+        return out
+
+    def hot_lines(self, n: int = 10) -> List[Tuple[int, str, int, float]]:
+        """n השורות שרצו הכי הרבה: (line_no, raw_line, ביצועים, שניות)"""
+        k = self.sample_every
+        rows = [(ins.line_no, ins.raw, c, t * k) for ins, c, t in zip(self.code, self.counts, self.times) if c]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:n]
+
+# גלאי הלולאות מדלג על מצבים שבהם במחסניות יותר ערכים מזה (עלות ההשוואה חסומה)
+LOOP_STATE_LIMIT = 4096
+
+# סוגי רשומות undo: מה ההוראה שינתה מעבר לרגיסטרים/L1/דגלים
+(_U_NONE, _U_LIST, _U_PUSH, _U_POP, _U_PRINT, _U_RAND) = range(6)
+# כל כמה הגרלות RAND נשמר מצב rng מלא; undo של RAND משחזר ממנו ומגריל מחדש
+RNG_MARK_EVERY = 256
+
+class Executor:
+    """
+    מצב ריצה שניתן להתקדם בו צעד-צעד או עד הסוף: Machine + ip + מונה צעדים.
+    step() מחזיר (machine, ip, line_no, raw_line, op, args) או None בסיום;
+    run() רץ עד הסוף ללא עלות per-step, או עם callback אופציונלי on_step.
+    undo_limit > 0 - step() רושם מה כל הוראה שינתה, ו-step_back() מבטל צעד ב-O(1)
+    (עד undo_limit צעדים אחורה). עם undo, צעד שנכשל לא משאיר שינוי במצב.
+    history_capacity/history_spill - ring buffer ו-spill לקובץ של ExecutionHistory.
+    detect_loops - run() (ללא save_history) משווה את מצב המכונה בקפיצות אחורה (Brent: מצב שמור אחד, שמוחלף
+    בחזקות של 2) וזורק InfiniteLoopError כשהמצב חוזר. הפלט לא חלק מהמצב; תוכנית עם
+    RAND לא נבדקת (מצב ה-rng משתנה בכל הגרלה).
+    limits - Limits: עומק מחסניות, אורך פלט וזמן, שנבדקים כל LIMIT_CHECK_EVERY צעדים.
+    profile - Profile למילוי: run() עובר ללולאה סופרת (closure, גובר על detect_loops);
+    בלי profile הלולאות המהירות לא משתנות.
+    """
+    def __init__(self, program, seed: Optional[int] = None, max_steps: int = 200000, save_history: bool = False,
+                 undo_limit: int = 0, history_capacity: Optional[int] = None, history_spill: Optional[str] = None,
+                 detect_loops: bool = False, limits: Optional[Limits] = None, profile: Optional[Profile] = None):
+        self.program = program if isinstance(program, Program) else Program(program)
+        self.machine = Machine(seed)
+        if history_capacity is not None or history_spill is not None:
+            self.machine.execution_history = ExecutionHistory(history_capacity, history_spill)
+        self.max_steps = max_steps
+        self.save_history = save_history
+        self.detect_loops = detect_loops and not any(ins.code == OP_RAND for ins in self.program.code)
+        self.limits = limits if limits is not None and any(x is not None for x in limits) else None
+        self._deadline = None
+        if limits is not None and limits.timeout is not None:
+            self._deadline = time.perf_counter() + limits.timeout
+        self._stop = 0
+        self.profile = profile
+        if profile is not None:
+            profile.bind(self.program.code)
+        self.ip = 0
+        self.steps = 0
+        self._pending: Optional[AsmError] = None
+        self._undo: Optional[deque] = deque(maxlen=undo_limit) if undo_limit > 0 else None
+        self._list_index: Dict[int, Any] = {}
+        self._draws = 0
+        self._rng_marks: List[Any] = []
+
+    def _undo_record(self, ip: int, ins: Instr, m: Machine) -> tuple:
+        """(ip, steps, history_len, r, L1, zero, negative, kind, x) לפני ביצוע ההוראה"""
+        kind, x = _U_NONE, None
+        code = ins.code
+        if code == OP_MOV and ins.a[0] == V_LIST:
+            index = self._list_index.get(ip)
+            if index is None:
+                index = self._list_index[ip] = _compile_list_index(ins.a, ins.line_no, ins.raw)
+            try:
+                i = index(m)
+            except AsmError:
+                pass  # ההוראה תיכשל, והרשומה תבוטל
+            else:
+                kind, x = _U_LIST, (i, m.LIST[i])
+        elif code == OP_PUSH:
+            kind, x = _U_PUSH, ins.b
+        elif code == OP_POP:
+            stack = m.s[ins.b]
+            if stack:
+                kind, x = _U_POP, (ins.b, stack[-1])
+        elif code == OP_PRINT:
+            kind = _U_PRINT
+        elif code == OP_RAND:
+            d = self._draws
+            if d % RNG_MARK_EVERY == 0 and len(self._rng_marks) == d // RNG_MARK_EVERY:
+                self._rng_marks.append(m.rng.getstate())
+            self._draws = d + 1
+            kind, x = _U_RAND, d
+        history_len = m._history.total if m._history is not None else 0
+        return (ip, self.steps, history_len, tuple(m.r), m.L1, m.zero, m.negative, kind, x)
+
+    def _apply_undo(self, rec: tuple):
+        ip, steps, history_len, r, L1, zero, negative, kind, x = rec
+        m = self.machine
+        if kind == _U_LIST:
+            m.LIST[x[0]] = x[1]
+        elif kind == _U_PUSH:
+            m.s[x].pop()
+        elif kind == _U_POP:
+            m.s[x[0]].append(x[1])
+        elif kind == _U_PRINT:
+            m.output.pop()
+        elif kind == _U_RAND:
+            m.rng.setstate(self._rng_marks[x // RNG_MARK_EVERY])
+            randint = m.rng.randint
+            for _ in range(x % RNG_MARK_EVERY):
+                randint(0, 32)
+            self._draws = x
+        m.r[:] = r
+        m.L1 = L1
+        m.zero = zero
+        m.negative = negative
+        if m._history is not None:
+            m._history.truncate(history_len)
+        self.ip = ip
+        self.steps = steps
+        self._pending = None
+
+    def step_back(self) -> bool:
+        """ביטול הצעד האחרון שבוצע ב-step(); False אם אין מה לבטל"""
+        if not self._undo:
+            return False
+        self._apply_undo(self._undo.pop())
+        return True
+
+    def _reset_undo(self):
+        if self._undo is not None:
+            self._undo.clear()
+        self._draws = 0
+        self._rng_marks = []
+
+    @property
+    def done(self) -> bool:
+        return self._pending is None and not (0 <= self.ip < len(self.program.code))
+
+    def _next_stop(self, steps: int) -> int:
+        """הצעד שבו הלולאה עוצרת לבדיקה: max_steps, או הבדיקה המחזורית הבאה של limits"""
+        if self.limits is None:
+            return self.max_steps
+        # מרווח של לפחות אורך התוכנית: כל בלוק/שרשרת נכנסים בו, כך שתמיד יש התקדמות
+        return min(self.max_steps, steps + max(LIMIT_CHECK_EVERY, len(self.program.code)))
+
+    def _check_limits(self, steps: int) -> int:
+        """
+        נקרא כשהלולאה מגיעה ל-stop: זורק את השגיאה המתאימה או מחזיר את ה-stop הבא.
+        self.steps מתעדכן כאן גם באמצע run(), כך ש-thread אחר יכול להציג התקדמות.
+        """
+        self.steps = steps
+        if steps >= self.max_steps:
+            raise AsmError(MAX_STEPS_MSG)
+        limits, m = self.limits, self.machine
+        if limits.cancel is not None and limits.cancel.is_set():
+            raise RunCancelledError("הריצה הופסקה")
+        if limits.max_stack is not None and len(m.s[0]) + len(m.s[1]) > limits.max_stack:
+            raise StackLimitError(f"חריגה ממגבלת המחסניות: יותר מ-{limits.max_stack} ערכים ב-S1/S2")
+        if limits.max_output is not None and len(m.output) > limits.max_output:
+            raise OutputLimitError(f"חריגה ממגבלת הפלט: יותר מ-{limits.max_output} ערכים")
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise TimeLimitError(f"חריגה ממגבלת הזמן: יותר מ-{limits.timeout} שניות")
+        return self._next_stop(steps)
+
+    def step(self) -> Optional[Tuple[Machine, int, int, str, str, List[str]]]:
+        if self._pending is not None:
+            e, self._pending = self._pending, None
+            raise e
+        ip = self.ip
+        code = self.program.code
+        if not (0 <= ip < len(code)):
+            return None
+        if self.steps >= self.max_steps:
+            raise AsmError(MAX_STEPS_MSG)
+        if self.limits is not None and self.steps >= self._stop:
+            self._stop = self._check_limits(self.steps)
+        ins = code[ip]
+        m = self.machine
+        undo = self._undo
+        if undo is not None:
+            undo.append(self._undo_record(ip, ins, m))
+        self.steps += 1
+        if self.profile is not None:
+            self.profile.counts[ip] += 1
+        if self.save_history:
+            m.save_state(ins.info)
         try:
-            if op == "HALT":
-                yield (m, ip, line_no, raw, op, args)
-                break
-            elif op == "NOP":
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "MOV":
-                if len(args) != 2:
-                    err("MOV דורש 2 ארגומנטים: MOV יעד, מקור", line_no, raw)
-                dst, src = args[0], args[1]
-                if src.strip().startswith("[LIST"):
-                    val = m.read_list(src)
-                else:
-                    val = m.get_value(src)
-                m.set_target(dst, val)
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "ADD":
-                if len(args) != 2:
-                    err("ADD דורש 2 ארגומנטים: ADD יעד, מקור", line_no, raw)
-                dst, src = args[0], args[1]
-                if dst not in m.regs:
-                    err("ADD: היעד חייב להיות רגיסטר (R1/R2/R3)", line_no, raw)
-                v = m.get_value(src)
-                m.regs[dst] = int(m.regs[dst]) + int(v)
-                m.update_flags(m.regs[dst])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "SUB":
-                if len(args) != 2:
-                    err("SUB דורש 2 ארגומנטים: SUB יעד, מקור", line_no, raw)
-                dst, src = args[0], args[1]
-                if dst not in m.regs:
-                    err("SUB: היעד חייב להיות רגיסטר (R1/R2/R3)", line_no, raw)
-                v = m.get_value(src)
-                m.regs[dst] = int(m.regs[dst]) - int(v)
-                m.update_flags(m.regs[dst])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "MUL":
-                if len(args) != 2:
-                    err("MUL דורש 2 ארגומנטים: MUL יעד, מקור", line_no, raw)
-                dst, src = args[0], args[1]
-                if dst not in m.regs:
-                    err("MUL: היעד חייב להיות רגיסטר", line_no, raw)
-                v = m.get_value(src)
-                m.regs[dst] = int(m.regs[dst]) * int(v)
-                m.update_flags(m.regs[dst])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "DIV":
-                if len(args) != 2:
-                    err("DIV דורש 2 ארגומנטים: DIV יעד, מקור", line_no, raw)
-                dst, src = args[0], args[1]
-                if dst not in m.regs:
-                    err("DIV: היעד חייב להיות רגיסטר", line_no, raw)
-                v = m.get_value(src)
-                if v == 0:
-                    err("חילוק באפס!", line_no, raw)
-                m.regs[dst] = int(m.regs[dst]) // int(v)
-                m.update_flags(m.regs[dst])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "MOD":
-                if len(args) != 2:
-                    err("MOD דורש 2 ארגומנטים: MOD יעד, מקור", line_no, raw)
-                dst, src = args[0], args[1]
-                if dst not in m.regs:
-                    err("MOD: היעד חייב להיות רגיסטר", line_no, raw)
-                v = m.get_value(src)
-                if v == 0:
-                    err("מודולו באפס!", line_no, raw)
-                m.regs[dst] = int(m.regs[dst]) % int(v)
-                m.update_flags(m.regs[dst])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "INC":
-                if len(args) != 1:
-                    err("INC דורש ארגומנט אחד: INC R", line_no, raw)
-                r = args[0]
-                if r not in m.regs:
-                    err("INC: חייב להיות רגיסטר", line_no, raw)
-                m.regs[r] += 1
-                m.update_flags(m.regs[r])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "DEC":
-                if len(args) != 1:
-                    err("DEC דורש ארגומנט אחד: DEC R", line_no, raw)
-                r = args[0]
-                if r not in m.regs:
-                    err("DEC: חייב להיות רגיסטר", line_no, raw)
-                m.regs[r] -= 1
-                m.update_flags(m.regs[r])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "CLEAR":
-                if len(args) != 1:
-                    err("CLEAR דורש ארגומנט אחד: CLEAR R", line_no, raw)
-                r = args[0]
-                if r not in m.regs:
-                    err("CLEAR: חייב להיות רגיסטר", line_no, raw)
-                m.regs[r] = 0
-                m.update_flags(0)
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "SWAP":
-                if len(args) != 2:
-                    err("SWAP דורש 2 ארגומנטים: SWAP R1, R2", line_no, raw)
-                a, b = args[0], args[1]
-                if a not in m.regs or b not in m.regs:
-                    err("SWAP: שני הארגומנטים חייבים להיות רגיסטרים", line_no, raw)
-                m.regs[a], m.regs[b] = m.regs[b], m.regs[a]
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "PUSH":
-                if len(args) != 2:
-                    err("PUSH דורש 2 ארגומנטים: PUSH R, S1|S2", line_no, raw)
-                r, s = args[0], args[1].upper()
-                if r not in m.regs:
-                    err("PUSH: ארגומנט ראשון חייב להיות רגיסטר", line_no, raw)
-                if s not in m.stacks:
-                    err("PUSH: מחסנית חייבת להיות S1 או S2", line_no, raw)
-                m.stacks[s].append(int(m.regs[r]))
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "POP":
-                if len(args) != 2:
-                    err("POP דורש 2 ארגומנטים: POP R, S1|S2", line_no, raw)
-                r, s = args[0], args[1].upper()
-                if r not in m.regs:
-                    err("POP: ארגומנט ראשון חייב להיות רגיסטר", line_no, raw)
-                if s not in m.stacks:
-                    err("POP: מחסנית חייבת להיות S1 או S2", line_no, raw)
-                if not m.stacks[s]:
-                    err(f"POP ממחסנית ריקה {s}", line_no, raw)
-                m.regs[r] = int(m.stacks[s].pop())
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "RAND":
-                if len(args) != 1:
-                    err("RAND דורש ארגומנט אחד: RAND R", line_no, raw)
-                r = args[0]
-                if r not in m.regs:
-                    err("RAND: חייב להיות רגיסטר", line_no, raw)
-                m.regs[r] = random.randint(0, 32)
-                m.update_flags(m.regs[r])
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "PRINT":
-                if len(args) != 1:
-                    err("PRINT דורש ארגומנט אחד: PRINT X", line_no, raw)
-                v = m.get_value(args[0])
-                m.output.append(int(v))
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "CMP":
-                if len(args) != 2:
-                    err("CMP דורש 2 ארגומנטים: CMP A, B", line_no, raw)
-                a = m.get_value(args[0])
-                b = m.get_value(args[1])
-                diff = int(a) - int(b)
-                m.update_flags(diff)
-                yield (m, ip, line_no, raw, op, args)
-                ip += 1
-            elif op == "JZ":
-                if len(args) != 1:
-                    err("JZ דורש ארגומנט אחד: JZ LABEL", line_no, raw)
-                lbl = args[0].upper()
-                if lbl not in labels:
-                    err(f"תווית לא ידועה '{args[0]}'", line_no, raw)
-                yield (m, ip, line_no, raw, op, args)
-                if m.flags["ZERO"]:
-                    ip = labels[lbl]
-                else:
-                    ip += 1
-            elif op == "JNZ":
-                if len(args) != 1:
-                    err("JNZ דורש ארגומנט אחד: JNZ LABEL", line_no, raw)
-                lbl = args[0].upper()
-                if lbl not in labels:
-                    err(f"תווית לא ידועה '{args[0]}'", line_no, raw)
-                yield (m, ip, line_no, raw, op, args)
-                if not m.flags["ZERO"]:
-                    ip = labels[lbl]
-                else:
-                    ip += 1
-            elif op == "GOTO":
-                if len(args) != 1:
-                    err("GOTO דורש ארגומנט אחד: GOTO LABEL", line_no, raw)
-                lbl = args[0].upper()
-                if lbl not in labels:
-                    err(f"תווית לא ידועה '{args[0]}'", line_no, raw)
-                yield (m, ip, line_no, raw, op, args)
-                ip = labels[lbl]
-            elif op == "IF":
-                if len(args) != 5 or args[3].upper() != "GOTO":
-                    err("תחביר IF שגוי: IF A == B GOTO LABEL", line_no, raw)
-                left, cond_op, right, _, label = args
-                lbl = label.upper()
-                if lbl not in labels:
-                    err(f"תווית לא ידועה '{label}'", line_no, raw)
-                yield (m, ip, line_no, raw, op, args)
-                if eval_condition(m, left, cond_op, right):
-                    ip = labels[lbl]
-                else:
-                    ip += 1
-            elif op == "LOOP":
-                if len(args) != 1:
-                    err("LOOP דורש ארגומנט אחד: LOOP LABEL", line_no, raw)
-                lbl = args[0].upper()
-                if lbl not in labels:
-                    err(f"תווית לא ידועה '{args[0]}'", line_no, raw)
-                m.L1 -= 1
-                yield (m, ip, line_no, raw, op, args)
-                if m.L1 != 0:
-                    ip = labels[lbl]
-                else:
-                    ip += 1
+            self.ip = self.program.fns[ip](m)
+        except AsmError as e:
+            if ins.code != OP_IF_ERROR:
+                if undo is not None:
+                    self._apply_undo(undo.pop())
+                raise
+            # כמו ב-generator המקורי: הצעד מדווח, והשגיאה עולה בצעד הבא
+            self._pending = e
+            self.ip = -1
+        return (m, ip, ins.line_no, ins.raw, ins.op, ins.args)
+
+    def run(self, on_step=None, engine: str = "closure") -> Machine:
+        """
+        engine="closure" - closures מהודרים (ברירת מחדל)
+        engine="python"  - תרגום ל-Python והרצה ב-exec, רק מתחילת התוכנית וללא
+                           save_history/on_step; אחרת חוזר ל-closure
+        engine="optimized" - superinstructions ו-LOOP אפיני מואץ מ-optimize_program (ללא
+                           save_history/on_step); ליד max_steps ממשיכים הוראה-הוראה, כך
+                           שספירת הצעדים מדויקת
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine: {engine!r}")
+        if on_step is not None:
+            while True:
+                rec = self.step()
+                if rec is None:
+                    return self.machine
+                on_step(*rec)
+        if self._pending is not None:
+            self.step()
+        # הלולאה המהירה לא רושמת undo
+        self._reset_undo()
+        code, fns, m = self.program.code, self.program.fns, self.machine
+        n, max_steps = len(fns), self.max_steps
+        fast = not self.save_history and not self.detect_loops and self.profile is None
+        if engine == "python" and fast and self.ip == 0 and self.steps == 0:
+            # אם הבלוק הבא לא נכנס בתקציב, ממשיכים הוראה-הוראה עד החריגה המדויקת
+            fn = self.program.python()
+            ip, steps = 0, 0
+            stop = self._next_stop(steps)
+            try:
+                while True:
+                    ip, steps, error = fn(m, ip, steps, stop)
+                    if error is not None:
+                        raise error
+                    if not (0 <= ip < n) or stop >= max_steps:
+                        break
+                    stop = self._check_limits(steps)
+            finally:
+                self.ip, self.steps = ip, steps
+        if engine == "optimized" and fast:
+            ofns, costs, loops = self.program.optimized[:3]
+            ip, steps = self.ip, self.steps
+            stop = self._next_stop(steps)
+            try:
+                while True:
+                    while 0 <= ip < n:
+                        cost = costs[ip]
+                        if steps + cost > stop:
+                            break
+                        steps += cost
+                        try:
+                            ip = ofns[ip](m)
+                        except AsmError:
+                            # רק ההוראה האחרונה בשרשרת יכולה להיכשל
+                            ip += cost - 1
+                            raise
+                    # LOOP מואץ (עלותו הסמלית עוצרת את הלולאה למעלה), בדיקת מגבלות או סוף התקציב
+                    accel = loops.get(ip)
+                    if accel is not None and steps < max_steps:
+                        steps += 1
+                        # גוף אפיני לא מגדיל מחסניות או פלט, אז התקציב הוא max_steps ולא stop
+                        ip, extra = accel(m, max_steps - steps)
+                        steps += extra
+                    elif not (0 <= ip < n) or stop >= max_steps:
+                        break
+                    else:
+                        stop = self._check_limits(steps)
+            finally:
+                self.ip, self.steps = ip, steps
+        ip, steps = self.ip, self.steps
+        stop = self._next_stop(steps)
+        try:
+            if self.profile is not None:
+                counts, times, every = self.profile.counts, self.profile.times, self.profile.sample_every
+                clock, history = time.perf_counter, self.save_history
+                while 0 <= ip < n:
+                    if steps >= stop:
+                        stop = self._check_limits(steps)
+                        continue
+                    steps += 1
+                    counts[ip] += 1
+                    if history:
+                        m.save_state(code[ip].info)
+                    if every and steps % every == 0:
+                        t = clock()
+                        nxt = fns[ip](m)
+                        times[ip] += clock() - t
+                        ip = nxt
+                    else:
+                        ip = fns[ip](m)
+            elif self.save_history:
+                while 0 <= ip < n:
+                    if steps >= stop:
+                        stop = self._check_limits(steps)
+                        continue
+                    steps += 1
+                    m.save_state(code[ip].info)
+                    ip = fns[ip](m)
+            elif self.detect_loops:
+                edges = self.program.back_edges
+                saved, power, lam = None, 1, 0
+                while 0 <= ip < n:
+                    if steps >= stop:
+                        stop = self._check_limits(steps)
+                        continue
+                    if edges[ip]:
+                        s1, s2 = m.s
+                        if len(s1) + len(s2) <= LOOP_STATE_LIMIT:
+                            state = (ip, m.L1, m.zero, m.negative, *m.r, tuple(s1), tuple(s2), tuple(m.LIST))
+                            if state == saved:
+                                raise _infinite_loop_error(code[ip].line_no, code[ip].raw, steps)
+                            lam += 1
+                            if lam >= power:
+                                saved, power, lam = state, power * 2, 0
+                    steps += 1
+                    ip = fns[ip](m)
+            else:
+                while 0 <= ip < n:
+                    if steps >= stop:
+                        stop = self._check_limits(steps)
+                        continue
+                    steps += 1
+                    ip = fns[ip](m)
+        finally:
+            self.ip, self.steps = ip, steps
+        return m
+
+def run_program(program_text: str, seed: Optional[int] = None, max_steps: int = 200000, save_history: bool = False,
+                engine: str = "closure", on_step=None, history_capacity: Optional[int] = None,
+                detect_loops: bool = False, limits: Optional[Limits] = None,
+                profile: Optional[Profile] = None) -> Machine:
+    """
+    הרצת תוכנית עד הסוף. התוצאה והשגיאות זהות ל-run_program_steps().
+    engine="closure" - closures מהודרים (ברירת מחדל)
+    engine="python"  - תרגום ל-Python והרצה ב-exec; עם save_history/on_step חוזר ל-closure
+    engine="optimized" - superinstructions וקיפול קבועים (optimize_program); אותו פלט ואותם צעדים
+    on_step - callback אופציונלי (machine, ip, line_no, raw_line, op, args) אחרי כל הוראה
+    history_capacity - עם save_history: רק השורות האחרונות נשמרות ב-execution_history
+    detect_loops - InfiniteLoopError ברגע שמצב חוזר בקפיצה אחורה, במקום לחכות ל-max_steps
+    limits - Limits: StackLimitError / OutputLimitError / TimeLimitError
+    profile - Profile שמתמלא בספירת ביצועים לכל הוראה/שורה (גם אם הריצה נכשלת)
+    """
+    return Executor(program_text, seed, max_steps, save_history, history_capacity=history_capacity,
+                    detect_loops=detect_loops, limits=limits, profile=profile).run(on_step, engine)
+
+def run_program_steps(program_text: str, seed: Optional[int] = None, max_steps: int = 200000, save_history: bool = False):
+    """
+    Generator שמחזיר (machine, ip, line_no, raw_line, op, args) אחרי כל הוראה.
+    """
+    ex = Executor(program_text, seed, max_steps, save_history)
+    while True:
+        rec = ex.step()
+        if rec is None:
+            return
+        yield rec
+
+# ============================================================
+# CACHE: תוצאות ריצה לפי (קוד מנורמל, seed, max_steps)
+# ============================================================
+
+RESULT_CACHE_SIZE = 1024
+
+class RunResult(NamedTuple):
+    machine: Machine            # מצב סופי, או המצב ברגע השגיאה
+    steps: int
+    error: Optional[AsmError]
+
+def normalize_program(instructions: List[Tuple[str, List[str], str, int]], labels: Dict[str, int]) -> str:
+    """קוד קנוני לפי כללי parse_program: בלי הערות, רווחים ומספרי שורות"""
+    lines = [op + " " + ",".join(args) for op, args, _, _ in instructions]
+    lines.extend(f"{name}:{target}" for name, target in sorted(labels.items()))
+    return "\n".join(lines)
+
+def execute(program_text: str, seed: Optional[int] = None, max_steps: int = 200000,
+            engine: str = "python", detect_loops: bool = False, limits: Optional[Limits] = None) -> RunResult:
+    """ריצה עד הסוף שמחזירה גם את המצב ברגע השגיאה; שגיאות פרסור נזרקות"""
+    ex = Executor(load_program(program_text), seed, max_steps, detect_loops=detect_loops, limits=limits)
+    try:
+        ex.run(engine=engine)
+    except AsmError as e:
+        return RunResult(ex.machine, ex.steps, e)
+    return RunResult(ex.machine, ex.steps, None)
+
+# תתי-סוגים של AsmError שהמטמון משחזר לפי שם (ולא כ-AsmError כללי)
+_CACHED_ERRORS = {cls.__name__: cls for cls in (InfiniteLoopError, StackLimitError, OutputLimitError)}
+# שגיאות שתלויות בשעון או במשתמש ולא בתוכנית - לא נשמרות
+_UNCACHED_ERRORS = (TimeLimitError, RunCancelledError)
+
+class ResultCache:
+    """
+    מטמון LRU של תוצאות ריצה, עם גיבוי אופציונלי ל-SQLite (db_path).
+    - תוכנית בלי RAND: ה-seed לא חלק מהמפתח
+    - תוכנית עם RAND ו-seed=None: לא נשמרת (אין תוצאה דטרמיניסטית)
+    - שגיאה נשמרת לפי אינדקס ההוראה; line_no/raw_line נבנים מחדש מהקוד הנוכחי
+    - detect_loops ומגבלות המחסניות/הפלט חלק מהמפתח; TimeLimitError ו-RunCancelledError לא נשמרות
+    - lookup()/store() למי שמריץ בעצמו (למשל ב-thread) ורק שומר את התוצאה
+    """
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE, db_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple]" = OrderedDict()
+        self._db = None
+        if db_path is not None:
+            self._db = sqlite3.connect(db_path, timeout=30)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _key(self, instructions, labels, seed: Optional[int], max_steps: int,
+             detect_loops: bool = False, limits: Optional[Limits] = None) -> Optional[str]:
+        if any(op == "RAND" for op, _, _, _ in instructions):
+            if seed is None:
+                return None
+        else:
+            seed = None
+        text = f"{normalize_program(instructions, labels)}\n--\n{seed!r}\n{max_steps}"
+        if detect_loops:
+            text += "\nloops"
+        if limits is not None and (limits.max_stack, limits.max_output) != (None, None):
+            text += f"\nlimits {limits.max_stack!r} {limits.max_output!r}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Tuple]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self._db is not None:
+            row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = tuple(json.loads(row[0]))
+                self._put(key, entry, persist=False)
+                return entry
+        return None
+
+    def _put(self, key: str, entry: Tuple, persist: bool = True):
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        if persist and self._db is not None:
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", (key, json.dumps(entry)))
+
+    def execute(self, program_text: str, seed: Optional[int] = None, max_steps: int = 200000,
+                engine: str = "python", detect_loops: bool = False, limits: Optional[Limits] = None) -> RunResult:
+        """
+        כמו execute() אבל עם מטמון. שגיאות פרסור (לפני שיש הוראות) עדיין נזרקות.
+        """
+        instructions, labels = parse_program(program_text)
+        key = self._key(instructions, labels, seed, max_steps, detect_loops, limits)
+        result = self._lookup(key, instructions)
+        if result is None:
+            result = execute(program_text, seed, max_steps, engine, detect_loops, limits)
+            self._store(key, instructions, result)
+        return result
+
+    def lookup(self, program_text: str, seed: Optional[int] = None, max_steps: int = 200000,
+               detect_loops: bool = False, limits: Optional[Limits] = None) -> Optional[RunResult]:
+        """התוצאה השמורה, או None אם צריך להריץ; שגיאות פרסור נזרקות"""
+        instructions, labels = parse_program(program_text)
+        return self._lookup(self._key(instructions, labels, seed, max_steps, detect_loops, limits), instructions)
+
+    def store(self, program_text: str, result: RunResult, seed: Optional[int] = None, max_steps: int = 200000,
+              detect_loops: bool = False, limits: Optional[Limits] = None):
+        """שמירת תוצאה של ריצה שהתבצעה מחוץ למטמון, עם אותם פרמטרים כמו ב-lookup()"""
+        instructions, labels = parse_program(program_text)
+        self._store(self._key(instructions, labels, seed, max_steps, detect_loops, limits), instructions, result)
+
+    def _lookup(self, key: Optional[str], instructions) -> Optional[RunResult]:
+        """כל חיפוש נספר: hit, או miss (כולל תוכנית שאי אפשר לשמור, key=None)"""
+        entry = self._get(key) if key is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._materialize(entry, instructions)
+
+    def _store(self, key: Optional[str], instructions, result: RunResult):
+        if key is None or isinstance(result.error, _UNCACHED_ERRORS):
+            return
+        entry = self._entry(result, instructions)
+        if entry is not None:
+            self._put(key, entry)
+
+    def run_program(self, program_text: str, seed: Optional[int] = None, max_steps: int = 200000,
+                    engine: str = "python", detect_loops: bool = False, limits: Optional[Limits] = None) -> Machine:
+        """תחליף ל-run_program (בלי save_history/on_step): מחזיר Machine או זורק AsmError"""
+        result = self.execute(program_text, seed, max_steps, engine, detect_loops, limits)
+        if result.error is not None:
+            raise result.error
+        return result.machine
+
+    @staticmethod
+    def _entry(result: RunResult, instructions) -> Optional[Tuple]:
+        m, error = result.machine, result.error
+        err = None
+        if error is not None:
+            index = None
+            if error.line_no is not None:
+                index = next((i for i, ins in enumerate(instructions) if ins[3] == error.line_no), None)
+                if index is None:
+                    return None
+            err = [str(error), index]
+            if type(error).__name__ in _CACHED_ERRORS:
+                err.append(type(error).__name__)
+        return (list(m.r), [list(x) for x in m.s], m.L1, list(m.LIST), list(m.output), m.zero, m.negative,
+                result.steps, err)
+
+    @staticmethod
+    def _materialize(entry: Tuple, instructions) -> RunResult:
+        r, s, L1, LIST, output, zero, negative, steps, err = entry
+        m = Machine()
+        m.r = list(r)
+        m.s = [list(s[0]), list(s[1])]
+        m.L1 = L1
+        m.LIST = list(LIST)
+        m.output = list(output)
+        m.zero = zero
+        m.negative = negative
+        error = None
+        if err is not None:
+            message, index, *kind = err
+            line_no = raw = None
+            if index is not None:
+                _, _, raw, line_no = instructions[index]
+            cls = _CACHED_ERRORS.get(kind[0] if kind else None, AsmError)
+            if cls is InfiniteLoopError:
+                # ההודעה כוללת את מספר השורה, שאולי שונה בקוד הנוכחי
+                error = _infinite_loop_error(line_no, raw, steps)
             else:
-                err(f"הוראה לא ידועה '{op}'", line_no, raw)
+                error = cls(message, line_no=line_no, raw_line=raw)
+        return RunResult(m, steps, error)
+
+# ============================================================
+# LOCKSTEP: תוכנית אחת על הרבה seeds במקביל (NumPy, אופציונלי)
+# ============================================================
+
+# כל הערכים בליינים נשמרים בטווח הזה, כך שחיבור/חיסור של שניים לא גולש מ-int64.
+# תוצאה שחורגת ממנו מעבירה את הליין ל-Executor רגיל (int של Python לא מוגבל).
+LANE_LIMIT = 1 << 62
 
+def _imm_operands(ins: Instr):
+    for operand in (ins.a[0], ins.a[2]) if ins.code == OP_IF else (ins.a, ins.b):
+        while isinstance(operand, tuple) and len(operand) == 3 and isinstance(operand[0], int):
+            if operand[0] == V_IMM:
+                yield operand[1]
+            if operand[0] != V_LIST:
+                break
+            operand = operand[1]
+
+def _randint_0_32(getrandbits) -> int:
+    # אותן הגרלות כמו randint(0, 32): דגימת 6 ביטים עם דחייה, בלי שכבות randrange
+    v = getrandbits(6)
+    while v > 32:
+        v = getrandbits(6)
+    return v
+
+class _Lanes:
+    """
+    מצב של N מכונות במערכי NumPy: R (N,3), L1, LIST (N,33), דגלים, מחסניות עם sp.
+    בכל סבב מבוצעת הוראה אחת עבור כל הליינים שנמצאים ב-ip הנמוך ביותר.
+    ליין שההוראה הבאה שלו תזרוק שגיאה, תחרוג מ-int64 או מתקציב הצעדים ממשיך
+    ב-Executor רגיל מאותה נקודה - כך השגיאות והתוצאות זהות ל-run_program.
+    """
+    def __init__(self, program: Program, seeds: List[Optional[int]], max_steps: int):
+        n = len(seeds)
+        self.program = program
+        self.max_steps = max_steps
+        self.R = np.zeros((n, len(REG_NAMES)), np.int64)
+        self.L1 = np.zeros(n, np.int64)
+        self.LIST = np.tile(np.arange(LIST_SIZE, dtype=np.int64), (n, 1))
+        self.zero = np.zeros(n, bool)
+        self.negative = np.zeros(n, bool)
+        self.S = [np.zeros((n, 8), np.int64) for _ in STACK_NAMES]
+        self.sp = np.zeros((n, len(STACK_NAMES)), np.int64)
+        self.ip = np.zeros(n, np.int64)
+        self.steps = np.zeros(n, np.int64)
+        self.active = np.ones(n, bool)
+        self.rngs = [random.Random(seed) for seed in seeds]
+        self.outputs: List[List[int]] = [[] for _ in range(n)]
+        self.results: List[Any] = [None] * n
+
+    def machine(self, i: int) -> Machine:
+        m = Machine()
+        m.r = self.R[i].tolist()
+        m.s = [self.S[k][i, :self.sp[i, k]].tolist() for k in range(len(STACK_NAMES))]
+        m.L1 = int(self.L1[i])
+        m.LIST = self.LIST[i].tolist()
+        m.output = self.outputs[i]
+        m.zero = bool(self.zero[i])
+        m.negative = bool(self.negative[i])
+        m.rng = self.rngs[i]
+        return m
+
+    def _bail(self, i: int):
+        ex = Executor(self.program, None, self.max_steps)
+        ex.machine = self.machine(i)
+        ex.ip, ex.steps = int(self.ip[i]), int(self.steps[i])
+        try:
+            self.results[i] = ex.run()
         except AsmError as e:
-            if e.line_no is None:
-                e.line_no = line_no
-                e.raw_line = raw
-            raise e
+            self.results[i] = e
+        self.active[i] = False
+
+    def _keep(self, g, bad, *vals):
+        """מעביר את הליינים ב-bad ל-Executor ומחזיר (g, *vals) רק לשאר"""
+        if not bad.any():
+            return (g,) + vals
+        for i in g[bad].tolist():
+            self._bail(i)
+        ok = ~bad
+        return (g[ok],) + tuple(v[ok] for v in vals)
+
+    def _value(self, operand: Tuple[int, Any, str], g):
+        """(ערכים, מסכת ליינים עם אינדקס LIST מחוץ לטווח או None)"""
+        kind, x, _ = operand
+        if kind == V_IMM:
+            return np.full(len(g), x, np.int64), None
+        if kind == V_REG:
+            return self.R[g, x], None
+        if kind == V_L1:
+            return self.L1[g], None
+        if kind == V_CNT:
+            return self.sp[g, x], None
+        idx, _ = self._value(x, g)
+        bad = (idx < 0) | (idx >= self.LIST.shape[1])
+        return self.LIST[g, np.where(bad, 0, idx)], bad
+
+    def _set_reg(self, g, r: int, v):
+        self.R[g, r] = v
+        self.zero[g] = v == 0
+        self.negative[g] = v < 0
+
+    def exec_group(self, ip: int, g):
+        ins = self.program.code[ip]
+        kind, a, b = ins.code, ins.a, ins.b
+        nxt = ip + 1
+        bad = self.steps[g] >= self.max_steps
+        target = nxt
+
+        if kind in (OP_ERROR, OP_IF_ERROR):
+            bad[:] = True
+            self._keep(g, bad)
+            return
+        if kind == OP_HALT:
+            g, = self._keep(g, bad)
+            target = -1
+        elif kind == OP_MOV:
+            v, bv = self._value(b, g)
+            if bv is not None:
+                bad |= bv
+            if a[0] == V_REG:
+                g, v = self._keep(g, bad, v)
+                self._set_reg(g, a[1], v)
+            elif a[0] == V_L1:
+                g, v = self._keep(g, bad, v)
+                self.L1[g] = v
+            else:
+                idx, bi = self._value(a[1], g)
+                bad |= (idx < 0) | (idx >= self.LIST.shape[1])
+                g, v, idx = self._keep(g, bad, v, idx)
+                self.LIST[g, idx] = v
+        elif kind in (OP_ADD, OP_SUB, OP_MUL):
+            v, bv = self._value(b, g)
+            if bv is not None:
+                bad |= bv
+            cur = self.R[g, a]
+            if kind == OP_MUL:
+                bad |= np.abs(cur.astype(np.float64) * v) >= LANE_LIMIT / 2
+                v = cur * np.where(bad, 0, v)
+            else:
+                v = cur + v if kind == OP_ADD else cur - v
+                bad |= np.abs(v) >= LANE_LIMIT
+            g, v = self._keep(g, bad, v)
+            self._set_reg(g, a, v)
+        elif kind in (OP_DIV, OP_MOD):
+            d, bv = self._value(b, g)
+            if bv is not None:
+                bad |= bv
+            bad |= d == 0
+            g, d = self._keep(g, bad, d)
+            cur = self.R[g, a]
+            self._set_reg(g, a, cur // d if kind == OP_DIV else cur % d)
+        elif kind in (OP_INC, OP_DEC):
+            v = self.R[g, a] + (1 if kind == OP_INC else -1)
+            bad |= np.abs(v) >= LANE_LIMIT
+            g, v = self._keep(g, bad, v)
+            self._set_reg(g, a, v)
+        elif kind == OP_CLEAR:
+            g, = self._keep(g, bad)
+            self._set_reg(g, a, np.zeros(len(g), np.int64))
+        elif kind == OP_SWAP:
+            g, = self._keep(g, bad)
+            tmp = self.R[g, a]
+            self.R[g, a] = self.R[g, b]
+            self.R[g, b] = tmp
+        elif kind == OP_PUSH:
+            g, = self._keep(g, bad)
+            sp = self.sp[g, b]
+            if len(g) and sp.max() >= self.S[b].shape[1]:
+                self.S[b] = np.concatenate([self.S[b], np.zeros_like(self.S[b])], axis=1)
+            self.S[b][g, sp] = self.R[g, a]
+            self.sp[g, b] = sp + 1
+        elif kind == OP_POP:
+            bad |= self.sp[g, b] == 0
+            g, = self._keep(g, bad)
+            sp = self.sp[g, b] - 1
+            self.sp[g, b] = sp
+            self.R[g, a] = self.S[b][g, sp]
+        elif kind == OP_RAND:
+            g, = self._keep(g, bad)
+            self._set_reg(g, a, np.array([_randint_0_32(self.rngs[i].getrandbits) for i in g.tolist()], np.int64))
+        elif kind == OP_PRINT:
+            v, bv = self._value(a, g)
+            if bv is not None:
+                bad |= bv
+            g, v = self._keep(g, bad, v)
+            outputs = self.outputs
+            for i, x in zip(g.tolist(), v.tolist()):
+                outputs[i].append(x)
+        elif kind == OP_CMP:
+            left, bl = self._value(a, g)
+            right, br = self._value(b, g)
+            for bv in (bl, br):
+                if bv is not None:
+                    bad |= bv
+            g, d = self._keep(g, bad, left - right)
+            self.zero[g] = d == 0
+            self.negative[g] = d < 0
+        elif kind == OP_JZ:
+            g, = self._keep(g, bad)
+            target = np.where(self.zero[g], a, nxt)
+        elif kind == OP_JNZ:
+            g, = self._keep(g, bad)
+            target = np.where(self.zero[g], nxt, a)
+        elif kind == OP_GOTO:
+            g, = self._keep(g, bad)
+            target = a
+        elif kind == OP_IF:
+            left, bl = self._value(a[0], g)
+            right, br = self._value(a[2], g)
+            for bv in (bl, br):
+                if bv is not None:
+                    bad |= bv
+            g, cond = self._keep(g, bad, a[1](left, right))
+            target = np.where(cond, b, nxt)
+        elif kind == OP_LOOP:
+            v = self.L1[g] - 1
+            bad |= np.abs(v) >= LANE_LIMIT
+            g, v = self._keep(g, bad, v)
+            self.L1[g] = v
+            target = np.where(v != 0, a, nxt)
+        else:  # OP_NOP
+            g, = self._keep(g, bad)
+        self.steps[g] += 1
+        self.ip[g] = target
+
+    def run(self) -> List[Any]:
+        n_code = len(self.program.code)
+        while True:
+            act = np.flatnonzero(self.active)
+            if not len(act):
+                return self.results
+            ips = self.ip[act]
+            done = (ips < 0) | (ips >= n_code)
+            for i in act[done].tolist():
+                self.results[i] = self.machine(i)
+                self.active[i] = False
+            if done.any():
+                act, ips = act[~done], ips[~done]
+                if not len(act):
+                    continue
+            # הקבוצה עם ה-ip הנמוך ביותר קודם: ליינים שהתפצלו מתאחדים שוב בנקודת ההמשך המשותפת
+            ip = int(ips.min())
+            self.exec_group(ip, act[ips == ip])
+
+def _run_seed(program: Program, seed: Optional[int], max_steps: int):
+    try:
+        return Executor(program, seed, max_steps).run(engine="python")
+    except AsmError as e:
+        return e
+
+def run_program_seeds(program_text: str, seeds: List[Optional[int]], max_steps: int = 200000) -> List[Any]:
+    """
+    הרצת אותה תוכנית עבור כל seed. מחזיר רשימה באותו סדר: Machine סופית,
+    או ה-AsmError שהריצה הייתה זורקת - זהה ל-run_program(program_text, seed).
+    עם NumPy הליינים רצים יחד (lockstep); בלעדיה - seed אחרי seed.
+    """
+    program = load_program(program_text)
+    seeds = list(seeds)
+    if np is None or any(abs(x) >= LANE_LIMIT for ins in program.code for x in _imm_operands(ins)):
+        return [_run_seed(program, seed, max_steps) for seed in seeds]
+    return _Lanes(program, seeds, max_steps).run()
 
 def get_python_equivalent(op: str, args: List[str]) -> str:
     """
@@ -751,1709 +2744,268 @@ HALT
 }
 
 # ============================================================
-# GUI עם צבעוניות
+# BATCH: הרצת עבודות JSONL ללא GUI
 # ============================================================
 
-class App(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Assembly Studio — תרגול Assembly")
-        self.geometry("1400x900")
-        self.option_add('*tearOff', False)
-
-        # Color scheme
-        self.colors = {
-            'bg': '#f5f5f5',
-            'card_bg': '#ffffff',
-            'primary': '#2196F3',
-            'success': '#4CAF50',
-            'warning': '#FF9800',
-            'error': '#F44336',
-            'text': '#212121',
-            'text_secondary': '#757575',
-            'accent': '#00BCD4',
-            'register': '#E3F2FD',
-            'stack': '#FFF3E0',
-            'memory': '#F3E5F5',
-            'flag_on': '#4CAF50',
-            'flag_off': '#9E9E9E',
-        }
-        
-        self.configure(bg=self.colors['bg'])
-
-        # Stepping state
-        self.stepper = None
-        self.step_machine = None
-        self.slow_running = False
-        self.after_id = None
-        self.step_history = []  # היסטוריה של מצבים (machine, ip, line_no, raw, op, args)
-        self.step_history_index = -1  # אינדקס נוכחי בהיסטוריה
-
-        # Current example navigation
-        self.current_level = None
-        self.current_example = None
-
-        self._build_header_bar()
-        self._build_main()
-
-        # Load first example from level 1
-        first_level = list(EXAMPLES.keys())[0]
-        first_example = list(EXAMPLES[first_level].keys())[0]
-        self.load_example(first_level, first_example)
-        self.update_line_numbers()
-        self.bind("<F5>", lambda e: self.on_run())
-
-    def _build_header_bar(self):
-        """Build custom header bar aligned to the right (RTL)"""
-        header_bar = tk.Frame(self, bg=self.colors['card_bg'], relief=tk.RAISED, bd=1, height=35)
-        header_bar.pack(fill="x", padx=0, pady=0)
-        header_bar.pack_propagate(False)
-        
-        inner = tk.Frame(header_bar, bg=self.colors['card_bg'])
-        inner.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # עזרה (rightmost) - using Button with postcommand menu
-        help_btn = tk.Button(inner, text="עזרה",
-                            bg=self.colors['card_bg'], fg=self.colors['text'],
-                            font=("Arial", 10), relief=tk.FLAT, padx=10, pady=5,
-                            cursor="hand2", anchor="e")
-        help_btn.pack(side="right", padx=5)
-        
-        help_menu = tk.Menu(help_btn, tearoff=0)
-        help_menu.add_command(label="📘 מדריך למתחיל", command=self.show_beginner_guide)
-        help_menu.add_command(label="🧾 שיעור ראשון (עם קוד)", command=self.show_first_lesson)
-        help_menu.add_command(label="❓ שאלות נפוצות", command=self.show_faq)
-        help_menu.add_separator()
-        help_menu.add_command(label="מדריך קצר", command=self.show_quick_guide)
-        
-        def show_help_menu(e):
-            try:
-                x = help_btn.winfo_rootx()
-                y = help_btn.winfo_rooty() + help_btn.winfo_height()
-                help_menu.post(x, y)
-            except:
-                help_menu.post(e.x_root, e.y_root)
-        help_btn.bind("<Button-1>", show_help_menu)
-        
-        # דוגמאות
-        ex_btn = tk.Button(inner, text="דוגמאות",
-                          bg=self.colors['card_bg'], fg=self.colors['text'],
-                          font=("Arial", 10), relief=tk.FLAT, padx=10, pady=5,
-                          cursor="hand2", anchor="e")
-        ex_btn.pack(side="right", padx=5)
-        
-        ex_menu = tk.Menu(ex_btn, tearoff=0)
-        for level_name, examples_dict in EXAMPLES.items():
-            level_menu = tk.Menu(ex_menu, tearoff=0)
-            ex_menu.add_cascade(label=level_name, menu=level_menu)
-            for ex_name in examples_dict.keys():
-                level_menu.add_command(
-                    label=ex_name,
-                    command=lambda l=level_name, e=ex_name: self.load_example(l, e)
-                )
-        
-        def show_ex_menu(e):
-            try:
-                x = ex_btn.winfo_rootx()
-                y = ex_btn.winfo_rooty() + ex_btn.winfo_height()
-                ex_menu.post(x, y)
-            except:
-                ex_menu.post(e.x_root, e.y_root)
-        ex_btn.bind("<Button-1>", show_ex_menu)
-        
-        # קובץ (leftmost in RTL visual order)
-        file_btn = tk.Button(inner, text="קובץ",
-                            bg=self.colors['card_bg'], fg=self.colors['text'],
-                            font=("Arial", 10), relief=tk.FLAT, padx=10, pady=5,
-                            cursor="hand2", anchor="e")
-        file_btn.pack(side="right", padx=5)
-        
-        file_menu = tk.Menu(file_btn, tearoff=0)
-        file_menu.add_command(label="חדש", command=self.new_file)
-        file_menu.add_command(label="פתח...", command=self.open_file)
-        file_menu.add_command(label="שמור...", command=self.save_file)
-        file_menu.add_separator()
-        file_menu.add_command(label="יציאה", command=self.quit)
-        
-        def show_file_menu(e):
-            try:
-                x = file_btn.winfo_rootx()
-                y = file_btn.winfo_rooty() + file_btn.winfo_height()
-                file_menu.post(x, y)
-            except:
-                file_menu.post(e.x_root, e.y_root)
-        file_btn.bind("<Button-1>", show_file_menu)
-        
-        # Hover effects for buttons
-        for btn in [help_btn, ex_btn, file_btn]:
-            def make_hover(b):
-                def on_enter(e):
-                    b.config(bg="#e0e0e0")
-                def on_leave(e):
-                    b.config(bg=self.colors['card_bg'])
-                b.bind("<Enter>", on_enter)
-                b.bind("<Leave>", on_leave)
-            make_hover(btn)
-        
-        # Keep keyboard shortcuts
-        self.bind("<Control-n>", lambda e: self.new_file())
-        self.bind("<Control-s>", lambda e: self.save_file())
-
-    def _build_controls_row(self, parent: tk.Frame) -> None:
-        """Build horizontal controls row at top of right panel"""
-        inner = tk.Frame(parent, bg=self.colors['card_bg'])
-        inner.pack(fill="x", padx=8, pady=8)
-        
-        # Group controls from right to left (RTL feel)
-        # Fields on the right
-        fields_frame = tk.Frame(inner, bg=self.colors['card_bg'])
-        fields_frame.pack(side="right", padx=5)
-        
-        # Seed entry (RTL: label on right, entry on left)
-        seed_frame = tk.Frame(fields_frame, bg=self.colors['card_bg'])
-        seed_frame.pack(side="right", padx=5)
-        tk.Label(seed_frame, text="Seed:", bg=self.colors['card_bg'], fg=self.colors['text'], 
-                font=("Arial", 9)).pack(side="right", padx=(5, 0))
-        self.seed_var = tk.StringVar(value="")
-        seed_entry = tk.Entry(seed_frame, textvariable=self.seed_var, width=10, font=("Arial", 9))
-        seed_entry.pack(side="left")
-        
-        # Max steps entry
-        steps_frame = tk.Frame(fields_frame, bg=self.colors['card_bg'])
-        steps_frame.pack(side="right", padx=5)
-        tk.Label(steps_frame, text="Max steps:", bg=self.colors['card_bg'], fg=self.colors['text'],
-                font=("Arial", 9)).pack(side="right", padx=(5, 0))
-        self.steps_var = tk.StringVar(value="200000")
-        steps_entry = tk.Entry(steps_frame, textvariable=self.steps_var, width=10, font=("Arial", 9))
-        steps_entry.pack(side="left")
-        
-        # Delay entry
-        delay_frame = tk.Frame(fields_frame, bg=self.colors['card_bg'])
-        delay_frame.pack(side="right", padx=5)
-        tk.Label(delay_frame, text="עיכוב (ms):", bg=self.colors['card_bg'], fg=self.colors['text'],
-                font=("Arial", 9), justify="right", anchor="e").pack(side="right", padx=(5, 0))
-        self.delay_var = tk.StringVar(value="150")
-        delay_entry = tk.Entry(delay_frame, textvariable=self.delay_var, width=8, font=("Arial", 9))
-        delay_entry.pack(side="left")
-        
-        # History checkbox
-        self.history_var = tk.BooleanVar(value=False)
-        history_check = tk.Checkbutton(fields_frame, text="שמור היסטוריה", variable=self.history_var, 
-                      bg=self.colors['card_bg'], fg=self.colors['text'], 
-                      selectcolor=self.colors['card_bg'], font=("Arial", 9))
-        history_check.pack(side="right", padx=5)
-        
-        # Separator
-        ttk.Separator(inner, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
-        
-        # Buttons grouped on the left (RTL: buttons on left, fields on right)
-        buttons_frame = tk.Frame(inner, bg=self.colors['card_bg'])
-        buttons_frame.pack(side="right", padx=5)
-        
-        # Output buttons
-        self._create_toolbar_button(buttons_frame, "📋 העתק פלט", self.copy_output, self.colors['text_secondary'])
-        self._create_toolbar_button(buttons_frame, "🗑 נקה פלט", self.clear_output, self.colors['text_secondary'])
-        
-        ttk.Separator(buttons_frame, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
-        
-        # Main action buttons
-        self._create_toolbar_button(buttons_frame, "⏹ איפוס", self.on_reset, self.colors['warning'])
-        self.slow_run_btn = self._create_toolbar_button(buttons_frame, "⏯ הרצה איטית", 
-                                                         self.on_slow_run, self.colors['accent'])
-        self._create_toolbar_button(buttons_frame, "⏭ צעד", self.on_step, self.colors['primary'])
-        self._create_toolbar_button(buttons_frame, "▶ הרץ (F5)", self.on_run, self.colors['success'])
-        
-        # Navigation buttons for examples (kept for existing features)
-        ttk.Separator(inner, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
-        
-        nav_frame = tk.Frame(inner, bg=self.colors['card_bg'])
-        nav_frame.pack(side="right", padx=5)
-        
-        tk.Label(nav_frame, text="תרגילים:", bg=self.colors['card_bg'], 
-                fg=self.colors['text'], font=("Arial", 9), justify="right", anchor="e").pack(side="right", padx=5)
-        self.next_example_btn = self._create_toolbar_button(nav_frame, "הבא ▶", 
-                                                             self.next_example, self.colors['text_secondary'])
-        self.prev_example_btn = self._create_toolbar_button(nav_frame, "◀ קודם", 
-                                                             self.prev_example, self.colors['text_secondary'])
-        
-        # Step back button (kept for existing features)
-        ttk.Separator(inner, orient=tk.VERTICAL).pack(side="right", fill="y", padx=8)
-        self._create_toolbar_button(inner, "◀ צעד קודם", self.on_step_back, self.colors['text_secondary'])
-
-    def _create_toolbar_button(self, parent, text, command, color):
-        btn = tk.Button(parent, text=text, command=command, 
-                       bg=color, fg='white', font=("Arial", 9, "bold"),
-                       relief=tk.RAISED, bd=1, padx=10, pady=5,
-                       cursor="hand2", activebackground=color)
-        btn.pack(side="left", padx=3)
-        
-        # Hover effect
-        def on_enter(e):
-            btn['bg'] = self._darken_color(color)
-        def on_leave(e):
-            btn['bg'] = color
-        
-        btn.bind("<Enter>", on_enter)
-        btn.bind("<Leave>", on_leave)
-        
-        return btn
-    
-    def _create_toolbar_button_vertical(self, parent, text, command, color):
-        """Create a button for vertical toolbar"""
-        btn = tk.Button(parent, text=text, command=command, 
-                       bg=color, fg='white', font=("Arial", 9, "bold"),
-                       relief=tk.RAISED, bd=1, padx=10, pady=5,
-                       cursor="hand2", activebackground=color)
-        btn.pack(fill="x", pady=3)
-        
-        # Hover effect
-        def on_enter(e):
-            btn['bg'] = self._darken_color(color)
-        def on_leave(e):
-            btn['bg'] = color
-        
-        btn.bind("<Enter>", on_enter)
-        btn.bind("<Leave>", on_leave)
-        
-        return btn
-
-    def _darken_color(self, color):
-        """Make color slightly darker for hover effect"""
-        # Simple darkening by reducing each RGB component
-        if color.startswith('#'):
-            r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
-            r, g, b = max(0, r-30), max(0, g-30), max(0, b-30)
-            return f'#{r:02x}{g:02x}{b:02x}'
-        return color
-
-    def _build_main(self):
-        # Main container with two columns using Frame (not PanedWindow)
-        main = tk.Frame(self, bg=self.colors['bg'])
-        main.pack(fill="both", expand=True, padx=10, pady=8)
-        
-        # LEFT PANEL - Code Editor (must be visible!)
-        left_frame = tk.Frame(main, bg=self.colors['bg'])
-        left_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
-        
-        # Header for code editor (RTL: text on right)
-        header = tk.Frame(left_frame, bg=self.colors['bg'])
-        header.pack(fill="x", pady=(0, 5))
-        tk.Label(header, text="קוד 📝", font=("Arial", 12, "bold"), 
-                bg=self.colors['bg'], fg=self.colors['text'],
-                anchor="e", justify="right").pack(side="right")
-        
-        # Code editor frame
-        code_frame = tk.Frame(left_frame, bg=self.colors['card_bg'], 
-                             relief=tk.SOLID, bd=1)
-        code_frame.pack(fill="both", expand=True)
-        
-        # Line numbers (RIGHT side for RTL)
-        self.line_numbers = tk.Text(code_frame, width=4, padx=3, takefocus=0, 
-                                    border=0, background="#e9e9e9", 
-                                    fg=self.colors['text_secondary'],
-                                    state="disabled", wrap="none", 
-                                    font=("Courier New", 10))
-        self.line_numbers.pack(side="right", fill="y")
-        
-        # Scrollbar (LEFT side for RTL)
-        scroll = ttk.Scrollbar(code_frame, command=self._on_scrollbar)
-        scroll.pack(side="left", fill="y")
-        
-        # Code text widget (CENTER)
-        self.code = tk.Text(code_frame, wrap="none", undo=True, 
-                           font=("Courier New", 10),
-                           bg=self.colors['card_bg'], fg=self.colors['text'],
-                           insertbackground=self.colors['primary'],
-                           yscrollcommand=scroll.set)
-        self.code.pack(side="left", fill="both", expand=True)
-
-        # Syntax highlighting colors
-        self.code.tag_configure("errorline", background="#ffebee")
-        self.code.tag_configure("currentline", background="#e3f2fd")
-        self.code.tag_configure("comment", foreground="#757575", font=("Courier New", 10, "italic"))
-        self.code.tag_configure("keyword", foreground="#1976D2", font=("Courier New", 10, "bold"))
-        self.code.tag_configure("register", foreground="#D32F2F", font=("Courier New", 10, "bold"))
-        self.code.tag_configure("number", foreground="#388E3C")
-
-        self.code.bind("<KeyRelease>", self.update_line_numbers)
-        self.code.bind("<Button-4>", self.update_line_numbers)
-        self.code.bind("<Button-5>", self.update_line_numbers)
-
-        # RIGHT PANEL - Cards and outputs
-        right_frame = tk.Frame(main, bg=self.colors['bg'], width=400)
-        right_frame.pack(side="right", fill="both", expand=False, padx=(5, 0))
-        right_frame.pack_propagate(False)
-        
-        # Controls at top
-        controls_frame = tk.Frame(right_frame, bg=self.colors['card_bg'], 
-                                 relief=tk.RAISED, bd=1)
-        controls_frame.pack(fill="x", pady=(0, 5))
-        self._build_controls_row(controls_frame)
-
-        # Cards container with scrolling
-        cards_frame = tk.Frame(right_frame, bg=self.colors['bg'])
-        cards_frame.pack(fill="both", expand=True)
-
-        cards_scroll = ttk.Scrollbar(cards_frame, orient=tk.VERTICAL)
-        cards_canvas = tk.Canvas(cards_frame, yscrollcommand=cards_scroll.set, 
-                                bg=self.colors['bg'], highlightthickness=0)
-        cards_scroll.config(command=cards_canvas.yview)
-        cards_scroll.pack(side="right", fill="y")
-        cards_canvas.pack(side="left", fill="both", expand=True)
-
-        cards_container = tk.Frame(cards_canvas, bg=self.colors['bg'])
-        cards_canvas.create_window((0, 0), window=cards_container, anchor="nw")
-
-        def update_cards_scroll(event):
-            cards_canvas.configure(scrollregion=cards_canvas.bbox("all"))
-        cards_container.bind("<Configure>", update_cards_scroll)
-
-        # Task card
-        task_card = self._create_card(cards_container, "📋 משימה")
-        self.task_label = tk.Label(task_card, text="(אין משימה בקוד הנוכחי)", 
-                                   wraplength=300, justify="right",
-                                   bg=self.colors['card_bg'], fg=self.colors['text'],
-                                   font=("Arial", 10))
-        self.task_label.pack(anchor="e", padx=5, pady=5)
-
-        # Python equivalent card
-        python_card = self._create_card(cards_container, "🐍 קוד Python מקביל", "#E8F5E9")
-        self.python_text = scrolledtext.ScrolledText(python_card, height=4,
-                                                     font=("Courier New", 9),
-                                                     state="disabled", bg="white",
-                                                     fg="#2E7D32", wrap="word")
-        self.python_text.pack(fill="both", expand=True, padx=5, pady=5)
-        self.python_text.config(state="normal")
-        self.python_text.insert("1.0", "# הקוד Python יופיע כאן כשתריץ צעד")
-        self.python_text.config(state="disabled")
-
-        # Registers card (RTL: value on left, label on right)
-        regs_card = self._create_card(cards_container, "🔢 רגיסטרים", self.colors['register'])
-        regs_grid = tk.Frame(regs_card, bg=self.colors['register'])
-        regs_grid.pack(fill="x", padx=5, pady=5)
-
-        self.reg_labels = {}
-        for i, reg in enumerate(["R1", "R2", "R3", "L1"]):
-            row, col = i // 2, i % 2
-            # Value on LEFT (RTL)
-            lbl = tk.Label(regs_grid, text="0", 
-                          font=("Courier New", 13, "bold"),
-                          width=8, anchor="e",  # Right-aligned text
-                          bg=self.colors['register'],
-                          fg=self.colors['primary'])
-            lbl.grid(row=row, column=col*2, sticky="e", padx=5, pady=4)
-            # Label on RIGHT (RTL)
-            tk.Label(regs_grid, text=f":{reg}",  # Colon on right
-                    font=("Arial", 10, "bold"),
-                    bg=self.colors['register'], 
-                    fg=self.colors['text']).grid(
-                        row=row, column=col*2+1, sticky="w", padx=5, pady=4)
-            self.reg_labels[reg] = lbl
-
-        # Flags card
-        flags_card = self._create_card(cards_container, "🚩 דגלים", "#FFF9C4")
-        flags_grid = tk.Frame(flags_card, bg="#FFF9C4")
-        flags_grid.pack(fill="x", padx=5, pady=5)
-
-        self.flag_labels = {}
-        for i, flag in enumerate(["ZERO", "NEGATIVE"]):
-            tk.Label(flags_grid, text=f"{flag}:", font=("Arial", 10, "bold"),
-                    bg="#FFF9C4", fg=self.colors['text']).grid(
-                        row=0, column=i*2, sticky="e", padx=5, pady=4)
-            lbl = tk.Label(flags_grid, text="לא", font=("Arial", 11, "bold"),
-                          width=5, bg="#FFF9C4", fg=self.colors['flag_off'])
-            lbl.grid(row=0, column=i*2+1, sticky="w", padx=5, pady=4)
-            self.flag_labels[flag] = lbl
-
-        # Stacks card (RTL: S1 on right, S2 on left)
-        stacks_card = self._create_card(cards_container, "📚 מחסניות", self.colors['stack'])
-        
-        stacks_frame = tk.Frame(stacks_card, bg=self.colors['stack'])
-        stacks_frame.pack(fill="x", padx=5, pady=5)
-
-        # S1 on RIGHT (RTL)
-        s1_frame = tk.Frame(stacks_frame, bg=self.colors['stack'])
-        s1_frame.pack(side="right", padx=5, expand=True, fill="both")
-        tk.Label(s1_frame, text="S1", font=("Arial", 10, "bold"),
-                bg=self.colors['stack'], fg=self.colors['text']).pack()
-        self.stack1_listbox = tk.Listbox(s1_frame, height=4, width=12,
-                                         font=("Courier New", 9),
-                                         bg="white", fg=self.colors['text'])
-        self.stack1_listbox.pack(fill="both", expand=True)
-
-        # S2 on LEFT (RTL)
-        s2_frame = tk.Frame(stacks_frame, bg=self.colors['stack'])
-        s2_frame.pack(side="left", padx=5, expand=True, fill="both")
-        tk.Label(s2_frame, text="S2", font=("Arial", 10, "bold"),
-                bg=self.colors['stack'], fg=self.colors['text']).pack()
-        self.stack2_listbox = tk.Listbox(s2_frame, height=4, width=12,
-                                         font=("Courier New", 9),
-                                         bg="white", fg=self.colors['text'])
-        self.stack2_listbox.pack(fill="both", expand=True)
-
-        counters_frame = tk.Frame(stacks_card, bg=self.colors['stack'])
-        counters_frame.pack(fill="x", padx=5, pady=5)
-        
-        tk.Label(counters_frame, text="C1:", font=("Arial", 9, "bold"),
-                bg=self.colors['stack'], fg=self.colors['text']).pack(side="left", padx=5)
-        self.c1_label = tk.Label(counters_frame, text="0", font=("Courier New", 11, "bold"),
-                                bg=self.colors['stack'], fg=self.colors['primary'])
-        self.c1_label.pack(side="left", padx=5)
-        
-        tk.Label(counters_frame, text="C2:", font=("Arial", 9, "bold"),
-                bg=self.colors['stack'], fg=self.colors['text']).pack(side="left", padx=15)
-        self.c2_label = tk.Label(counters_frame, text="0", font=("Courier New", 11, "bold"),
-                                bg=self.colors['stack'], fg=self.colors['primary'])
-        self.c2_label.pack(side="left", padx=5)
-
-        # Memory (LIST) card
-        mem_card = self._create_card(cards_container, "💾 זיכרון (LIST)", self.colors['memory'])
-        mem_frame = tk.Frame(mem_card, bg=self.colors['memory'])
-        mem_frame.pack(fill="both", expand=True, padx=5, pady=5)
-
-        mem_scroll = ttk.Scrollbar(mem_frame)
-        mem_scroll.pack(side="right", fill="y")
-
-        self.mem_tree = ttk.Treeview(mem_frame, columns=("value",), show="tree headings",
-                                     height=8, yscrollcommand=mem_scroll.set)
-        mem_scroll.config(command=self.mem_tree.yview)
-        self.mem_tree.heading("#0", text="Index")
-        self.mem_tree.heading("value", text="Value")
-        self.mem_tree.column("#0", width=80)
-        self.mem_tree.column("value", width=100)
-        self.mem_tree.pack(side="left", fill="both", expand=True)
-
-        # Style for treeview
-        style = ttk.Style()
-        style.configure("Treeview", background=self.colors['memory'], 
-                       fieldbackground=self.colors['memory'])
-
-        for i in range(33):
-            self.mem_tree.insert("", "end", text=str(i), values=(str(i),))
-
-        # Output preview card
-        out_preview_card = self._create_card(cards_container, "📤 פלט (תצוגה מהירה)", "#E8F5E9")
-        self.out_preview = scrolledtext.ScrolledText(out_preview_card, height=6,
-                                                     font=("Courier New", 10),
-                                                     state="disabled", bg="white",
-                                                     fg=self.colors['success'])
-        self.out_preview.pack(fill="both", expand=True, padx=5, pady=5)
-
-        # Bottom: Notebook (existing tabs)
-        self.notebook = ttk.Notebook(right)
-        right.add(self.notebook, weight=1)
-
-        # Output tab
-        out_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
-        self.notebook.add(out_frame, text="📤 פלט")
-        self.out = scrolledtext.ScrolledText(out_frame, font=("Courier New", 10),
-                                             bg=self.colors['card_bg'], 
-                                             fg=self.colors['success'])
-        self.out.pack(fill="both", expand=True, padx=5, pady=5)
-
-        # Error tab
-        err_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
-        self.notebook.add(err_frame, text="⚠ שגיאות")
-        self.err = scrolledtext.ScrolledText(err_frame, font=("Courier New", 10),
-                                             foreground=self.colors['error'],
-                                             bg=self.colors['card_bg'])
-        self.err.pack(fill="both", expand=True, padx=5, pady=5)
-
-        # State tab
-        state_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
-        self.notebook.add(state_frame, text="🔍 מצב")
-        self.state = scrolledtext.ScrolledText(state_frame, font=("Courier New", 10),
-                                               bg=self.colors['card_bg'], 
-                                               fg=self.colors['text'])
-        self.state.pack(fill="both", expand=True, padx=5, pady=5)
-
-        # History tab
-        hist_frame = tk.Frame(self.notebook, bg=self.colors['card_bg'])
-        self.notebook.add(hist_frame, text="📜 היסטוריה")
-        self.history = scrolledtext.ScrolledText(hist_frame, font=("Courier New", 9),
-                                                 bg=self.colors['card_bg'], 
-                                                 fg=self.colors['text_secondary'])
-        self.history.pack(fill="both", expand=True, padx=5, pady=5)
-
-    def _create_card(self, parent, title, bg_color=None):
-        """Create a styled card frame"""
-        if bg_color is None:
-            bg_color = self.colors['card_bg']
-        
-        card = tk.LabelFrame(parent, text=title, font=("Arial", 10, "bold"),
-                            bg=bg_color, fg=self.colors['text'],
-                            relief=tk.RAISED, bd=2)
-        card.pack(fill="both", expand=True, padx=5, pady=5)
-        return card
-
-    def _on_scrollbar(self, *args):
-        self.code.yview(*args)
-        self.line_numbers.yview(*args)
-
-    def update_line_numbers(self, event=None):
-        content = self.code.get("1.0", "end-1c")
-        lines = content.split("\n")
-        nums = "\n".join(str(i) for i in range(1, len(lines) + 1))
-
-        self.line_numbers.config(state="normal")
-        self.line_numbers.delete("1.0", "end")
-        self.line_numbers.insert("1.0", nums)
-        self.line_numbers.config(state="disabled")
-
-        # sync top
-        try:
-            self.line_numbers.yview_moveto(self.code.yview()[0])
-        except Exception:
-            pass
-        
-        # Apply syntax highlighting
-        self._apply_syntax_highlighting()
-        
-        # Update Python equivalent when code changes
-        self.update_python_equivalent()
-
-    def _apply_syntax_highlighting(self):
-        """Apply syntax highlighting to code"""
-        content = self.code.get("1.0", "end-1c")
-        
-        # Remove old tags
-        for tag in ["comment", "keyword", "register", "number"]:
-            self.code.tag_remove(tag, "1.0", "end")
-        
-        keywords = ["MOV", "ADD", "SUB", "MUL", "DIV", "MOD", "INC", "DEC", "CLEAR",
-                   "SWAP", "PUSH", "POP", "RAND", "PRINT", "CMP", "JZ", "JNZ",
-                   "GOTO", "IF", "LOOP", "HALT", "NOP"]
-        registers = ["R1", "R2", "R3", "L1", "S1", "S2", "C1", "C2"]
-        
-        lines = content.split("\n")
-        for i, line in enumerate(lines, 1):
-            # Comments
-            for comment_char in [";", "#"]:
-                if comment_char in line:
-                    idx = line.index(comment_char)
-                    self.code.tag_add("comment", f"{i}.{idx}", f"{i}.end")
-                    line = line[:idx]  # Process only non-comment part
-            
-            # Keywords
-            for keyword in keywords:
-                start = 0
-                while True:
-                    idx = line.find(keyword, start)
-                    if idx == -1:
-                        break
-                    # Check if it's a whole word
-                    if (idx == 0 or not line[idx-1].isalnum()) and \
-                       (idx + len(keyword) >= len(line) or not line[idx + len(keyword)].isalnum()):
-                        self.code.tag_add("keyword", f"{i}.{idx}", f"{i}.{idx + len(keyword)}")
-                    start = idx + 1
-            
-            # Registers
-            for reg in registers:
-                start = 0
-                while True:
-                    idx = line.find(reg, start)
-                    if idx == -1:
-                        break
-                    if (idx == 0 or not line[idx-1].isalnum()) and \
-                       (idx + len(reg) >= len(line) or not line[idx + len(reg)].isalnum()):
-                        self.code.tag_add("register", f"{i}.{idx}", f"{i}.{idx + len(reg)}")
-                    start = idx + 1
-            
-            # Numbers
-            for match in re.finditer(r'\b\d+\b', line):
-                start_idx, end_idx = match.span()
-                self.code.tag_add("number", f"{i}.{start_idx}", f"{i}.{end_idx}")
-
-    def clear_output(self):
-        self.out.delete("1.0", "end")
-        self.err.delete("1.0", "end")
-        self.state.delete("1.0", "end")
-        self.history.delete("1.0", "end")
-        self.code.tag_remove("errorline", "1.0", "end")
-
-    def copy_output(self):
-        txt = self.out.get("1.0", "end-1c")
-        self.clipboard_clear()
-        self.clipboard_append(txt)
-        messagebox.showinfo("הצלחה", "הפלט הועתק ללוח.")
-
-    def new_file(self):
-        if messagebox.askyesno("חדש", "לנקות את העורך?"):
-            self.code.delete("1.0", "end")
-            self.clear_output()
-            self.update_line_numbers()
-            self.current_level = None
-            self.current_example = None
-            self._update_navigation_buttons()
-
-    def open_file(self):
-        filename = filedialog.askopenfilename(
-            title="פתח קובץ",
-            filetypes=[("Assembly files", "*.asm"), ("Text files", "*.txt"), ("All files", "*.*")]
-        )
-        if not filename:
-            return
-        try:
-            with open(filename, "r", encoding="utf-8") as f:
-                content = f.read()
-            self.code.delete("1.0", "end")
-            self.code.insert("1.0", content)
-            self.clear_output()
-            self.update_line_numbers()
-            self.current_level = None
-            self.current_example = None
-            self._update_navigation_buttons()
-        except Exception as e:
-            messagebox.showerror("שגיאה", f"לא ניתן לפתוח:\n{e}")
-
-    def save_file(self):
-        filename = filedialog.asksaveasfilename(
-            title="שמור קובץ",
-            defaultextension=".asm",
-            filetypes=[("Assembly files", "*.asm"), ("Text files", "*.txt"), ("All files", "*.*")]
-        )
-        if not filename:
-            return
-        try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(self.code.get("1.0", "end-1c"))
-            messagebox.showinfo("הצלחה", "נשמר.")
-        except Exception as e:
-            messagebox.showerror("שגיאה", f"לא ניתן לשמור:\n{e}")
-
-    def load_example(self, level: str, example: str = None):
-        if example is None:
-            # Backward compatibility
-            code = EXAMPLES.get(level) if isinstance(EXAMPLES.get(level), str) else None
-            if not code:
-                return
-        else:
-            code = EXAMPLES.get(level, {}).get(example)
-            if not code:
-                return
-
-        # Save current position
-        self.current_level = level
-        self.current_example = example
-        
-        self.code.delete("1.0", "end")
-        self.code.insert("1.0", code)
-        self.clear_output()
-        self.update_line_numbers()
-        self.update_task_card()
-        self.on_reset()
-        self._update_navigation_buttons()
-        self.update_python_equivalent()
-
-    def on_run(self):
-        self.clear_output()
-        program = self.code.get("1.0", "end")
-        seed_txt = self.seed_var.get().strip()
-        seed = None
-        if seed_txt:
-            try:
-                seed = int(seed_txt)
-            except ValueError:
-                messagebox.showerror("שגיאה", "Seed חייב להיות מספר שלם.")
-                return
+def _error_info(e: AsmError) -> Dict[str, Any]:
+    return {"type": type(e).__name__, "message": str(e), "line_no": e.line_no, "raw_line": e.raw_line}
 
-        try:
-            max_steps = int(self.steps_var.get().strip() or "200000")
-        except ValueError:
-            messagebox.showerror("שגיאה", "Max steps חייב להיות מספר שלם.")
-            return
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
 
+def run_job(job: Dict[str, Any], engine: str = "python", max_steps: int = 200000,
+            cache: Optional[ResultCache] = None, verify: bool = False, detect_loops: bool = False,
+            limits: Optional[Limits] = None) -> Dict[str, Any]:
+    """
+    הרצת עבודה אחת: {"id", "program", "seed", "max_steps", "expected"}.
+    מחזיר שורת תוצאה: status=ok/error/invalid, output, steps, error, passed (אם יש expected).
+    verify - תוכנית עם שגיאות סטטיות נדחית בלי לרוץ, עם כל השגיאות ב-error["errors"].
+    detect_loops - לולאה אינסופית מדווחת (InfiniteLoopError) בלי לשרוף את כל max_steps.
+    limits - Limits; סוג השגיאה (StackLimitError וכו') מופיע ב-error["type"].
+    """
+    result: Dict[str, Any] = {"id": job.get("id")}
+    if "_invalid" in job:
+        result.update(status="invalid", error={"type": "InvalidJob", "message": job["_invalid"]})
+        return result
+    program, seed, expected = job.get("program"), job.get("seed"), job.get("expected")
+    problem = None
+    if not isinstance(program, str):
+        problem = "missing 'program' string"
+    elif seed is not None and not _is_int(seed):
+        problem = "'seed' must be an integer or null"
+    elif not _is_int(job.get("max_steps", max_steps)):
+        problem = "'max_steps' must be an integer"
+    elif expected is not None and not isinstance(expected, list):
+        problem = "'expected' must be a list"
+    if problem is not None:
+        result.update(status="invalid", error={"type": "InvalidJob", "message": problem})
+        return result
+    errors = verify_program(program) if verify else []
+    if errors:
+        info = _error_info(AsmVerifyError(errors))
+        info["errors"] = [_error_info(e) for e in errors]
+        result.update(status="error", output=[], error=info)
+    else:
+        runner = cache.execute if cache is not None else execute
         try:
-            m = run_program(program, seed=seed, max_steps=max_steps, save_history=self.history_var.get())
-
-            # output
-            if m.output:
-                self.out.insert("end", "=== פלט ===\n", "header")
-                self.out.insert("end", "\n".join(str(x) for x in m.output) + "\n")
-            else:
-                self.out.insert("end", "(אין פלט)\n", "info")
-
-            # state
-            self.state.insert("end", "=== מצב סופי ===\n\n", "header")
-            self.state.insert("end", f"R1 = {m.regs['R1']}\n")
-            self.state.insert("end", f"R2 = {m.regs['R2']}\n")
-            self.state.insert("end", f"R3 = {m.regs['R3']}\n")
-            self.state.insert("end", f"L1 = {m.L1}\n\n")
-            self.state.insert("end", f"C1 = {len(m.stacks['S1'])} S1 = {m.stacks['S1']}\n")
-            self.state.insert("end", f"C2 = {len(m.stacks['S2'])} S2 = {m.stacks['S2']}\n\n")
-            self.state.insert("end", f"ZERO = {m.flags['ZERO']} NEGATIVE = {m.flags['NEGATIVE']}\n\n")
-            self.state.insert("end", f"LIST (0..9): {m.LIST[:10]} ...\n")
-
-            # history
-            if self.history_var.get() and m.execution_history:
-                self.history.insert("end", "=== היסטוריה (50 אחרונים) ===\n\n")
-                for i, st in enumerate(m.execution_history[-50:], 1):
-                    self.history.insert("end", f"[{i}] {st['step']}\n")
-                    self.history.insert("end",
-                        f"  R1={st['R1']} R2={st['R2']} R3={st['R3']} L1={st['L1']} "
-                        f"C1={st['C1']} C2={st['C2']} ZERO={st['ZERO']} NEG={st['NEGATIVE']}\n")
-
-            self.notebook.select(0)
-            self.update_right_cards(m)
+            m, steps, e = runner(program, seed, job.get("max_steps", max_steps), engine, detect_loops, limits)
+        except AsmError as parse_error:
+            m, steps, e = Machine(), 0, parse_error
+        if e is not None:
+            result.update(status="error", output=m.output, error=_error_info(e))
+        else:
+            result.update(status="ok", output=m.output, steps=steps)
+    if expected is not None:
+        result["passed"] = result["status"] == "ok" and result["output"] == expected
+    return result
+
+def iter_jobs(lines):
+    """JSONL -> עבודות; שורה לא תקינה מוחזרת כ-dict עם '_invalid'"""
+    for n, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            yield {"_invalid": f"line {n}: {e}"}
+            continue
+        if not isinstance(job, dict):
+            yield {"_invalid": f"line {n}: expected a JSON object"}
+            continue
+        yield job
 
-        except AsmError as e:
-            if e.line_no:
-                self.code.tag_add("errorline", f"{e.line_no}.0", f"{e.line_no}.end")
-                self.code.see(f"{e.line_no}.0")
-
-            msg = "=== שגיאה ===\n\n"
-            if e.line_no:
-                msg += f"שורה {e.line_no}: {e}\n"
-                if e.raw_line is not None:
-                    msg += f"קוד מקור: {e.raw_line}\n"
-            else:
-                msg += f"{e}\n"
-            self.err.insert("end", msg)
-            self.notebook.select(1)
-        except Exception as ex:
-            self.err.insert("end", f"שגיאה בלתי צפויה: {ex}\n")
-            self.notebook.select(1)
-
-    def _copy_machine(self, m: Machine) -> Machine:
-        """יצירת עותק עמוק של Machine"""
-        new_m = Machine()
-        new_m.regs = m.regs.copy()
-        new_m.stacks = {"S1": m.stacks["S1"].copy(), "S2": m.stacks["S2"].copy()}
-        new_m.L1 = m.L1
-        new_m.LIST = m.LIST.copy()
-        new_m.output = m.output.copy()
-        new_m.flags = m.flags.copy()
-        return new_m
+# כמה קודי מקור (לפי hash) כל worker שומר, ו-ה-parent זוכר שנשלחו לאותו worker
+SOURCE_MEMO_SIZE = 4096
 
-    def on_step(self):
-        """ביצוע צעד אחד"""
-        try:
-            if self.stepper is None:
-                program = self.code.get("1.0", "end")
-                seed_txt = self.seed_var.get().strip()
-                seed = None
-                if seed_txt:
-                    try:
-                        seed = int(seed_txt)
-                    except ValueError:
-                        messagebox.showerror("שגיאה", "Seed חייב להיות מספר שלם.")
-                        return
-
-                try:
-                    max_steps = int(self.steps_var.get().strip() or "200000")
-                except ValueError:
-                    messagebox.showerror("שגיאה", "Max steps חייב להיות מספר שלם.")
-                    return
-
-                self.stepper = run_program_steps(program, seed=seed, max_steps=max_steps,
-                                                 save_history=self.history_var.get())
-                self.code.tag_remove("currentline", "1.0", "end")
-                self.code.tag_remove("errorline", "1.0", "end")
-                # נקה היסטוריה כשמתחילים stepper חדש
-                self.step_history = []
-                self.step_history_index = -1
-                # שמור מצב התחלתי
-                initial_machine = Machine()
-                self.step_history.append((self._copy_machine(initial_machine), -1, 0, "", "START", []))
-                self.step_history_index = 0
-
-            # אם אנחנו באמצע היסטוריה (חזרנו אחורה), נמחק את כל מה שאחרי
-            if self.step_history_index < len(self.step_history) - 1:
-                self.step_history = self.step_history[:self.step_history_index + 1]
-                # אם ה-stepper הוא None (כי חזרנו אחורה), נאתחל אותו מחדש
-                if self.stepper is None:
-                    program = self.code.get("1.0", "end")
-                    seed_txt = self.seed_var.get().strip()
-                    seed = None
-                    if seed_txt:
-                        try:
-                            seed = int(seed_txt)
-                        except ValueError:
-                            messagebox.showerror("שגיאה", "Seed חייב להיות מספר שלם.")
-                            return
-                    try:
-                        max_steps = int(self.steps_var.get().strip() or "200000")
-                    except ValueError:
-                        messagebox.showerror("שגיאה", "Max steps חייב להיות מספר שלם.")
-                        return
-                    self.stepper = run_program_steps(program, seed=seed, max_steps=max_steps, save_history=self.history_var.get())
-                    # הריץ את ה-stepper עד שנגיע למצב הנוכחי
-                    target_index = self.step_history_index
-                    for _ in range(target_index):
-                        try:
-                            next(self.stepper)
-                        except (StopIteration, AsmError):
-                            break
+def _source_key(program: str) -> str:
+    return hashlib.sha1(program.encode("utf-8")).hexdigest()
 
+def iter_chunks(jobs, chunk_size: int):
+    """
+    קיבוץ עבודות ל-chunks עבור ה-workers: (sources, items), כש-sources היא רשימת
+    (hash, קוד מקור) והעבודה מחזיקה רק את האינדקס שלה ב-sources. כל קוד מקור
+    מופיע פעם אחת ל-chunk.
+    """
+    sources: List[Tuple[str, Optional[str]]] = []
+    index: Dict[str, int] = {}
+    items: List[Tuple[Dict[str, Any], int]] = []
+    for job in jobs:
+        program = job.get("program")
+        src = -1
+        if isinstance(program, str):
+            src = index.get(program)
+            if src is None:
+                src = index[program] = len(sources)
+                sources.append((_source_key(program), program))
+            job = {k: v for k, v in job.items() if k != "program"}
+        items.append((job, src))
+        if len(items) >= chunk_size:
+            yield sources, items
+            sources, index, items = [], {}, []
+    if items:
+        yield sources, items
+
+def _memo_touch(memo: "OrderedDict[str, Any]", key: str, value: Any) -> bool:
+    """
+    LRU של קודי מקור לפי hash: מחזיר אם key כבר היה בו, ומסמן אותו כאחרון או מוסיף
+    אותו ופולט את הישן ביותר. ה-parent וה-worker מבצעים את אותן פעולות באותו סדר,
+    כך ששני הזיכרונות נשארים זהים.
+    """
+    if key in memo:
+        memo.move_to_end(key)
+        return True
+    memo[key] = value
+    if len(memo) > SOURCE_MEMO_SIZE:
+        memo.popitem(last=False)
+    return False
+
+def ship_sources(sources: List[Tuple[str, Optional[str]]], sent: "OrderedDict[str, Any]") -> List[Tuple[str, Optional[str]]]:
+    """sources של chunk עבור worker מסוים: קוד שכבר נשלח אליו (לפי sent שלו) מוחלף ב-None"""
+    return [(key, None if _memo_touch(sent, key, None) else program) for key, program in sources]
+
+_worker_cache: Optional[ResultCache] = None
+_worker_sources: "OrderedDict[str, str]" = OrderedDict()
+
+def _run_chunk(sources: List[Tuple[str, Optional[str]]], items: List[Tuple[Dict[str, Any], int]], engine: str,
+               max_steps: int, cache_path: Optional[str], verify: bool, detect_loops: bool,
+               limits: Optional[Limits]) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    רץ בתהליך worker; Program, ResultCache וקודי המקור (לפי hash) נשמרים בתהליך בין chunks.
+    קוד שנשלח רק כ-hash נמצא תמיד ב-_worker_sources, שמתעדכן בדיוק כמו sent של ה-parent.
+    מחזיר (תוצאות, hits, misses) של ה-chunk.
+    """
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = ResultCache(db_path=cache_path)
+    programs = []
+    for key, program in sources:
+        if program is None:
+            program = _worker_sources[key]
+        _memo_touch(_worker_sources, key, program)
+        programs.append(program)
+    hits, misses = _worker_cache.hits, _worker_cache.misses
+    results = []
+    for job, src in items:
+        if src >= 0:
+            job["program"] = programs[src]
+        results.append(run_job(job, engine, max_steps, _worker_cache, verify, detect_loops, limits))
+    return results, _worker_cache.hits - hits, _worker_cache.misses - misses
+
+def _open_stream(path: str, mode: str):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, encoding="utf-8")
+
+def run_batch(in_path: str, out_path: str, engine: str = "python", max_steps: int = 200000,
+              workers: int = 1, chunk_size: int = 64, cache_path: Optional[str] = None,
+              verify: bool = False, detect_loops: bool = False, limits: Optional[Limits] = None) -> Dict[str, int]:
+    """
+    הזרמת עבודות מקובץ JSONL לקובץ תוצאות JSONL, שורה לכל עבודה ובאותו סדר.
+    הקבצים לא נטענים לזיכרון במלואם. "-" = stdin/stdout.
+    workers > 1 - פיזור chunks על workers קבועים (ProcessPoolExecutor של תהליך אחד לכל worker),
+    עם מספר חסום של chunks בדרך.
+    תוצאות חוזרות (אותה תוכנית מנורמלת) נלקחות מ-ResultCache; cache_path = קובץ SQLite.
+    """
+    counts = {"jobs": 0, "ok": 0, "error": 0, "invalid": 0, "passed": 0, "graded": 0,
+              "cache_hits": 0, "cache_misses": 0}
+    src = _open_stream(in_path, "r")
+    dst = _open_stream(out_path, "w")
+
+    def write(result: Dict[str, Any]):
+        counts["jobs"] += 1
+        counts[result["status"]] += 1
+        if "passed" in result:
+            counts["graded"] += 1
+            counts["passed"] += result["passed"]
+        dst.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    try:
+        if workers <= 1:
+            cache = ResultCache(db_path=cache_path)
             try:
-                machine, ip, line_no, raw, op, args = next(self.stepper)
-                # שמור עותק עמוק של המצב
-                machine_copy = self._copy_machine(machine)
-                self.step_history.append((machine_copy, ip, line_no, raw, op, args))
-                self.step_history_index = len(self.step_history) - 1
-                
-                self.step_machine = machine
-                self.highlight_current_line(line_no)
-                self.update_right_cards(machine)
-                self.update_python_equivalent()
-
-                # Check for HALT
-                if op == "HALT":
-                    self.stepper = None
-                    messagebox.showinfo("סיום", "התוכנית הסתיימה (HALT).")
-
-            except StopIteration:
-                self.stepper = None
-                messagebox.showinfo("סיום", "התוכנית הסתיימה.")
-
-        except AsmError as e:
-            self.stepper = None
-            self.step_machine = None
-            if self.slow_running:
-                self.on_slow_run()  # Stop slow run
-
-            if e.line_no:
-                self.code.tag_add("errorline", f"{e.line_no}.0", f"{e.line_no}.end")
-                self.code.see(f"{e.line_no}.0")
-
-            msg = "=== שגיאה ===\n\n"
-            if e.line_no:
-                msg += f"שורה {e.line_no}: {e}\n"
-                if e.raw_line is not None:
-                    msg += f"קוד מקור: {e.raw_line}\n"
-            else:
-                msg += f"{e}\n"
-            self.err.insert("end", msg)
-            self.notebook.select(1)
-
-    def on_step_back(self):
-        """חזרה לצעד קודם"""
-        if self.step_history_index <= 0:
-            # אין מצב קודם
-            return
-        
-        # חזור למצב הקודם
-        self.step_history_index -= 1
-        machine_copy, ip, line_no, raw, op, args = self.step_history[self.step_history_index]
-        
-        # עדכן את המצב הנוכחי
-        self.step_machine = machine_copy
-        if line_no > 0:
-            self.highlight_current_line(line_no)
-        else:
-            self.code.tag_remove("currentline", "1.0", "end")
-        self.update_right_cards(machine_copy)
-        
-        # אתחל את ה-stepper כדי שנוכל להמשיך קדימה מהמצב הנוכחי
-        # (ה-stepper יתאתחל מחדש ב-on_step הבא)
-        self.stepper = None
-
-    def on_reset(self):
-        """איפוס מצב"""
-        if self.slow_running:
-            self.on_slow_run()  # Stop slow run
-        self.stepper = None
-        self.step_machine = None
-        self.step_history = []
-        self.step_history_index = -1
-        self.code.tag_remove("currentline", "1.0", "end")
-        
-        # Reset cards to initial state
-        m = Machine()
-        self.update_right_cards(m)
-        
-        # Update Python equivalent card with current program
-        self.update_python_equivalent()
-
-    def on_slow_run(self):
-        """הרצה איטית - toggle"""
-        if self.slow_running:
-            # Stop
-            if self.after_id:
-                self.after_cancel(self.after_id)
-                self.after_id = None
-            self.slow_running = False
-            self.slow_run_btn.config(text="⏯ הרצה איטית")
+                for job in iter_jobs(src):
+                    write(run_job(job, engine, max_steps, cache, verify, detect_loops, limits))
+            finally:
+                cache.close()
+            counts["cache_hits"], counts["cache_misses"] = cache.hits, cache.misses
         else:
-            # Start
-            self.slow_running = True
-            self.slow_run_btn.config(text="⏸ עצור")
+            def collect(future):
+                results, hits, misses = future.result()
+                counts["cache_hits"] += hits
+                counts["cache_misses"] += misses
+                for result in results:
+                    write(result)
+
+            # worker קבוע לכל chunk (pool של תהליך אחד, FIFO): כך ה-parent יודע אילו
+            # קודים כבר נמצאים אצל כל worker, וכל קוד נשלח לכל worker פעם אחת
+            pools = [ProcessPoolExecutor(max_workers=1) for _ in range(workers)]
+            sent: List["OrderedDict[str, Any]"] = [OrderedDict() for _ in range(workers)]
             try:
-                delay = int(self.delay_var.get().strip() or "150")
-                if delay < 50:
-                    delay = 50
-                elif delay > 1000:
-                    delay = 1000
-            except ValueError:
-                delay = 150
-            self._slow_run_step(delay)
-
-    def _slow_run_step(self, delay):
-        """צעד אחד בהרצה איטית"""
-        if not self.slow_running:
-            return
-
-        try:
-            self.on_step()
-            if self.stepper is None:
-                # Program ended or error
-                self.slow_running = False
-                self.slow_run_btn.config(text="⏯ הרצה איטית")
-            else:
-                self.after_id = self.after(delay, lambda: self._slow_run_step(delay))
-        except Exception:
-            self.slow_running = False
-            self.slow_run_btn.config(text="⏯ הרצה איטית")
-
-    def highlight_current_line(self, line_no):
-        """הדגשת שורה נוכחית"""
-        self.code.tag_remove("currentline", "1.0", "end")
-        if line_no:
-            self.code.tag_add("currentline", f"{line_no}.0", f"{line_no}.end")
-            self.code.see(f"{line_no}.0")
-
-    def update_task_card(self):
-        """עדכון כרטיס המשימה"""
-        content = self.code.get("1.0", "end")
-        lines = content.splitlines()
-        task_text = "(אין משימה בקוד הנוכחי)"
-        for line in lines:
-            if line.strip().startswith("; משימה:"):
-                task_text = line.strip()[9:].strip()  # Remove "; משימה:"
-                break
-        self.task_label.config(text=task_text)
-
-    def update_python_equivalent(self, op: str = None, args: List[str] = None):
-        """עדכון כרטיס הקוד Python המקביל - מציג את כל התוכנית מתורגמת ל-Python"""
-        self.python_text.config(state="normal")
-        self.python_text.delete("1.0", "end")
-        
-        # קרא את כל הקוד מהעורך
-        program_text = self.code.get("1.0", "end-1c")
-        
-        if not program_text.strip():
-            self.python_text.insert("1.0", "# הקוד Python יופיע כאן כשתריץ צעד")
-            self.python_text.config(state="disabled")
-            return
-        
-        try:
-            # פרסר את התוכנית
-            instructions, labels = parse_program(program_text)
-            
-            if not instructions:
-                self.python_text.insert("1.0", "# אין פקודות בקוד")
-                self.python_text.config(state="disabled")
-                return
-            
-            # תרגם כל פקודה ל-Python - רק את הקוד, ללא הערות
-            python_lines = []
-            
-            for op, args, raw, line_no in instructions:
-                # תרגם את הפקודה
-                python_code = get_python_equivalent(op, args)
-                python_lines.append(python_code)
-            
-            # הצג את כל הקוד Python בלבד
-            full_code = "\n".join(python_lines)
-            self.python_text.insert("1.0", full_code)
-            
-        except Exception as e:
-            self.python_text.insert("1.0", f"# שגיאה בתרגום: {e}")
-        
-        self.python_text.config(state="disabled")
-
-    def update_right_cards(self, machine: Machine):
-        """עדכון כל הכרטיסים הימניים"""
-        # Registers
-        for reg in ["R1", "R2", "R3", "L1"]:
-            if reg == "L1":
-                value = machine.L1
-            else:
-                value = machine.regs[reg]
-            self.reg_labels[reg].config(text=str(value))
-
-        # Flags
-        for flag_name, lbl in self.flag_labels.items():
-            is_set = machine.flags[flag_name]
-            lbl.config(text="כן" if is_set else "לא",
-                      fg=self.colors['flag_on'] if is_set else self.colors['flag_off'])
-
-        # Stacks
-        self.stack1_listbox.delete(0, "end")
-        for val in reversed(machine.stacks["S1"]):
-            self.stack1_listbox.insert(0, str(val))
-
-        self.stack2_listbox.delete(0, "end")
-        for val in reversed(machine.stacks["S2"]):
-            self.stack2_listbox.insert(0, str(val))
-
-        self.c1_label.config(text=str(len(machine.stacks["S1"])))
-        self.c2_label.config(text=str(len(machine.stacks["S2"])))
-
-        # Memory (LIST)
-        for i in range(33):
-            item = self.mem_tree.get_children()[i]
-            self.mem_tree.item(item, values=(str(machine.LIST[i]),))
-
-        # Output preview
-        self.out_preview.config(state="normal")
-        self.out_preview.delete("1.0", "end")
-        if machine.output:
-            preview = machine.output[-20:]  # Last 20 values
-            self.out_preview.insert("1.0", "\n".join(str(x) for x in preview))
+                pending = deque()
+                for n, (sources, items) in enumerate(iter_chunks(iter_jobs(src), chunk_size)):
+                    w = n % workers
+                    pending.append(pools[w].submit(_run_chunk, ship_sources(sources, sent[w]), items, engine,
+                                                   max_steps, cache_path, verify, detect_loops, limits))
+                    # חסימה על ה-chunk הוותיק שומרת על סדר הקלט ועל זיכרון חסום
+                    while len(pending) > 2 * workers:
+                        collect(pending.popleft())
+                while pending:
+                    collect(pending.popleft())
+            finally:
+                for pool in pools:
+                    pool.shutdown()
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
         else:
-            self.out_preview.insert("1.0", "(אין פלט)")
-        self.out_preview.config(state="disabled")
-
-    def next_example(self):
-        """עבור לתרגיל הבא"""
-        if self.current_level is None or self.current_example is None:
-            return
-        
-        level_examples = list(EXAMPLES.get(self.current_level, {}).keys())
-        if not level_examples:
-            return
-        
-        try:
-            current_index = level_examples.index(self.current_example)
-            if current_index < len(level_examples) - 1:
-                # יש תרגיל הבא באותה רמה
-                next_example = level_examples[current_index + 1]
-                self.load_example(self.current_level, next_example)
-            else:
-                # עבור לרמה הבאה
-                all_levels = list(EXAMPLES.keys())
-                current_level_index = all_levels.index(self.current_level)
-                if current_level_index < len(all_levels) - 1:
-                    next_level = all_levels[current_level_index + 1]
-                    next_level_examples = list(EXAMPLES[next_level].keys())
-                    if next_level_examples:
-                        self.load_example(next_level, next_level_examples[0])
-        except (ValueError, IndexError):
-            pass
-
-    def prev_example(self):
-        """עבור לתרגיל הקודם"""
-        if self.current_level is None or self.current_example is None:
-            return
-        
-        level_examples = list(EXAMPLES.get(self.current_level, {}).keys())
-        if not level_examples:
-            return
-        
-        try:
-            current_index = level_examples.index(self.current_example)
-            if current_index > 0:
-                # יש תרגיל קודם באותה רמה
-                prev_example = level_examples[current_index - 1]
-                self.load_example(self.current_level, prev_example)
-            else:
-                # עבור לרמה הקודמת
-                all_levels = list(EXAMPLES.keys())
-                current_level_index = all_levels.index(self.current_level)
-                if current_level_index > 0:
-                    prev_level = all_levels[current_level_index - 1]
-                    prev_level_examples = list(EXAMPLES[prev_level].keys())
-                    if prev_level_examples:
-                        # טען את התרגיל האחרון ברמה הקודמת
-                        self.load_example(prev_level, prev_level_examples[-1])
-        except (ValueError, IndexError):
-            pass
-
-    def _update_navigation_buttons(self):
-        """עדכון מצב כפתורי הניווט"""
-        if self.current_level is None or self.current_example is None:
-            self.prev_example_btn.config(state="disabled")
-            self.next_example_btn.config(state="disabled")
-            return
-        
-        # בדוק אם יש תרגיל קודם
-        level_examples = list(EXAMPLES.get(self.current_level, {}).keys())
-        all_levels = list(EXAMPLES.keys())
-        
-        has_prev = False
-        has_next = False
-        
-        try:
-            current_index = level_examples.index(self.current_example)
-            current_level_index = all_levels.index(self.current_level)
-            
-            # בדוק אם יש תרגיל קודם
-            if current_index > 0:
-                has_prev = True
-            elif current_level_index > 0:
-                has_prev = True  # יש רמה קודמת
-            
-            # בדוק אם יש תרגיל הבא
-            if current_index < len(level_examples) - 1:
-                has_next = True
-            elif current_level_index < len(all_levels) - 1:
-                has_next = True  # יש רמה הבאה
-        except (ValueError, IndexError):
-            pass
-        
-        self.prev_example_btn.config(state="normal" if has_prev else "disabled")
-        self.next_example_btn.config(state="normal" if has_next else "disabled")
-
-    def _create_guide_section(self, parent, section):
-        """יצירת סקציה מעוצבת במדריך"""
-        # Section card
-        card = tk.Frame(parent, bg=section.get("color", "#ffffff"), 
-                       relief=tk.RAISED, bd=2)
-        card.pack(fill="x", pady=10)
-        
-        # Header
-        header = tk.Frame(card, bg=section.get("color", "#ffffff"))
-        header.pack(fill="x", padx=15, pady=(15, 10))
-        
-        icon_title = tk.Label(header, text=section["title"], 
-                             font=("Arial", 16, "bold"),
-                             bg=section.get("color", "#ffffff"),
-                             fg="#212121")
-        icon_title.pack(anchor="w")
-        
-        # Separator
-        sep = tk.Frame(card, height=2, bg="#BDBDBD")
-        sep.pack(fill="x", padx=15, pady=5)
-        
-        # Content
-        content_frame = tk.Frame(card, bg=section.get("color", "#ffffff"))
-        content_frame.pack(fill="x", padx=15, pady=(5, 15))
-        
-        # Simple content
-        if "content" in section:
-            content_label = tk.Label(content_frame, text=section["content"],
-                                    font=("Arial", 11),
-                                    bg=section.get("color", "#ffffff"),
-                                    fg="#424242", justify="right", wraplength=850)
-            content_label.pack(anchor="e", pady=5)
-        
-        # Items list
-        if "items" in section:
-            for title, desc in section["items"]:
-                item_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
-                item_frame.pack(fill="x", pady=8, anchor="e")
-                
-                title_lbl = tk.Label(item_frame, text=title,
-                                   font=("Arial", 11, "bold"),
-                                   bg=section.get("color", "#ffffff"),
-                                   fg="#1976D2")
-                title_lbl.pack(anchor="e")
-                
-                desc_lbl = tk.Label(item_frame, text=desc,
-                                  font=("Arial", 10),
-                                  bg=section.get("color", "#ffffff"),
-                                  fg="#616161", justify="right")
-                desc_lbl.pack(anchor="e", padx=20)
-        
-        # Code examples
-        if "code_examples" in section:
-            for title, code in section["code_examples"]:
-                example_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
-                example_frame.pack(fill="x", pady=8, anchor="e")
-                
-                title_lbl = tk.Label(example_frame, text=title,
-                                   font=("Arial", 11, "bold"),
-                                   bg=section.get("color", "#ffffff"),
-                                   fg="#1976D2")
-                title_lbl.pack(anchor="e")
-                
-                code_frame = tk.Frame(example_frame, bg="#2E3440", relief=tk.SOLID, bd=1)
-                code_frame.pack(fill="x", pady=5)
-                
-                code_lbl = tk.Label(code_frame, text=code,
-                                  font=("Courier New", 10),
-                                  bg="#2E3440", fg="#A3BE8C",
-                                  justify="left", padx=10, pady=8)
-                code_lbl.pack(anchor="w")
-        
-        # Full example
-        if section.get("full_example"):
-            code_frame = tk.Frame(content_frame, bg="#2E3440", relief=tk.SOLID, bd=1)
-            code_frame.pack(fill="x", pady=10)
-            
-            code_lbl = tk.Label(code_frame, text=section["content"],
-                              font=("Courier New", 11),
-                              bg="#2E3440", fg="#A3BE8C",
-                              justify="left", padx=15, pady=12)
-            code_lbl.pack(anchor="w")
-        
-        # Tips list
-        if "tips" in section:
-            for icon, tip in section["tips"]:
-                tip_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
-                tip_frame.pack(fill="x", pady=5, anchor="e")
-                
-                tip_lbl = tk.Label(tip_frame, text=f"{icon} {tip}",
-                                 font=("Arial", 11),
-                                 bg=section.get("color", "#ffffff"),
-                                 fg="#424242")
-                tip_lbl.pack(anchor="e")
-        
-        # Steps
-        if "steps" in section:
-            for icon, title, desc in section["steps"]:
-                step_frame = tk.Frame(content_frame, bg=section.get("color", "#ffffff"))
-                step_frame.pack(fill="x", pady=8, anchor="e")
-                
-                step_header = tk.Label(step_frame, text=f"{icon} {title}",
-                                     font=("Arial", 12, "bold"),
-                                     bg=section.get("color", "#ffffff"),
-                                     fg="#1976D2")
-                step_header.pack(anchor="e")
-                
-                step_desc = tk.Label(step_frame, text=desc,
-                                   font=("Arial", 10),
-                                   bg=section.get("color", "#ffffff"),
-                                   fg="#616161")
-                step_desc.pack(anchor="e", padx=30)
-
-    def show_beginner_guide(self):
-        """מדריך מקיף למתחיל עם UI מעוצב"""
-        win = tk.Toplevel(self)
-        win.title("📘 מדריך למתחיל - Assembly Studio")
-        win.geometry("1000x700")
-        win.configure(bg='#f5f5f5')
-        
-        # Header
-        header = tk.Frame(win, bg='#1976D2', height=80)
-        header.pack(fill="x")
-        header.pack_propagate(False)
-        
-        title_label = tk.Label(header, text="📘 מדריך למתחיל", 
-                              font=("Arial", 24, "bold"), 
-                              bg='#1976D2', fg='white')
-        title_label.pack(pady=20)
-        
-        subtitle = tk.Label(header, text="למד Assembly בצורה אינטראקטיבית וידידותית",
-                           font=("Arial", 11),
-                           bg='#1976D2', fg='#E3F2FD')
-        subtitle.pack()
-        
-        # Main content frame with canvas for scrolling
-        main_frame = tk.Frame(win, bg='#f5f5f5')
-        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        canvas = tk.Canvas(main_frame, bg='#f5f5f5', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg='#f5f5f5')
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Mouse wheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        # Content sections
-        sections = [
-            {
-                "title": "🎯 מהו Assembly?",
-                "color": "#E3F2FD",
-                "content": """Assembly הוא שפת תכנות ברמה נמוכה שעובדת ישירות עם המעבד.
-בסימולטור הזה, אנחנו לומדים את היסודות של תכנות ברמה נמוכה בצורה אינטראקטיבית וידידותית."""
-            },
-            {
-                "title": "🔧 רכיבי המערכת",
-                "color": "#FFF3E0",
-                "items": [
-                    ("🔢 רגיסטרים (Registers)", "R1, R2, R3 - רגיסטרים כלליים לאחסון מספרים\nL1 - רגיסטר מונה לולאות"),
-                    ("📚 מחסניות (Stacks)", "S1, S2 - מחסניות לאחסון זמני (LIFO)\nC1, C2 - מונים אוטומטיים של גודל המחסניות"),
-                    ("💾 זיכרון (Memory)", "LIST - מערך של 33 תאים (0-32)\nמאותחל עם הערכים 0,1,2...32"),
-                    ("🚩 דגלים (Flags)", "ZERO - דולק כאשר תוצאה שווה ל-0\nNEGATIVE - דולק כאשר תוצאה שלילית"),
-                ]
-            },
-            {
-                "title": "📝 תחביר בסיסי",
-                "color": "#E8F5E9",
-                "code_examples": [
-                    ("פקודה בסיסית", "MOV R1, 5    ; R1 = 5\nADD R1, R2   ; R1 = R1 + R2"),
-                    ("תוויות", "START:           ; תווית למיקום בקוד\nGOTO START       ; קפיצה לתווית"),
-                    ("הערות", "; זו הערה\n# גם זו הערה"),
-                ]
-            },
-            {
-                "title": "⚡ פקודות בסיסיות",
-                "color": "#F3E5F5",
-                "code_examples": [
-                    ("העתקה", "MOV R1, 5        ; R1 = 5\nMOV R1, R2       ; R1 = R2"),
-                    ("אריתמטיקה", "ADD R1, 5        ; R1 = R1 + 5\nSUB R1, 3        ; R1 = R1 - 3\nMUL R1, 2        ; R1 = R1 * 2"),
-                    ("קיצורים", "INC R1           ; R1 = R1 + 1\nDEC R1           ; R1 = R1 - 1\nCLEAR R1         ; R1 = 0"),
-                ]
-            },
-            {
-                "title": "🐍 למידה עם Python",
-                "color": "#E8F5E9",
-                "content": """הכרטיס הירוק "קוד Python מקביל" מציג איך כל פקודת Assembly נראית בפייתון!
-
-השתמש בכפתור "צעד" כדי לראות את התרגום לפייתון של כל שורה.
-זה עוזר להבין בדיוק מה כל פקודה עושה.""",
-                "code_examples": [
-                    ("Assembly → Python", "MOV R1, 42   →   R1 = 42\nADD R1, 8    →   R1 = R1 + 8\nPRINT R1     →   print(R1)"),
-                ]
-            },
-            {
-                "title": "💡 דוגמה ראשונה",
-                "color": "#FFF9C4",
-                "full_example": True,
-                "content": """; משימה: חשב 15 + 27 והדפס את התוצאה
-MOV R1, 15       ; שים 15 ב-R1
-ADD R1, 27       ; הוסף 27 ל-R1 (עכשיו R1 = 42)
-PRINT R1         ; הדפס את התוצאה
-HALT             ; עצור"""
-            },
-            {
-                "title": "✅ טיפים למתחילים",
-                "color": "#C8E6C9",
-                "tips": [
-                    ("✅", "התחל תמיד עם משימות פשוטות"),
-                    ("✅", "השתמש בהערות כדי להסביר מה כל שורה עושה"),
-                    ("✅", "בדוק את הרגיסטרים אחרי כל צעד בעזרת כפתור 'צעד'"),
-                    ("✅", "השתמש ב-PRINT כדי לבדוק ערכים ביניים"),
-                    ("✅", "שים לב לקוד Python המקביל בכרטיס הירוק!"),
-                ]
-            },
-            {
-                "title": "❌ טעויות נפוצות",
-                "color": "#FFCDD2",
-                "tips": [
-                    ("❌", "אל תשכח HALT בסוף התוכנית"),
-                    ("❌", "אל תחלק ב-0"),
-                    ("❌", "שים לב למקום של היעד והמקור (תמיד יעד ראשון!)"),
-                    ("❌", "אל תשכח לאתחל את L1 לפני לולאה"),
-                ]
-            },
-            {
-                "title": "🎓 התקדמות מומלצת",
-                "color": "#E1BEE7",
-                "steps": [
-                    ("1️⃣", "רמה 1: פקודות בסיסיות", "MOV, ADD, SUB, PRINT"),
-                    ("2️⃣", "רמה 2: לולאות ותנאים", "LOOP, IF, GOTO"),
-                    ("3️⃣", "רמה 3: מחסניות וזיכרון", "PUSH, POP, LIST"),
-                ]
-            },
-        ]
-        
-        # Create sections
-        for section in sections:
-            self._create_guide_section(scrollable_frame, section)
-        
-        # Footer with action buttons
-        footer = tk.Frame(win, bg='#f5f5f5', height=70)
-        footer.pack(fill="x", padx=20, pady=(0, 20))
-        footer.pack_propagate(False)
-        
-        btn_frame = tk.Frame(footer, bg='#f5f5f5')
-        btn_frame.pack(expand=True)
-        
-        # Start button
-        start_btn = tk.Button(btn_frame, text="🚀 התחל ללמוד!",
-                             command=lambda: self.load_example("תרגולים - רמה 1", "דוגמה 1: הדפס מספר"),
-                             bg='#4CAF50', fg='white',
-                             font=("Arial", 12, "bold"),
-                             padx=30, pady=12,
-                             cursor="hand2",
-                             relief=tk.RAISED, bd=2)
-        start_btn.pack(side="left", padx=10)
-        
-        # Close button
-        close_btn = tk.Button(btn_frame, text="✓ סגור",
-                             command=win.destroy,
-                             bg='#757575', fg='white',
-                             font=("Arial", 12, "bold"),
-                             padx=30, pady=12,
-                             cursor="hand2",
-                             relief=tk.RAISED, bd=2)
-        close_btn.pack(side="left", padx=10)
-        
-        # Hover effects
-        def on_enter_start(e):
-            start_btn['bg'] = '#45a049'
-        def on_leave_start(e):
-            start_btn['bg'] = '#4CAF50'
-        def on_enter_close(e):
-            close_btn['bg'] = '#616161'
-        def on_leave_close(e):
-            close_btn['bg'] = '#757575'
-        
-        start_btn.bind("<Enter>", on_enter_start)
-        start_btn.bind("<Leave>", on_leave_start)
-        close_btn.bind("<Enter>", on_enter_close)
-        close_btn.bind("<Leave>", on_leave_close)
-        
-        # Cleanup on close
-        def on_closing():
-            canvas.unbind_all("<MouseWheel>")
-            win.destroy()
-        
-        win.protocol("WM_DELETE_WINDOW", on_closing)
-
-    def show_first_lesson(self):
-        """שיעור ראשון עם דוגמאות קוד"""
-        text = """🧾 שיעור ראשון - צעדים ראשונים ב-Assembly
-
-=== שיעור 1: התוכנית הראשונה שלך ===
-
-בואו נכתוב תוכנית שמדפיסה את המספר 42:
-
-; משימה: הדפס 42
-MOV R1, 42       ; שים את המספר 42 ברגיסטר R1
-PRINT R1         ; הדפס את תוכן R1
-HALT             ; עצור את התוכנית
-
-מה קורה כאן?
-1. MOV R1, 42 - שמים את המספר 42 ברגיסטר R1
-2. PRINT R1 - מדפיסים את תוכן R1 (42)
-3. HALT - עוצרים (חובה!)
-
-=== שיעור 2: חיבור שני מספרים ===
-
-; משימה: חשב 10 + 20
-MOV R1, 10       ; R1 = 10
-ADD R1, 20       ; R1 = R1 + 20 = 30
-PRINT R1         ; הדפס 30
-HALT
-
-חשוב! ADD משנה את הרגיסטר הראשון:
-   ADD R1, 20 אומר "הוסף 20 ל-R1"
-
-=== שיעור 3: שימוש ביותר מרגיסטר אחד ===
-
-; משימה: חשב (5 + 3) * 2
-MOV R1, 5        ; R1 = 5
-ADD R1, 3        ; R1 = 8
-MOV R2, 2        ; R2 = 2
-MUL R1, R2       ; R1 = R1 * R2 = 16
-PRINT R1         ; הדפס 16
-HALT
-
-למה השתמשנו ב-R2?
-   כי רצינו לכפול ב-2, ואת ה-2 צריך לשים איפשהו!
-
-=== שיעור 4: העתקה בין רגיסטרים ===
-
-; משימה: העתק ערך מ-R1 ל-R2
-MOV R1, 100      ; R1 = 100
-MOV R2, R1       ; R2 = R1 = 100
-PRINT R2         ; הדפס 100
-HALT
-
-שים לב: MOV R2, R1 אומר "העתק מ-R1 ל-R2"
-   (תמיד: יעד, מקור)
-
-=== שיעור 5: מספר אקראי ===
-
-; משימה: הדפס מספר אקראי
-RAND R1          ; R1 = מספר אקראי בין 0 ל-32
-PRINT R1         ; הדפס אותו
-HALT
-
-כל הרצה תיתן מספר אחר!
-(אלא אם תשתמש ב-Seed זהה)
-
-=== תרגילים לתרגול ===
-
-תרגיל 1: הדפס את התוצאה של 7 * 6
-תרגיל 2: חשב 100 - 35 והדפס
-תרגיל 3: שים 50 ב-R1, 30 ב-R2, והדפס את סכומם
-תרגיל 4: חשב (8 + 2) * 5
-תרגיל 5: צור מספר אקראי, הוסף לו 10, והדפס
-
-=== טיפים חשובים ===
-
-✅ תמיד התחל עם תכנון - מה אני רוצה להשיג?
-✅ השתמש בהערות לתכנן את הצעדים
-✅ השתמש ב"צעד" כדי לראות מה קורה בכל שורה
-✅ השתמש בכרטיס "🐍 קוד Python מקביל" כדי להבין את התרגום של כל פקודה
-✅ אל תשכח HALT!
-
-💡 טיפ: הכרטיס Python עוזר להבין את הלוגיקה של כל פקודה - נסה להשוות בין Assembly ל-Python!
-
-המשך לרמה 2 כשאתה מרגיש בטוח עם הפקודות הבסיסיות!
-"""
-        self._show_help_window("🧾 שיעור ראשון", text, "900x700")
-
-    def show_faq(self):
-        """שאלות נפוצות"""
-        text = """❓ שאלות נפוצות (FAQ)
-
-=== שאלות כלליות ===
-
-ש: מה ההבדל בין Assembly אמיתי לסימולטור הזה?
-ת: זהו סימולטור חינוכי פשוט. Assembly אמיתי הרבה יותר מורכב ותלוי במעבד,
-   אבל העקרונות זהים!
-
-ש: למה התחביר הוא "יעד, מקור" ולא "מקור, יעד"?
-ת: זה התחביר של Intel x86. יש גם ARM שעושה הפוך. בחרנו ב-Intel כי הוא נפוץ יותר.
-
-ש: מה ההבדל בין R1, R2, R3?
-ת: אין! כולם רגיסטרים כלליים. בחר מה שנוח לך.
-
-=== שאלות על פקודות ===
-
-ש: מה קורה אם אני משתמש ב-ADD עם שני רגיסטרים?
-ת: ADD R1, R2 אומר "R1 = R1 + R2"
-   R2 לא משתנה, רק R1!
-
-ש: איך מחסנית עובדת?
-ת: PUSH שם ערך על המחסנית (למעלה)
-   POP מוציא את הערך העליון
-   דוגמה:
-     PUSH R1, S1    ; שים R1 על S1
-     POP R2, S1     ; קח מ-S1 ל-R2
-
-ש: מה זה C1 ו-C2?
-ת: מונים אוטומטיים - כמה ערכים יש במחסנית.
-   C1 = גודל S1
-   C2 = גודל S2
-
-ש: איך משתמשים ב-LIST?
-ת: LIST זה מערך עם 33 תאים (0-32).
-   דוגמאות:
-     MOV R1, 5              ; R1 = 5
-     MOV [LIST+R1], 100     ; LIST[5] = 100
-     MOV R2, [LIST+R1]      ; R2 = LIST[5]
-
-=== שאלות על לולאות ===
-
-ש: איך עושים לולאה?
-ת: 1. שים מספר חזרות ב-L1
-   2. שים תווית בתחילת הלולאה
-   3. בסוף הלולאה: LOOP <תווית>
-   
-   דוגמה:
-     MOV L1, 5
-     START:
-       PRINT R1
-       INC R1
-     LOOP START
-
-ש: למה הלולאה שלי אינסופית?
-ת: בדוק:
-   - האם שמת ערך ב-L1?
-   - האם LOOP מצביע על התווית הנכונה?
-   - האם יש תווית עם : בסוף?
-
-=== שאלות על תנאים ===
-
-ש: איך משתמשים ב-IF?
-ת: IF <משתנה1> <אופרטור> <משתנה2> GOTO <תווית>
-   אופרטורים: ==, !=, >, <, >=, <=
-   
-   דוגמה:
-     IF R1 > R2 GOTO BIGGER
-     PRINT R2
-     GOTO END
-     BIGGER:
-       PRINT R1
-     END:
-       HALT
-
-ש: מה ההבדל בין IF ל-CMP?
-ת: CMP משווה ומעדכן דגלים (ZERO, NEGATIVE)
-   IF קופץ ישירות - יותר נוח לרוב המקרים!
-
-=== שאלות על דיבאגינג ===
-
-ש: איך אני מוצא שגיאות?
-ת: 1. השתמש ב"צעד" כדי לעבור שורה אחרי שורה
-   2. בדוק את הרגיסטרים אחרי כל צעד
-   3. השתמש ב-PRINT להדפיס ערכים ביניים
-   4. קרא את הודעת השגיאה בכרטיסייה "שגיאות"
-
-ש: מה זה "אינדקס LIST מחוץ לטווח"?
-ת: ניסית לגשת ל-LIST[33] או יותר, או למספר שלילי.
-   LIST יש רק אינדקסים 0-32!
-
-ש: מה זה "חילוק באפס"?
-ת: ניסית לחלק ב-0 - זה אסור!
-   בדוק את המחלק לפני DIV או MOD.
-
-=== שאלות על תכונות המערכת ===
-
-ש: מה זה Seed?
-ת: מספר שקובע את הרצף האקראי.
-   אותו Seed = אותם מספרים אקראיים (שימושי לבדיקות!)
-
-ש: מה זה "Max steps"?
-ת: הגנה מפני לולאות אינסופיות.
-   אם התוכנית עוברת 200,000 צעדים - היא נעצרת.
-
-ש: למה לשמור היסטוריה?
-ת: כדי לראות מה קרה בכל צעד.
-   שימושי לדיבאגינג, אבל מאט את ההרצה.
-
-ש: מה זה "הרצה איטית"?
-ת: רואים כל צעד בזמן אמת עם עיכוב.
-   מצוין ללמידה ולהבנה של מה שקורה!
-
-ש: מה זה כרטיס "🐍 קוד Python מקביל"?
-ת: כרטיס שמציג את הקוד Python המקביל לכל פקודת Assembly.
-   עוזר להבין את הלוגיקה של הפקודות ולהשוות בין Assembly ל-Python.
-   מופיע אוטומטית כשאתה משתמש ב"צעד" או "הרצה איטית".
-
-=== עוד שאלות? ===
-
-אם משהו לא ברור, נסה:
-1. לקרוא את המדריך למתחיל
-2. להסתכל על הדוגמאות
-3. להשתמש ב"צעד" כדי לראות מה קורה
-4. לנסות דברים בעצמך - זו הדרך הטובה ביותר ללמוד!
-"""
-        self._show_help_window("❓ שאלות נפוצות", text, "900x700")
-
-    def show_quick_guide(self):
-        text = """מדריך קצר:
-
-- תחביר: יעד ואז ערך/מקור
-  MOV R1, 5     (R1 = 5)
-  ADD R1, 3     (R1 = R1 + 3)
-  ADD R1, R2    (R1 = R1 + R2)
-
-- תוויות: START: ... GOTO START
-- תנאי: IF R1 > R2 GOTO BIG
-- לולאה: MOV L1, 5
-         LOOP START
-- פלט: PRINT R1
-- הערות: ; או #
-"""
-        self._show_help_window("מדריך קצר", text, "700x500")
-
-    def _show_help_window(self, title, text, geometry="800x600"):
-        """פונקציית עזר להצגת חלון עזרה"""
-        win = tk.Toplevel(self)
-        win.title(title)
-        win.geometry(geometry)
-        win.configure(bg=self.colors['bg'])
-
-        frame = tk.Frame(win, bg=self.colors['bg'])
-        frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        box = scrolledtext.ScrolledText(frame, font=("Courier New", 10), wrap="word",
-                                        bg=self.colors['card_bg'], fg=self.colors['text'])
-        box.pack(fill="both", expand=True)
-        box.insert("1.0", text)
-        box.config(state="disabled")
-
-        # Add close button
-        btn_frame = tk.Frame(win, bg=self.colors['bg'])
-        btn_frame.pack(fill="x", padx=10, pady=(0, 10))
-        
-        close_btn = tk.Button(btn_frame, text="✓ סגור", command=win.destroy,
-                             bg=self.colors['primary'], fg='white',
-                             font=("Arial", 10, "bold"), padx=20, pady=5,
-                             cursor="hand2")
-        close_btn.pack(side="right")
-
+            dst.flush()
+    return counts
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Assembly Studio")
+    sub = parser.add_subparsers(dest="command")
+    batch = sub.add_parser("batch", help="run JSONL jobs headless (no GUI)")
+    batch.add_argument("input", help="jobs JSONL file, or - for stdin")
+    batch.add_argument("output", help="results JSONL file, or - for stdout")
+    batch.add_argument("--engine", choices=ENGINES, default="python")
+    batch.add_argument("--max-steps", type=int, default=200000, help="default for jobs without max_steps")
+    batch.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (0 = all cores)")
+    batch.add_argument("--chunk-size", type=int, default=64, help="jobs per worker task")
+    batch.add_argument("--cache", metavar="DB", help="persist results in this SQLite file")
+    batch.add_argument("--verify", action="store_true", help="reject programs with static errors without running them")
+    batch.add_argument("--detect-loops", action="store_true",
+                       help="fail fast with InfiniteLoopError when the machine state repeats")
+    batch.add_argument("--max-stack", type=int, help="StackLimitError above this many values in S1+S2")
+    batch.add_argument("--max-output", type=int, help="OutputLimitError above this many printed values")
+    batch.add_argument("--timeout", type=float, metavar="SEC", help="TimeLimitError after this many seconds per job")
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        start = time.perf_counter()
+        workers = args.jobs or os.cpu_count() or 1
+        counts = run_batch(args.input, args.output, args.engine, args.max_steps, workers, max(1, args.chunk_size),
+                           args.cache, args.verify, args.detect_loops,
+                           Limits(args.max_stack, args.max_output, args.timeout))
+        elapsed = time.perf_counter() - start
+        rate = counts["jobs"] / elapsed if elapsed > 0 else 0.0
+        print(f"{counts['jobs']} jobs: {counts['ok']} ok, {counts['error']} error, {counts['invalid']} invalid, "
+              f"{counts['passed']}/{counts['graded']} passed ({elapsed:.2f}s, {rate:.0f} jobs/s, {workers} workers, "
+              f"cache {counts['cache_hits']} hits / {counts['cache_misses']} misses)", file=sys.stderr)
+        return 0
+
+    from battle_calc_gui import App
+    App().mainloop()
+    return 0
+
+def __getattr__(name: str):
+    # App נטען בעצלות כדי שהרצה headless לא תייבא את tkinter
+    if name == "App":
+        from battle_calc_gui import App
+        return App
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
-    App().mainloop()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import json
+import random
+from collections import OrderedDict
+
+import pytest
+
+import battle_calc_runner as runner
+from battle_calc_runner import iter_chunks, run_batch, run_job, ship_sources
+
+def test_invalid_fields_are_reported_per_job():
+    assert run_job({"program": "PRINT 1", "max_steps": "5"})["status"] == "invalid"
+    assert run_job({"program": "PRINT 1", "max_steps": True})["status"] == "invalid"
+    assert run_job({"program": "PRINT 1", "seed": [1]})["status"] == "invalid"
+    assert run_job({"program": "PRINT 1", "expected": 1})["status"] == "invalid"
+    assert run_job({"program": "PRINT 1", "seed": None, "expected": [1]})["passed"] is True
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_keeps_order_and_survives_bad_jobs(tmp_path, workers):
+    jobs = [
+        {"id": 1, "program": "MOV R1, 2\nPRINT R1\n", "expected": [2]},
+        {"id": 2, "program": "PRINT 1\n", "max_steps": "many"},
+        "not json",
+        {"id": 4, "program": "POP R1, S1\n"},
+        {"id": 5, "program": "PRINT 7\n", "expected": "7"},
+        {"id": 6, "program": "MOV R1, 2\nPRINT R1\n", "expected": [3]},
+    ]
+    src, dst = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    src.write_text("\n".join(j if isinstance(j, str) else json.dumps(j) for j in jobs) + "\n", encoding="utf-8")
+    counts = run_batch(str(src), str(dst), workers=workers, chunk_size=2)
+    results = [json.loads(line) for line in dst.read_text(encoding="utf-8").splitlines()]
+    assert [r["status"] for r in results] == ["ok", "invalid", "invalid", "error", "invalid", "ok"]
+    assert [r.get("passed") for r in results] == [True, None, None, None, None, False]
+    assert counts["jobs"] == 6 and counts["invalid"] == 3 and counts["graded"] == 2
+
+def test_each_worker_gets_each_source_once():
+    jobs = [{"id": i, "program": f"PRINT {i % 3}\n"} for i in range(12)]
+    sent = [OrderedDict(), OrderedDict()]
+    shipped = [[], []]
+    for n, (sources, _) in enumerate(iter_chunks(iter(jobs), 2)):
+        shipped[n % 2] += [program for _, program in ship_sources(sources, sent[n % 2]) if program]
+    assert [sorted(texts) for texts in shipped] == [["PRINT 0\n", "PRINT 1\n", "PRINT 2\n"]] * 2
+
+def test_worker_memo_evicts_like_parent(monkeypatch):
+    monkeypatch.setattr(runner, "SOURCE_MEMO_SIZE", 3)
+    monkeypatch.setattr(runner, "_worker_sources", OrderedDict())
+    rng = random.Random(8)
+    jobs = [{"id": i, "program": f"PRINT {rng.randrange(6)}\n"} for i in range(200)]
+    sent = OrderedDict()
+    for sources, items in iter_chunks(iter(jobs), 2):
+        results, _, _ = runner._run_chunk(ship_sources(sources, sent), items, "closure", 100, None,
+                                          False, False, None)
+        assert [r["output"] for r in results] == [[int(sources[src][1][6])] for _, src in items]
+        assert list(runner._worker_sources) == list(sent)
+
+def test_workers_resolve_sources_sent_by_hash(tmp_path):
+    src, dst = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    jobs = [{"id": i, "program": f"MOV R1, {i % 3}\nPRINT R1\n", "expected": [i % 3]} for i in range(60)]
+    src.write_text("\n".join(json.dumps(j) for j in jobs) + "\n", encoding="utf-8")
+    counts = run_batch(str(src), str(dst), workers=3, chunk_size=2)
+    results = [json.loads(line) for line in dst.read_text(encoding="utf-8").splitlines()]
+    assert [r["id"] for r in results] == list(range(60))
+    assert counts["passed"] == 60
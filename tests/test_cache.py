@@ -0,0 +1,79 @@
+import threading
+
+from battle_calc_runner import InfiniteLoopError, Limits, ResultCache, RunCancelledError, RunResult, execute
+
+LOOP = "MOV R1, 1\nA:\nGOTO A\n"
+
+def test_hit_after_miss_ignores_comments_and_spacing():
+    cache = ResultCache()
+    first = cache.execute("MOV R1, 3\nPRINT R1\n")
+    second = cache.execute("MOV R1,3 ; three\n\nPRINT   R1\n")
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+    assert second.machine.output == first.machine.output == [3]
+    assert second.steps == first.steps == 2
+
+def test_seed_is_part_of_the_key_only_with_rand():
+    cache = ResultCache()
+    cache.execute("PRINT 1\n", seed=1)
+    cache.execute("PRINT 1\n", seed=2)
+    cache.execute("RAND R1\nPRINT R1\n", seed=1)
+    cache.execute("RAND R1\nPRINT R1\n", seed=2)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+def test_rand_without_seed_is_a_counted_miss():
+    cache = ResultCache()
+    for _ in range(3):
+        cache.execute("RAND R1\nPRINT R1\n")
+    assert cache.stats() == {"hits": 0, "misses": 3, "size": 0}
+
+def test_error_line_is_remapped_to_the_callers_program():
+    cache = ResultCache()
+    cache.execute("MOV R1, 0\nPOP R2, S1\n")
+    result = cache.execute("; header\n\nMOV R1, 0\nPOP R2, S1\n")
+    assert cache.hits == 1
+    assert (result.error.line_no, result.error.raw_line) == (4, "POP R2, S1")
+
+def test_infinite_loop_message_matches_remapped_line():
+    cache = ResultCache()
+    first = cache.execute(LOOP, detect_loops=True)
+    assert isinstance(first.error, InfiniteLoopError)
+    again = cache.execute("; moved down\n" + LOOP, detect_loops=True)
+    assert cache.hits == 1
+    assert isinstance(again.error, InfiniteLoopError)
+    assert again.error.line_no == first.error.line_no + 1
+    assert str(again.error) == str(execute("; moved down\n" + LOOP, detect_loops=True).error)
+    assert again.error.steps == again.steps == first.steps
+
+def test_detect_loops_and_limits_are_part_of_the_key():
+    cache = ResultCache()
+    cache.execute(LOOP, max_steps=500)
+    cache.execute(LOOP, max_steps=500, detect_loops=True)
+    cache.execute("PUSH R1, S1\n", limits=Limits(max_stack=0))
+    cache.execute("PUSH R1, S1\n")
+    assert (cache.hits, cache.misses) == (0, 4)
+
+def test_lookup_and_store():
+    cache = ResultCache()
+    assert cache.lookup("PRINT 5\n") is None
+    cache.store("PRINT 5\n", execute("PRINT 5\n"))
+    assert cache.lookup("PRINT 5 ; again\n").machine.output == [5]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_cancelled_runs_are_not_stored():
+    cache = ResultCache()
+    cancel = threading.Event()
+    cancel.set()
+    result = cache.execute(LOOP, limits=Limits(cancel=cancel))
+    assert isinstance(result.error, RunCancelledError)
+    cache.store(LOOP, RunResult(result.machine, result.steps, result.error))
+    assert cache.stats()["size"] == 0
+
+def test_sqlite_backing_survives_a_new_instance(tmp_path):
+    db = str(tmp_path / "results.db")
+    cache = ResultCache(db_path=db)
+    cache.execute("MOV R1, 4\nPRINT R1\n")
+    cache.close()
+    cache = ResultCache(db_path=db)
+    result = cache.execute("MOV R1, 4\nPRINT R1\n")
+    cache.close()
+    assert cache.hits == 1 and result.machine.output == [4]
@@ -0,0 +1,107 @@
+"""
+השוואה דיפרנציאלית: כל מנוע של Executor.run() מול הרצה צעד-צעד (step(), הבסיס
+של run_program_steps) - פלט, צעדים, ip, רגיסטרים, מחסניות, LIST, דגלים ושגיאה.
+"""
+import random
+
+import pytest
+
+from battle_calc_runner import ENGINES, AsmError, Executor, load_program
+
+REGS = ["R1", "R2", "R3"]
+VALUES = ["R1", "R2", "R3", "L1", "C1", "C2", "0", "1", "2", "5", "-3", "7"]
+LISTS = ["[LIST+R1]", "[LIST+R2]", "[LIST+5]", "[LIST+L1]", "[LIST+40]", "[LIST+0]", "[LIST+32]"]
+CMPS = ["==", "!=", ">", "<", ">=", "<="]
+
+def random_line(rng: random.Random) -> str:
+    op = rng.choice(["MOV", "MOV", "ADD", "SUB", "MUL", "DIV", "MOD", "INC", "DEC", "CLEAR", "SWAP", "PUSH",
+                     "POP", "RAND", "PRINT", "PRINT", "CMP", "JZ", "JNZ", "GOTO", "IF", "LOOP", "HALT", "NOP"])
+    reg, value, label = rng.choice(REGS), rng.choice(VALUES), rng.choice("AB")
+    if op == "MOV":
+        dst = rng.choice(REGS + ["L1", "[LIST+R3]", "[LIST+3]"])
+        return f"MOV {dst}, {rng.choice(LISTS) if rng.random() < 0.3 else value}"
+    if op in ("ADD", "SUB", "MUL", "DIV", "MOD"):
+        return f"{op} {reg}, {rng.choice(LISTS) if rng.random() < 0.1 else value}"
+    if op in ("INC", "DEC", "CLEAR", "RAND"):
+        return f"{op} {reg}"
+    if op == "SWAP":
+        return f"SWAP {reg}, {rng.choice(REGS)}"
+    if op in ("PUSH", "POP"):
+        return f"{op} {reg}, {rng.choice(['S1', 'S2'])}"
+    if op == "PRINT":
+        return f"PRINT {rng.choice(LISTS) if rng.random() < 0.2 else value}"
+    if op == "CMP":
+        return f"CMP {value}, {rng.choice(VALUES)}"
+    if op in ("JZ", "JNZ", "GOTO", "LOOP"):
+        return f"{op} {label}"
+    if op == "IF":
+        return f"IF {value} {rng.choice(CMPS)} {rng.choice(VALUES)} GOTO {label}"
+    return op
+
+def random_program(rng: random.Random) -> str:
+    lines = [random_line(rng) for _ in range(rng.randint(1, 20))]
+    for label in ("A:", "B:"):
+        lines.insert(rng.randint(0, len(lines)), label)
+    return "\n".join(lines) + "\n"
+
+def state(ex: Executor, error, ip: int):
+    m = ex.machine
+    err = None if error is None else (type(error).__name__, str(error), error.line_no)
+    return (list(m.output), ex.steps, ip, list(m.r), m.L1, [list(s) for s in m.s], list(m.LIST),
+            m.zero, m.negative, err)
+
+def reference(text: str, seed: int, max_steps: int):
+    ex = Executor(load_program(text), seed, max_steps)
+    last = None
+    try:
+        while True:
+            rec = ex.step()
+            if rec is None:
+                return state(ex, None, ex.ip)
+            last = rec
+    except AsmError as e:
+        # שגיאה של IF_ERROR עולה בצעד שאחרי ההוראה; אחרת ip נשאר על ההוראה שנכשלה
+        return state(ex, e, last[1] if ex.ip == -1 else ex.ip)
+
+def engine_run(text: str, seed: int, max_steps: int, engine: str):
+    ex = Executor(load_program(text), seed, max_steps)
+    try:
+        ex.run(engine=engine)
+    except AsmError as e:
+        return state(ex, e, ex.ip)
+    return state(ex, None, ex.ip)
+
+def programs(count: int, seed: int):
+    rng = random.Random(seed)
+    out = []
+    while len(out) < count:
+        text = random_program(rng)
+        try:
+            load_program(text)
+        except AsmError:
+            continue
+        out.append((text, rng.randrange(1000), rng.choice([5, 40, 300])))
+    return out
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_match_stepping(engine):
+    for text, seed, max_steps in programs(400, 1):
+        assert engine_run(text, seed, max_steps, engine) == reference(text, seed, max_steps), text
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_runtime_error_keeps_exact_state(engine):
+    text = "PRINT 1\nMUL R1, 5\nDEC R2\nDIV R3, R1\nHALT\n"
+    result = engine_run(text, 4, 50, engine)
+    assert result == reference(text, 4, 50)
+    output, steps, ip, *_, zero, negative, err = result
+    assert (output, steps, ip, zero, negative) == ([1], 4, 3, False, True)
+    assert err[2] == 4
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_failing_programs_match(engine):
+    failing = 0
+    for text, seed, max_steps in programs(400, 2):
+        expected = reference(text, seed, max_steps)
+        failing += expected[-1] is not None
+        assert engine_run(text, seed, max_steps, engine) == expected, text
+    assert failing > 100
@@ -0,0 +1,92 @@
+"""
+ExecutionHistory מול רשימת dict פשוטה: ring buffer, spill לקובץ, מעבר ל-int גדול,
+truncate, והקצאה עצלה ב-Machine.
+"""
+import json
+import random
+
+import pytest
+
+from battle_calc_runner import Executor, ExecutionHistory, Machine, load_program
+
+def row(m: Machine, step: str):
+    return {"step": step, "R1": m.r[0], "R2": m.r[1], "R3": m.r[2], "L1": m.L1,
+            "C1": len(m.s[0]), "C2": len(m.s[1]), "S1": list(m.s[0]), "S2": list(m.s[1]),
+            "ZERO": m.zero, "NEGATIVE": m.negative}
+
+def mutate(m: Machine, rng: random.Random):
+    k = rng.randrange(2)
+    op = rng.randrange(6)
+    if op == 0:
+        m.s[k].append(rng.randrange(-50, 50))
+    elif op == 1 and m.s[k]:
+        m.s[k].pop()
+    elif op == 2:
+        m.s[k] = [rng.randrange(10) for _ in range(rng.randrange(4))]
+    elif op == 3:
+        m.r[rng.randrange(3)] = rng.choice([rng.randrange(-100, 100), 2 ** 70, -(2 ** 64)])
+    else:
+        m.r[rng.randrange(3)] = rng.randrange(-100, 100)
+        m.L1 = rng.randrange(10)
+    m.zero, m.negative = rng.random() < 0.5, rng.random() < 0.5
+
+def fill(h: ExecutionHistory, rows: int, seed: int):
+    rng, m, expected = random.Random(seed), Machine(), []
+    for i in range(rows):
+        mutate(m, rng)
+        step = f"step {i % 5}"
+        h.append(step, m)
+        expected.append(row(m, step))
+    return expected
+
+@pytest.mark.parametrize("capacity", [None, 1, 7, 64])
+def test_rows_match(capacity):
+    h = ExecutionHistory(capacity)
+    expected = fill(h, 300, 1)
+    kept = expected if capacity is None else expected[-capacity:]
+    assert h.total == 300 and len(h) == len(kept)
+    assert list(h) == kept
+    assert h[-1] == kept[-1] and h[0] == kept[0]
+    assert h[2:5] == kept[2:5]
+    for name in ExecutionHistory.COLUMNS:
+        assert h.column(name) == [r[name] for r in kept]
+    with pytest.raises(IndexError):
+        h[len(kept)]
+
+def test_spill_keeps_dropped_rows(tmp_path):
+    path = tmp_path / "spill.jsonl"
+    h = ExecutionHistory(10, str(path))
+    expected = fill(h, 95, 2)
+    h.close()
+    spilled = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert spilled + list(h) == expected
+
+@pytest.mark.parametrize("capacity", [None, 8])
+def test_truncate(capacity):
+    h = ExecutionHistory(capacity)
+    expected = fill(h, 40, 3)
+    h.truncate(35)
+    kept = expected[:35] if capacity is None else expected[35 - 3:35]
+    assert h.total == 35 and list(h) == kept
+    # אחרי truncate המחסניות נבנות מחדש גם כשהרשימות הן אותם אובייקטים
+    m = Machine()
+    m.s[0].extend([1, 2])
+    h.append("after", m)
+    assert h[-1] == row(m, "after")
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        ExecutionHistory(0)
+
+def test_history_is_allocated_lazily():
+    m = Machine(1)
+    assert m._history is None and m.copy()._history is None
+    program = load_program("MOV R1, 3\nA:\nPUSH R1, S1\nDEC R1\nJNZ A\n")
+    ex = Executor(program, None, 100, undo_limit=10)
+    while ex.step() is not None:
+        pass
+    assert ex.machine._history is None
+    ex = Executor(program, None, 100, save_history=True)
+    ex.run()
+    assert len(ex.machine.execution_history) == ex.steps
+    assert ex.machine.execution_history[-1]["S1"] == [3, 2, 1]
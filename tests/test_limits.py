@@ -0,0 +1,58 @@
+"""
+Limits בכל מנוע: שגיאת מגבלה עולה בגבול בין הוראות, ו-ip, steps והמכונה
+זהים למצב של הרצה צעד-צעד אחרי אותו מספר צעדים.
+"""
+import threading
+
+import pytest
+
+from battle_calc_runner import (ENGINES, Executor, Limits, OutputLimitError,
+                                RunCancelledError, StackLimitError, load_program)
+
+from test_engines import programs, state
+
+def stepped(text: str, seed: int, steps: int):
+    ex = Executor(load_program(text), seed, steps + 1)
+    while ex.steps < steps:
+        ex.step()
+    return state(ex, None, ex.ip)
+
+def limited(text: str, seed: int, engine: str, limits: Limits, error_type):
+    ex = Executor(load_program(text), seed, 10 ** 6, limits=limits)
+    with pytest.raises(error_type):
+        ex.run(engine=engine)
+    return state(ex, None, ex.ip)
+
+# שרשרת ארוכה בגוף הלולאה: בדיקת המגבלות נופלת על ראש השרשרת
+CHAIN_LOOP = "A:\nPUSH R1, S1\nINC R1\nMOV R2, R1\nADD R3, 2\nPRINT R1\nGOTO A\n"
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("limits, error_type", [
+    (Limits(max_stack=100), StackLimitError),
+    (Limits(max_output=100), OutputLimitError),
+])
+def test_limit_error_keeps_exact_state(engine, limits, error_type):
+    result = limited(CHAIN_LOOP, 0, engine, limits, error_type)
+    assert result == stepped(CHAIN_LOOP, 0, result[1])
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cancel_keeps_exact_state(engine):
+    cancel = threading.Event()
+    cancel.set()
+    result = limited(CHAIN_LOOP, 0, engine, Limits(cancel=cancel), RunCancelledError)
+    assert result == stepped(CHAIN_LOOP, 0, result[1])
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_random_programs_under_limits(engine):
+    limits = Limits(max_stack=3, max_output=4)
+    checked = 0
+    for text, seed, _ in programs(300, 5):
+        ex = Executor(load_program(text), seed, 20000, limits=limits)
+        try:
+            ex.run(engine=engine)
+        except (StackLimitError, OutputLimitError):
+            checked += 1
+            assert state(ex, None, ex.ip) == stepped(text, seed, ex.steps), text
+        except Exception:
+            pass
+    assert checked > 10
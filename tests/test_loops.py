@@ -0,0 +1,44 @@
+"""
+detect_loops: תוכנית שסומנה כלולאה אינסופית באמת לא מסתיימת, ותוכנית שלא
+סומנה רצה בדיוק כמו בלי הזיהוי.
+"""
+import re
+
+import pytest
+
+from battle_calc_runner import MAX_STEPS_MSG, AsmError, Executor, InfiniteLoopError, load_program
+
+from test_engines import programs, state
+
+def outcome(text: str, seed: int, max_steps: int, detect_loops: bool):
+    ex = Executor(load_program(text), seed, max_steps, detect_loops=detect_loops)
+    try:
+        ex.run()
+    except AsmError as e:
+        return state(ex, e, ex.ip), e
+    return state(ex, None, ex.ip), None
+
+def test_detected_loops_never_terminate():
+    detected = 0
+    for text, seed, _ in programs(400, 7):
+        result, error = outcome(text, seed, 20000, True)
+        plain, plain_error = outcome(text, seed, 20000, False)
+        if isinstance(error, InfiniteLoopError):
+            detected += 1
+            assert str(plain_error) == MAX_STEPS_MSG, text
+            assert error.steps == result[1] < 20000
+        else:
+            assert result == plain, text
+    assert detected > 10
+
+def test_reports_line_and_steps():
+    text = "MOV R1, 5\nA:\nINC R1\nDEC R1\nGOTO A\n"
+    with pytest.raises(InfiniteLoopError) as info:
+        Executor(load_program(text), None, 10 ** 6, detect_loops=True).run()
+    assert info.value.line_no == 5 and info.value.raw_line == "GOTO A"
+    assert info.value.steps < 100
+
+def test_rand_programs_are_not_checked():
+    text = "A:\nRAND R1\nCLEAR R1\nGOTO A\n"
+    with pytest.raises(AsmError, match=re.escape(MAX_STEPS_MSG)):
+        Executor(load_program(text), 1, 5000, detect_loops=True).run()
@@ -0,0 +1,57 @@
+"""
+step_back(): כל צעד שבוטל מחזיר בדיוק את המצב שלפניו, כולל rng ו-execution_history,
+והרצה מחדש אחרי ביטול נותנת את אותו המשך.
+"""
+from battle_calc_runner import AsmError, Executor, load_program
+
+from test_engines import programs
+
+def snap(ex: Executor):
+    m = ex.machine
+    return (list(m.output), ex.steps, ex.ip, list(m.r), m.L1, [list(s) for s in m.s], list(m.LIST),
+            m.zero, m.negative, m.rng.getstate(), m.execution_history.total)
+
+def walk(ex: Executor, limit: int):
+    """מצבים לפני כל צעד שהצליח, ומצב הסיום"""
+    states = []
+    for _ in range(limit):
+        before = snap(ex)
+        try:
+            if ex.step() is None:
+                break
+        except AsmError:
+            assert snap(ex) == before  # צעד שנכשל לא משאיר שינוי
+            break
+        states.append(before)
+    return states, snap(ex)
+
+def test_step_back_restores_every_state():
+    for text, seed, max_steps in programs(200, 3):
+        ex = Executor(load_program(text), seed, max_steps, save_history=True, undo_limit=10000)
+        states, _ = walk(ex, 10000)
+        for before in reversed(states):
+            assert ex.step_back(), text
+            assert snap(ex) == before, text
+        assert not ex.step_back()
+
+def test_replay_after_step_back_matches():
+    for text, seed, max_steps in programs(200, 4):
+        ex = Executor(load_program(text), seed, max_steps, undo_limit=10000)
+        states, final = walk(ex, 10000)
+        for _ in range(len(states) // 2):
+            ex.step_back()
+        assert walk(ex, 10000)[1] == final, text
+
+def test_rand_undo_across_marks():
+    text = "A:\nRAND R1\nPRINT R1\nLOOP A\n"
+    ex = Executor(load_program(text), 7, 5000, undo_limit=5000)
+    states, final = walk(ex, 5000)
+    for _ in range(len(states) - 10):
+        ex.step_back()
+    assert snap(ex) == states[10]
+    assert walk(ex, 5000)[1] == final
+
+def test_undo_limit_bounds_history():
+    ex = Executor(load_program("A:\nINC R1\nGOTO A\n"), None, 1000, undo_limit=5)
+    walk(ex, 20)
+    assert sum(ex.step_back() for _ in range(10)) == 5
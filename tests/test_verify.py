@@ -0,0 +1,57 @@
+"""
+verify_program מול הרצה: כל שגיאה סטטית מדווחת מראש, ושורה שדווחה נכשלת
+בריצה באותה הודעה כשמגיעים אליה.
+"""
+import random
+
+import pytest
+
+from battle_calc_runner import AsmError, AsmVerifyError, Executor, check_program, load_program, verify_program
+
+from test_engines import random_line
+
+BAD_LINES = ["MOV R4, 1", "ADD R1", "PUSH R1, S3", "POP 5, S1", "JZ NOWHERE", "FOO R1", "MOV R1, [LIST+33]",
+             "MOV [LIST+-1], R2", "IF R1 <> 2 GOTO A", "IF R1 == R9 GOTO A", "INC L1", "SWAP R1, 3"]
+
+def random_program(rng: random.Random) -> str:
+    lines = [rng.choice(BAD_LINES) if rng.random() < 0.15 else random_line(rng) for _ in range(rng.randint(1, 15))]
+    for label in ("A:", "B:"):
+        lines.insert(rng.randint(0, len(lines)), label)
+    return "\n".join(lines) + "\n"
+
+def test_runtime_errors_on_reported_lines_match():
+    rng = random.Random(6)
+    reached = 0
+    for _ in range(500):
+        text = random_program(rng)
+        try:
+            program = load_program(text)
+        except AsmError:
+            continue
+        reported = {e.line_no: str(e) for e in verify_program(text)}
+        ex = Executor(program, rng.randrange(100), 300)
+        try:
+            while ex.step() is not None:
+                pass
+        except AsmError as e:
+            if e.line_no in reported:
+                reached += 1
+                assert str(e) == reported[e.line_no], text
+        if not reported:
+            assert check_program(text).text == text
+    assert reached > 20
+
+def test_reports_every_error_in_line_order():
+    text = "FOO R1\nMOV R1, 2\nMOV R2, [LIST+40]\nJZ NOWHERE\nHALT\nPOP R1, S9\n"
+    errors = verify_program(text)
+    assert [e.line_no for e in errors] == [1, 3, 4, 6]
+    assert all(e.raw_line == text.splitlines()[e.line_no - 1] for e in errors)
+    with pytest.raises(AsmVerifyError) as info:
+        check_program(text)
+    assert [(e.line_no, str(e)) for e in info.value.errors] == [(e.line_no, str(e)) for e in errors]
+    assert info.value.line_no == 1
+
+def test_valid_program_has_no_errors():
+    text = "MOV L1, 3\nA:\nMOV R1, [LIST+L1]\nMOV R2, [LIST+32]\nPRINT R2\nLOOP A\n"
+    assert verify_program(text) == []
+    assert check_program(text).text == text